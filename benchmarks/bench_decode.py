@@ -0,0 +1,96 @@
+"""
+Benchmark decoding the recorded API responses in ``fixtures/``
+
+Compares, per endpoint, creating a new schema instance per response (as the SDK did before), reusing schema
+instances and the compiled decoders of :class:`paynlsdk.api.schemaloader.SchemaLoader`.
+
+Usage: ``python benchmarks/bench_decode.py [-n NUMBER] [-j JSON_BACKEND] [endpoint ...]``
+"""
+import argparse
+import importlib
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from paynlsdk.api.jsonbackend import JSONBackend  # noqa: E402
+from paynlsdk.api.requestbase import RequestBase  # noqa: E402
+from paynlsdk.api.schemaloader import SchemaLoader  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_fixtures(endpoints=None):
+    """
+    Load the recorded responses
+
+    :param endpoints: names of the endpoints to load (e.g. transaction_info). Defaults to all
+    :return: dict of the endpoint name to the request class and the raw response
+    :rtype: dict
+    """
+    fixtures = {}
+    for filename in sorted(os.listdir(FIXTURES)):
+        name = filename[:-len('.json')]
+        if endpoints and name not in endpoints:
+            continue
+        module = importlib.import_module('paynlsdk.api.' + name.replace('_', '.', 1))
+        with open(os.path.join(FIXTURES, filename), 'rb') as file:
+            fixtures[name] = (module.Request, file.read())
+    return fixtures
+
+
+def to_dict(value):
+    """
+    Convert a decoded response to plain data, so decoded responses can be compared
+    """
+    if isinstance(value, dict):
+        return {key: to_dict(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [to_dict(item) for item in value]
+    if hasattr(value, '__dict__'):
+        return {'__class__': type(value).__name__, **to_dict(vars(value))}
+    return value
+
+
+def decode(request_class, raw_response, json_backend=None):
+    request = request_class()
+    request.json_backend = json_backend
+    request.raw_response = raw_response
+    return request.response
+
+
+def new_schema_load(self, schema_class, data, many=False):
+    return schema_class(partial=True, many=many).load(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('endpoints', nargs='*', help='endpoints to benchmark (default: all)')
+    parser.add_argument('-n', '--number', type=int, default=2000, help='number of responses to decode per run')
+    parser.add_argument('-j', '--json-backend', default='json', help='JSON backend: json, orjson, ujson or auto')
+    args = parser.parse_args()
+    json_backend = JSONBackend.create(args.json_backend)
+
+    fixtures = load_fixtures(args.endpoints)
+    reused_load = RequestBase.load_schema
+    print('{:40} {:>12} {:>12} {:>12} {:>8}'.format('endpoint (us per response)', 'new schema', 'reused', 'compiled',
+                                                     'speedup'))
+    for name, (request_class, raw_response) in fixtures.items():
+        timings = []
+        results = []
+        for load, compiled in ((new_schema_load, False), (reused_load, False), (reused_load, True)):
+            RequestBase.load_schema = load
+            SchemaLoader.compiled = compiled
+            results.append(to_dict(decode(request_class, raw_response, json_backend)))
+            timer = timeit.Timer(lambda: decode(request_class, raw_response, json_backend))
+            timings.append(min(timer.repeat(3, args.number)) / args.number * 1e6)
+        RequestBase.load_schema = reused_load
+        SchemaLoader.compiled = False
+        if any(result != results[0] for result in results):
+            raise AssertionError('Decoded responses differ for {}'.format(name))
+        print('{:40} {:12.1f} {:12.1f} {:12.1f} {:7.1f}x'.format(name, *timings, timings[0] / timings[2]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark encoding the parameters of Transaction::start requests with carts of 1, 100 and 1000 order lines
+
+Reports the time per request and per order line and the memory allocated while encoding a request, measured using
+:mod:`tracemalloc`, as well as the time per request when the request is created from a
+:class:`paynlsdk.api.transaction.start.StartTemplate` holding all details but the amount, IP address, order number and
+order lines.
+
+Usage: ``python benchmarks/bench_encode.py [-n NUMBER] [lines ...]``
+"""
+import argparse
+import os
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from paynlsdk.api.transaction.start import Request, StartTemplate  # noqa: E402
+from paynlsdk.objects import Address, Company, OrderData, SalesData, TransactionData, TransactionEndUser, \
+    TransactionStartStatsData  # noqa: E402
+
+
+def create_request(lines: int) -> Request:
+    """
+    Create a start request with all details filled in and a cart of the given number of order lines
+    """
+    address = Address(street_name='Main street', street_number='1', zip_code='1234AB', city='Amsterdam',
+                      country_code='NL')
+    end_user = TransactionEndUser(language='NL', initials='J', last_name='Jansen', gender='M',
+                                  dob=datetime(1980, 1, 2), email_address='j.jansen@example.com',
+                                  send_confirm_email=True, address=address, invoice_address=address,
+                                  company=Company(name='Example', coc_number='12345678', country_code='NL'))
+    order_data = [OrderData(product_id='P{}'.format(line), description='Product {}'.format(line), price=1995,
+                            quantity=1, vat_code='H', vat_percentage=21.0, product_type='ARTICLE')
+                  for line in range(lines)]
+    request = Request(amount=1995 * lines, ip_address='10.0.0.1', finish_url='https://example.com/finish',
+                      payment_option_id=10,
+                      transaction=TransactionData(currency='EUR', description='Order',
+                                                  order_exchange_url='https://example.com/exchange',
+                                                  order_number='12345'),
+                      stats_data=TransactionStartStatsData(promotor_id=1, extra1='campaign'),
+                      end_user=end_user,
+                      sale_data=SalesData(invoice_date=datetime(2026, 1, 1), delivery_date=datetime(2026, 1, 3),
+                                          order_data=order_data))
+    request.api_token = 'token'
+    request.service_id = 'SL-1234-5678'
+    return request
+
+
+def create_template_request(request: Request) -> Request:
+    """
+    Create the same request from a template
+    """
+    transaction = request.transaction
+    template = StartTemplate(finish_url=request.finish_url, payment_option_id=request.payment_option_id,
+                             transaction=TransactionData(currency=transaction.currency,
+                                                         description=transaction.description,
+                                                         order_exchange_url=transaction.order_exchange_url),
+                             stats_data=request.stats_data, end_user=request.end_user)
+    template_request = template.create_request(request.amount, request.ip_address,
+                                               order_number=transaction.order_number, sale_data=request.sale_data)
+    template_request.api_token = request.api_token
+    template_request.service_id = request.service_id
+    if template_request.get_parameters() != request.get_parameters():
+        raise AssertionError('The template request encodes different parameters')
+    return template_request
+
+
+def time_request(request: Request, number: int) -> float:
+    """
+    :return: number of seconds it takes to encode a request
+    :rtype: float
+    """
+    # Warm up: compile the encoders and cache the keys
+    request.get_parameters()
+    return min(timeit.Timer(request.get_parameters).repeat(3, number)) / number
+
+
+def measure_memory(request: Request) -> int:
+    """
+    :return: number of bytes allocated (at peak) while encoding a request
+    :rtype: int
+    """
+    tracemalloc.start()
+    request.get_parameters()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('lines', nargs='*', type=int, default=[1, 100, 1000], help='numbers of order lines')
+    parser.add_argument('-n', '--number', type=int, default=10000,
+                        help='number of order lines to encode per run (spread over the requests)')
+    args = parser.parse_args()
+
+    print('{:>8} {:>14} {:>12} {:>12} {:>12} {:>14}'.format('lines', 'us per request', 'us per line', 'requests/s',
+                                                            'KiB alloc', 'us (template)'))
+    for lines in args.lines:
+        request = create_request(lines)
+        number = max(1, args.number // lines)
+        seconds = time_request(request, number)
+        template_seconds = time_request(create_template_request(request), number)
+        print('{:8} {:14.1f} {:12.2f} {:12.0f} {:12.1f} {:14.1f}'.format(
+            lines, seconds * 1e6, seconds * 1e6 / lines, 1 / seconds, measure_memory(request) / 1024,
+            template_seconds * 1e6))
+
+
+if __name__ == '__main__':
+    main()
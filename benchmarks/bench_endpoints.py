@@ -0,0 +1,190 @@
+"""
+Benchmark the API calls per endpoint, offline, split into parameter encoding, HTTP round trip and schema decoding
+
+Every endpoint is called against a local :class:`paynlsdk.testing.gateway.FakeGatewayServer` serving the recorded API
+responses in ``fixtures/``. Per endpoint the three stages of a call are measured separately:
+
+* encode: preparing the request (credentials, url, headers and parameter encoding), see ``APIClient._prepare_request``
+* round trip: the HTTP call over localhost, including reading the body, through the client's transport
+* decode: parsing the JSON body and loading the response schema, see ``APIClient._handle_response``
+
+Per stage the benchmark reports the operations per second, the median (p50) and 99th percentile (p99) duration and the
+memory allocated (at peak) per operation, measured using :mod:`tracemalloc`. Use ``-o`` to save the results as JSON and
+``-c`` to compare a run against saved results, e.g. before and after an SDK upgrade.
+
+Usage: ``python benchmarks/bench_endpoints.py [-n NUMBER] [-o OUTPUT] [-c BASELINE] [endpoint ...]``
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_encode import create_request as create_start_request  # noqa: E402
+from paynlsdk.api.client import APIAuthentication, APIClient, PAYNL_CLIENT_VERSION  # noqa: E402
+from paynlsdk.api.transaction import approve, capture, decline, getbanks, getservice, getservicepaymentoptions, \
+    info, refund, status, voidauthorization  # noqa: E402
+from paynlsdk.api.validate import payserverip  # noqa: E402
+from paynlsdk.testing.gateway import FakeGateway, FakeGatewayServer  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+TRANSACTION_ID = '1234567890X12345'
+
+# Endpoint name: (call name, recorded response, request factory)
+ENDPOINTS = {
+    'start': ('Transaction::start', 'transaction_start', lambda: create_start_request(5)),
+    'info': ('Transaction::info', 'transaction_info', lambda: info.Request(TRANSACTION_ID)),
+    'status': ('Transaction::status', 'transaction_status', lambda: status.Request(TRANSACTION_ID)),
+    'getService': ('Transaction::getService', 'transaction_getservice', lambda: getservice.Request(4)),
+    'getServicePaymentOptions': ('Transaction::getServicePaymentOptions', 'transaction_getservicepaymentoptions',
+                                 lambda: getservicepaymentoptions.Request()),
+    'getBanks': ('Transaction::getBanks', 'transaction_getbanks', lambda: getbanks.Request()),
+    'refund': ('Transaction::refund', 'transaction_refund',
+               lambda: refund.Request(TRANSACTION_ID, amount=1995, description='Refund 1001')),
+    'capture': ('Transaction::capture', 'transaction_capture',
+                lambda: capture.Request(TRANSACTION_ID, products={'SKU-0': 1})),
+    'approve': ('Transaction::approve', 'transaction_approve', lambda: approve.Request(TRANSACTION_ID)),
+    'decline': ('Transaction::decline', 'transaction_decline', lambda: decline.Request(TRANSACTION_ID)),
+    'void': ('Transaction::voidAuthorization', 'transaction_voidauthorization',
+             lambda: voidauthorization.Request(TRANSACTION_ID)),
+    'isPayServerIp': ('Validate::isPayServerIp', 'validate_payserverip', lambda: payserverip.Request('192.0.2.1')),
+}
+STAGES = ('encode', 'round trip', 'decode')
+
+
+def load_fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES, name + '.json'), 'rb') as file:
+        return file.read()
+
+
+def measure(operation, number: int) -> dict:
+    """
+    Perform an operation many times
+
+    :return: dict of the operations per second, the p50 and p99 duration (in microseconds) and the bytes allocated
+             (at peak) per operation
+    :rtype: dict
+    """
+    # Warm up: compile the encoders and decoders, open a pooled connection
+    for _ in range(min(number, 10)):
+        operation()
+    durations = []
+    clock = time.perf_counter
+    for _ in range(number):
+        start = clock()
+        operation()
+        durations.append(clock() - start)
+    durations.sort()
+
+    tracemalloc.start()
+    operation()
+    allocated = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'ops_per_sec': number / sum(durations),
+        'p50_us': durations[len(durations) // 2] * 1e6,
+        'p99_us': durations[min(len(durations) - 1, int(len(durations) * 0.99))] * 1e6,
+        'alloc_bytes': allocated,
+    }
+
+
+def benchmark(client: APIClient, name: str, number: int) -> dict:
+    """
+    Benchmark the three stages of the calls to an endpoint
+
+    :return: dict of the stage to its measurements (see :func:`measure`)
+    :rtype: dict
+    """
+    fixture = ENDPOINTS[name][1]
+    create_request = ENDPOINTS[name][2]
+    request = create_request()
+    url, headers, parameters = client._prepare_request(request, 'POST')
+    timeout = client._get_timeout(None, None, url)
+    body = load_fixture(fixture)
+
+    def encode():
+        client._prepare_request(create_request(), 'POST')
+
+    def round_trip():
+        response = client.transport.send('POST', url, headers, parameters, timeout)
+        if response.status_code != 200 or response.content != body:
+            raise AssertionError('Unexpected response for {}'.format(name))
+
+    def decode():
+        client._handle_response(request, body)
+
+    return {'encode': measure(encode, number), 'round trip': measure(round_trip, number),
+            'decode': measure(decode, number)}
+
+
+def compare(results: dict, baseline: dict):
+    """
+    Print the change of the p50 durations relative to saved results
+    """
+    print()
+    print('{:26} {:>16} {:>16} {:>16}'.format('p50 change vs baseline', *STAGES))
+    for name, stages in results.items():
+        if name not in baseline:
+            continue
+        changes = ['{:+15.1f}%'.format((stages[stage]['p50_us'] / baseline[name][stage]['p50_us'] - 1) * 100)
+                   for stage in STAGES]
+        print('{:26} {:>16} {:>16} {:>16}'.format(name, *changes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('endpoints', nargs='*', help='endpoints to benchmark (default: all): ' + ', '.join(ENDPOINTS))
+    parser.add_argument('-n', '--number', type=int, default=1000, help='number of operations per stage and endpoint')
+    parser.add_argument('-o', '--output', help='file to save the results to (JSON)')
+    parser.add_argument('-c', '--compare', help='file with saved results to compare against (JSON)')
+    args = parser.parse_args()
+    unknown = set(args.endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error('unknown endpoints: {}'.format(', '.join(sorted(unknown))))
+
+    APIAuthentication.api_token = 'token'
+    APIAuthentication.token_code = 'AT-1234-5678'
+    APIAuthentication.service_id = 'SL-1234-5678'
+    gateway = FakeGateway(responses={call: load_fixture(fixture) for call, fixture, _ in ENDPOINTS.values()})
+    results = {}
+    with FakeGatewayServer(gateway) as server:
+        client = APIClient()
+        client.end_point = server.end_point
+        print('{:26} {:>10} {:>10} {:>10} {:>10} {:>10} {:>10} {:>10} {:>10} {:>10}'.format(
+            '', 'encode', '', '', 'round trip', '', '', 'decode', '', ''))
+        print('{:26} {:>10} {:>10} {:>10} {:>10} {:>10} {:>10} {:>10} {:>10} {:>10}'.format(
+            'endpoint', *['ops/s', 'p50 us', 'p99 us'] * 3))
+        for name in args.endpoints or ENDPOINTS:
+            results[name] = benchmark(client, name, args.number)
+            print('{:26} {}'.format(name, ' '.join('{ops_per_sec:10.0f} {p50_us:10.1f} {p99_us:10.1f}'.format(
+                **results[name][stage]) for stage in STAGES)))
+        client.close()
+
+    print()
+    print('{:26} {:>16} {:>16} {:>16}'.format('KiB allocated per op', *STAGES))
+    for name, stages in results.items():
+        print('{:26} {}'.format(name, ' '.join('{:16.1f}'.format(stages[stage]['alloc_bytes'] / 1024)
+                                               for stage in STAGES)))
+
+    if args.compare:
+        with open(args.compare) as file:
+            compare(results, json.load(file)['results'])
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({
+                'sdk_version': PAYNL_CLIENT_VERSION,
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'date': datetime.now().isoformat(),
+                'number': args.number,
+                'results': results,
+            }, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
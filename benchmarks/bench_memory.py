@@ -0,0 +1,69 @@
+"""
+Benchmark the memory used by the regular and compact (``__slots__``) variants of the data structures
+
+Decodes the payment details, order data, refund info and transaction status details of the recorded API responses in
+``fixtures/`` many times and reports the bytes allocated per object, measured using :mod:`tracemalloc`.
+
+Usage: ``python benchmarks/bench_memory.py [-n NUMBER]``
+"""
+import argparse
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from paynlsdk.objects import OrderDataSchema, PaymentDetailsSchema, RefundInfoSchema, \
+    TransactionStatusDetailsSchema, use_compact_objects  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_fixture(name: str):
+    with open(os.path.join(FIXTURES, name + '.json')) as file:
+        return json.load(file)
+
+
+def measure(schema_class, data: dict, number: int) -> float:
+    """
+    Decode data many times, keeping all objects
+
+    :return: number of bytes allocated per object
+    :rtype: float
+    """
+    schema = schema_class()
+    items = [dict(data) for _ in range(number)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [schema.load(item)[0] for item in items]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del objects
+    return used / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-n', '--number', type=int, default=10000, help='number of objects to decode')
+    args = parser.parse_args()
+
+    cases = (
+        ('PaymentDetails', PaymentDetailsSchema, load_fixture('transaction_info')['paymentDetails']),
+        ('OrderData', OrderDataSchema, load_fixture('transaction_info')['saleData']['orderData'][0]),
+        ('RefundInfo', RefundInfoSchema, load_fixture('refund_info')['refund']),
+        ('TransactionStatusDetails', TransactionStatusDetailsSchema,
+         load_fixture('transaction_status')['paymentDetails']),
+    )
+    print('{:30} {:>12} {:>12} {:>8}'.format('object (bytes per object)', 'regular', 'compact', 'saved'))
+    for name, schema_class, data in cases:
+        use_compact_objects(False)
+        regular = measure(schema_class, data, args.number)
+        use_compact_objects(True)
+        compact = measure(schema_class, data, args.number)
+        use_compact_objects(False)
+        print('{:30} {:12.0f} {:12.0f} {:7.0%}'.format(name, regular, compact, 1 - compact / regular))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,453 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Iterable
+from urllib.parse import urlencode
+
+from paynlsdk.api.circuitbreaker import CircuitBreakerRegistry
+from paynlsdk.api.client import APIClient
+from paynlsdk.api.deadline import Deadline
+from paynlsdk.api.hedging import HedgePolicy
+from paynlsdk.api.hooks import CallContext, ClientHooks
+from paynlsdk.api.ratelimit import RateLimiter
+from paynlsdk.api.requestbase import RequestBase
+from paynlsdk.api.retry import RetryPolicy
+from paynlsdk.api.singleflight import AsyncSingleFlight, get_flight_key
+from paynlsdk.exceptions import DeadlineExceededException
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAPIClient(APIClient):
+    """
+    asyncio based API client
+
+    This client builds and interprets requests exactly like :class:`paynlsdk.api.client.APIClient` does,
+    but performs the HTTP calls using `aiohttp` so many calls can be in flight on a single event loop.
+    Please note `aiohttp` is an optional dependency (install it with ``pip install paynlsdk[async]``).
+
+    The underlying :class:`aiohttp.ClientSession` is created lazily on first use and is bound to the event loop
+    it was created in; using the client from another event loop will create a new session. This session replaces the
+    transport of the synchronous client, so :attr:`transport` is None.
+
+    :param int pool_size: maximum number of simultaneous connections (0 for no limit)
+    :param int max_connections_per_host: maximum number of simultaneous connections to a single host
+    :param bool keep_alive: whether to keep connections alive between calls
+    :param bool pool_block: unused, only here for signature compatibility with
+                            :class:`paynlsdk.api.client.APIClient`. Calls always wait for a free connection
+    :param float connect_timeout: default number of seconds to wait for a connection to be established
+    :param float read_timeout: default number of seconds to wait for data from the API
+    :param RetryPolicy retry_policy: policy for retrying failed calls to idempotent API methods.
+                                     Use None to never retry
+    :param CircuitBreakerRegistry circuit_breakers: circuit breakers (per API method) to protect the API with.
+                                                    Use None to disable circuit breaking
+    :param bool coalesce_reads: whether identical calls to idempotent API methods that are in flight at the same time
+                                are coalesced into a single HTTP call, sharing the parsed response
+    :param HedgePolicy hedge_policy: policy for firing a second, identical call to an idempotent API method when the
+                                     first one is slow. The slower call is cancelled. Use None to never hedge
+    :param RateLimiter rate_limiter: client side rate limiter (per API method) to stay within the API limits.
+                                     Use None to disable rate limiting
+    :param json_backend: JSON backend parsing the responses (see :class:`paynlsdk.api.jsonbackend.JSONBackend`),
+                         or the name of one: json (default), orjson, ujson or auto (the fastest one installed)
+    :type json_backend: str|JSONBackend
+    :param bool lite: whether to decode responses into plain dicts instead of response objects, for requests that do
+                      not set :attr:`paynlsdk.api.requestbase.RequestBase.lite` themselves
+    :param ClientHooks hooks: hooks to call during every API call (see :class:`paynlsdk.api.hooks.ClientHooks`).
+                              Hooks are called from the task performing the call, so they must not block
+    """
+    _default_client = None
+    _default_client_lock = threading.Lock()
+
+    def __init__(self,
+                 pool_size: int=100,
+                 max_connections_per_host: int=100,
+                 keep_alive: bool=True,
+                 pool_block: bool=True,
+                 connect_timeout: float=10.0,
+                 read_timeout: float=60.0,
+                 retry_policy: RetryPolicy=None,
+                 circuit_breakers: CircuitBreakerRegistry=None,
+                 coalesce_reads: bool=False,
+                 hedge_policy: HedgePolicy=None,
+                 rate_limiter: RateLimiter=None,
+                 json_backend='json',
+                 lite: bool=False,
+                 hooks: ClientHooks=None
+                 ):
+        super().__init__(pool_size, max_connections_per_host, keep_alive, pool_block, connect_timeout, read_timeout,
+                         retry_policy, circuit_breakers, coalesce_reads, hedge_policy, rate_limiter, json_backend,
+                         lite, hooks=hooks)
+        self._session = None
+        self._session_loop = None
+
+    def _create_transport(self):
+        # HTTP calls are performed by the aiohttp session, a requests based transport would never be used
+        return None
+
+    def _create_single_flight(self):
+        return AsyncSingleFlight()
+
+    @property
+    def session(self):
+        """
+        Get the pooled HTTP session for this client (for the currently running event loop)
+
+        :return: HTTP session
+        :rtype: aiohttp.ClientSession
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = self._create_session()
+            self._session_loop = loop
+        return self._session
+
+    def _create_session(self):
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError('The AsyncAPIClient requires the aiohttp package. '
+                              'Please install it using "pip install paynlsdk[async]"')
+        connector = aiohttp.TCPConnector(limit=self.pool_size, limit_per_host=self.max_connections_per_host,
+                                         force_close=not self.keep_alive)
+        # Let new connections record the time spent connecting in the CallTimings passed as trace_request_ctx
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_start.append(self._on_connection_create_start)
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        return aiohttp.ClientSession(connector=connector, trace_configs=[trace_config])
+
+    @staticmethod
+    async def _on_connection_create_start(session, context, params):
+        context.connect_started = time.monotonic()
+
+    @staticmethod
+    async def _on_connection_create_end(session, context, params):
+        if context.trace_request_ctx is not None:
+            context.trace_request_ctx.connect = time.monotonic() - context.connect_started
+
+    async def close(self):
+        """
+        Close the HTTP session and all pooled connections of this client
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
+    async def perform_request(self,
+                              request: RequestBase,
+                              method: str='POST',
+                              timeout=None,
+                              deadline: Deadline=None
+                              ):
+        """
+        Performs the actual call to the API and fill the responses.
+
+        This is the asyncio equivalent of :meth:`paynlsdk.api.client.APIClient.perform_request`
+
+        :param request: the generic request to perform
+        :type request: paynlsdk.api.requestbase.RequestBase
+        :param method: HTTP method (stick to POST!)
+        :type method: str
+        :param timeout: timeout for this call, overriding the client's timeouts.
+                        Either a number of seconds or a (connect timeout, read timeout) tuple
+        :type timeout: float|tuple
+        :param deadline: deadline the call must finish within. The call is cancelled when the deadline expires
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: void
+        :rtype: void
+        :raise paynlsdk.exceptions.ErrorException: generic error occurred
+        :raise paynlsdk.exceptions.SchemaException: error occurred during result parsing (schema load/validation failure)
+        :raise paynlsdk.exceptions.DeadlineExceededException: the call could not be finished before the deadline
+        :raise paynlsdk.exceptions.CircuitOpenException: the circuit breaker for the API method is open
+        """
+        hooks = self.hooks
+        if not hooks.active:
+            url, headers, parameters = self._prepare_request(request, method)
+            await self._perform_prepared(request, method, url, headers, parameters, timeout, deadline, None)
+            return
+
+        call = CallContext(request, method)
+        try:
+            started = time.monotonic()
+            call.url, call.headers, call.parameters = self._prepare_request(request, method)
+            call.timings.encode = time.monotonic() - started
+            hooks.call(ClientHooks.BEFORE_REQUEST, call)
+            await self._perform_prepared(request, method, call.url, call.headers, call.parameters, timeout, deadline,
+                                         call)
+        except Exception as e:
+            call.error = e
+            hooks.call(ClientHooks.ON_ERROR, call)
+            raise
+
+    async def _perform_prepared(self, request: RequestBase, method: str, url: str, headers: dict, parameters: dict,
+                                timeout, deadline: Deadline, call: CallContext):
+        """
+        Perform a prepared request, coalesced with an identical call in flight if the client coalesces reads
+        """
+        if not self.coalesce_reads or not request.is_idempotent():
+            await self._perform(request, method, url, headers, parameters, timeout, deadline, call)
+            return
+
+        leader, shared = await self._single_flight.do(
+            get_flight_key(method, url, parameters),
+            lambda: self._perform(request, method, url, headers, parameters, timeout, deadline, call),
+            deadline.remaining() if deadline is not None else None)
+        if shared:
+            self._share_response(leader, request)
+
+    async def _perform(self, request: RequestBase, method: str, url: str, headers: dict, parameters: dict, timeout,
+                       deadline: Deadline, call: CallContext=None) -> RequestBase:
+        """
+        Perform the HTTP call for a prepared request and fill the response
+
+        :return: the request
+        :rtype: paynlsdk.api.requestbase.RequestBase
+        """
+        response, raw_response = await self._send_with_retry(request, method, url, headers, parameters, timeout,
+                                                             deadline, call)
+        if call is not None:
+            call.status_code = response.status
+            call.raw_response = raw_response
+            self.hooks.call(ClientHooks.AFTER_RESPONSE, call)
+
+        if not self._is_supported_status_code(response.status):
+            response.raise_for_status()
+
+        if self.print_debug:
+            logger.debug('Response object: %s', response)
+            logger.debug('Raw response: %s', raw_response)
+
+        self._handle_response(request, raw_response, call)
+        return request
+
+    async def _send(self, method: str, url: str, headers: dict, parameters: dict, timeout, deadline: Deadline,
+                    call: CallContext=None):
+        """
+        Perform a single HTTP call
+
+        :return: HTTP response and the raw response body
+        :rtype: tuple
+        :raise paynlsdk.exceptions.DeadlineExceededException: the call could not be finished before the deadline
+        """
+        import aiohttp
+        connect_timeout, read_timeout = self._get_timeout(timeout, deadline, url)
+        client_timeout = aiohttp.ClientTimeout(total=deadline.remaining() if deadline is not None else None,
+                                               sock_connect=connect_timeout, sock_read=read_timeout)
+
+        timings = None
+        if call is not None:
+            call.attempts += 1
+            timings = call.timings
+            timings.connect = 0.0
+        if method.upper() == 'GET':
+            http_response = self.session.get(url, headers=headers, params=urlencode(parameters),
+                                             timeout=client_timeout, trace_request_ctx=timings)
+        else:
+            headers = dict(headers, **{'Content-Type': 'application/x-www-form-urlencoded'})
+            http_response = self.session.post(url, headers=headers, data=urlencode(parameters),
+                                              timeout=client_timeout, trace_request_ctx=timings)
+
+        try:
+            started = time.monotonic()
+            async with http_response as response:
+                headers_received = time.monotonic()
+                raw_response = await response.read()
+        except asyncio.TimeoutError as e:
+            if deadline is not None and deadline.is_expired():
+                raise DeadlineExceededException('Deadline of {}s exceeded while calling {}'.format(
+                    deadline.timeout, url)) from e
+            raise
+        if timings is not None:
+            timings.ttfb = headers_received - started - timings.connect
+            timings.body_read = time.monotonic() - headers_received
+        return response, raw_response
+
+    async def _send_attempt(self, request: RequestBase, method: str, url: str, headers: dict, parameters: dict,
+                            timeout, deadline: Deadline, call: CallContext=None):
+        """
+        Perform a single attempt of the HTTP call, hedged according to the client's hedge policy
+
+        :return: HTTP response and the raw response body of the first call to answer
+        :rtype: tuple
+        """
+        policy = self.hedge_policy
+        if policy is None:
+            return await self._send(method, url, headers, parameters, timeout, deadline, call)
+        policy.register_call()
+        delay = policy.get_delay(request)
+        if delay is None:
+            return await self._send_timed(request, method, url, headers, parameters, timeout, deadline, call)
+
+        args = (request, method, url, headers, parameters, timeout, deadline, call)
+        tasks = [asyncio.ensure_future(self._send_timed(*args))]
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=delay)
+            if not done and self._may_hedge(request):
+                logger.debug('Hedging %s after %.3fs', url, delay)
+                tasks.append(asyncio.ensure_future(self._send_timed(*args)))
+                pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+            # All calls failed: report the failure of the first one
+            return tasks[0].result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _send_timed(self, request: RequestBase, method: str, url: str, headers: dict, parameters: dict,
+                          timeout, deadline: Deadline, call: CallContext=None):
+        started = time.monotonic()
+        response, raw_response = await self._send(method, url, headers, parameters, timeout, deadline, call)
+        if self._is_supported_status_code(response.status):
+            self.hedge_policy.record_latency(request, time.monotonic() - started)
+        return response, raw_response
+
+    async def _acquire_rate_limit(self, request: RequestBase, deadline: Deadline):
+        while True:
+            wait = self.rate_limiter.try_acquire(request)
+            if not wait:
+                return
+            self.rate_limiter.check_wait(request, wait, deadline)
+            await asyncio.sleep(wait)
+
+    async def _send_with_retry(self, request: RequestBase, method: str, url: str, headers: dict, parameters: dict,
+                               timeout, deadline: Deadline, call: CallContext=None):
+        """
+        Perform the HTTP call, guarded by the circuit breaker and retried according to the client's retry policy
+
+        :return: HTTP response and the raw response body of the last attempt
+        :rtype: tuple
+        :raise paynlsdk.exceptions.CircuitOpenException: the circuit breaker for the API method is open
+        """
+        import aiohttp
+        policy = self.retry_policy
+        breaker = self.circuit_breakers.get_for_request(request) if self.circuit_breakers is not None else None
+        if policy is not None:
+            policy.register_call()
+        attempt = 1
+        while True:
+            if deadline is not None:
+                deadline.check('calling {}'.format(url))
+            if self.rate_limiter is not None:
+                await self._acquire_rate_limit(request, deadline)
+            if breaker is not None:
+                breaker.before_call()
+            try:
+                response, raw_response = await self._send_attempt(request, method, url, headers, parameters,
+                                                                  timeout, deadline, call)
+            except DeadlineExceededException:
+                if breaker is not None:
+                    breaker.record_failure()
+                raise
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if breaker is not None:
+                    breaker.record_failure()
+                if policy is None:
+                    raise
+                delay = policy.get_backoff(attempt)
+                if not self._may_retry(request, attempt, delay, deadline):
+                    raise
+            except BaseException:
+                # Not a failure of the API (e.g. a cancelled call or a local error), but a half-open breaker would
+                # wait for its trial call forever
+                if breaker is not None:
+                    breaker.release_trial()
+                raise
+            else:
+                self._record_status(breaker, response.status)
+                if policy is None or self._is_supported_status_code(response.status) \
+                        or not policy.is_retryable_status(response.status):
+                    return response, raw_response
+                delay = policy.get_delay(attempt, response.headers)
+                if delay is None or not self._may_retry(request, attempt, delay, deadline):
+                    return response, raw_response
+            logger.debug('Retrying %s in %.3fs (attempt %d)', url, delay, attempt + 1)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def perform_many(self,
+                           requests: Iterable[RequestBase],
+                           method: str='POST',
+                           max_workers: int=8,
+                           timeout: float=None,
+                           ordered: bool=True,
+                           fail_fast: bool=False
+                           ):
+        """
+        Performs many calls to the API concurrently.
+
+        This is the asyncio equivalent of :meth:`paynlsdk.api.client.APIClient.perform_many` and is an
+        asynchronous generator yielding ``(request, response_or_exception)`` tuples.
+        A call exceeding the timeout is cancelled and reported with an :class:`asyncio.TimeoutError`.
+
+        :param requests: the generic requests to perform
+        :type requests: Iterable[paynlsdk.api.requestbase.RequestBase]
+        :param method: HTTP method (stick to POST!)
+        :type method: str
+        :param max_workers: maximum number of calls performed concurrently
+        :type max_workers: int
+        :param timeout: maximum number of seconds a single call may take. Use None to wait indefinitely
+        :type timeout: float
+        :param ordered: True to yield results in the order of the given requests,
+                        False to yield results in order of completion
+        :type ordered: bool
+        :param fail_fast: True to stop at the first failed call and raise its exception,
+                          False to yield exceptions along with successful responses
+        :type fail_fast: bool
+        :return: asynchronous generator of (request, response or exception) tuples
+        :rtype: AsyncIterator[tuple]
+        """
+        if max_workers < 1:
+            raise ValueError('max_workers must be at least 1')
+        iterator = iter(requests)
+        max_buffered = max_workers * 4
+        # Tasks in submission order. Finished tasks are kept here until they are yielded
+        tasks = []
+        exhausted = False
+        try:
+            while True:
+                running = sum(1 for task, request in tasks if not task.done())
+                while not exhausted and running < max_workers and len(tasks) < max_buffered:
+                    try:
+                        request = next(iterator)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    tasks.append((asyncio.ensure_future(self._perform_batch_item(request, method, timeout)), request))
+                    running += 1
+                if not tasks:
+                    return
+
+                unfinished = [task for task, request in tasks if not task.done()]
+                if unfinished:
+                    await asyncio.wait(unfinished, return_when=asyncio.FIRST_COMPLETED)
+
+                if ordered:
+                    ready = []
+                    while tasks and tasks[0][0].done():
+                        ready.append(tasks.pop(0))
+                else:
+                    ready = [(task, request) for task, request in tasks if task.done()]
+                    tasks = [(task, request) for task, request in tasks if not task.done()]
+
+                for task, request in ready:
+                    result = task.result()
+                    if fail_fast and isinstance(result, Exception):
+                        raise result
+                    yield request, result
+        finally:
+            for task, request in tasks:
+                task.cancel()
+
+    async def _perform_batch_item(self, request: RequestBase, method: str, timeout: float):
+        try:
+            await asyncio.wait_for(self.perform_request(request, method,
+                                                        deadline=Deadline(timeout) if timeout is not None else None),
+                                   timeout)
+            return request.response
+        except Exception as e:
+            return e
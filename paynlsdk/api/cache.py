@@ -0,0 +1,234 @@
+import asyncio
+import threading
+import time
+import weakref
+
+from paynlsdk.api.cachebackend import CacheBackend
+
+
+class CacheEntry(object):
+    """
+    Cached value along with the time it was loaded
+
+    :param value: cached value
+    :param float loaded_at: time the value was loaded (see :func:`time.time`)
+    """
+    def __init__(self, value, loaded_at: float):
+        self.value = value
+        self.loaded_at = loaded_at
+
+
+class TTLCache(object):
+    """
+    Cache loading values on demand and keeping them for a fixed time (stale-while-revalidate)
+
+    A value younger than ``ttl`` seconds is returned as is. A value that is older, but younger than ``ttl + stale_ttl``
+    seconds, is still returned immediately while a fresh value is loaded in a background thread. Older values (or
+    values not yet cached) are loaded synchronously. Concurrent loads of the same key are coalesced.
+
+    If a background refresh fails, the stale value is kept and a refresh is attempted again on the next request.
+
+    Values are kept in a :class:`paynlsdk.api.cachebackend.CacheBackend` under ``namespace:key``. Use a persistent
+    backend (e.g. :class:`paynlsdk.api.cachebackend.SQLiteCacheBackend`) to keep values between restarts.
+
+    :param loader: callable loading the value for a key: ``loader(key, deadline)``.
+                   The deadline is None when loading in the background
+    :type loader: callable
+    :param float ttl: number of seconds a value is fresh
+    :param float stale_ttl: number of seconds a value may be served stale (while refreshing) after it expired.
+                            Use 0 to always load expired values synchronously
+    :param str namespace: prefix for the keys in the backend
+    :param CacheBackend backend: backend keeping the values.
+                                 Defaults to the shared backend returned by :meth:`CacheBackend.get_default`
+    """
+    def __init__(self, loader, ttl: float=3600.0, stale_ttl: float=86400.0, namespace: str='cache',
+                 backend: CacheBackend=None):
+        self.loader = loader
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.namespace = namespace
+        self._backend = backend
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._load_locks = {}
+
+    @property
+    def backend(self) -> CacheBackend:
+        """
+        Get the backend keeping the values
+
+        :return: the cache backend
+        :rtype: CacheBackend
+        """
+        return self._backend if self._backend is not None else CacheBackend.get_default()
+
+    @backend.setter
+    def backend(self, backend: CacheBackend):
+        self._backend = backend
+
+    def _get_backend_key(self, key) -> str:
+        return '{}:{}'.format(self.namespace, '' if key is None else key)
+
+    def _get_entry(self, key):
+        stored = self.backend.get(self._get_backend_key(key))
+        return CacheEntry(*stored) if stored is not None else None
+
+    def _is_fresh(self, entry) -> bool:
+        return entry is not None and time.time() - entry.loaded_at < self.ttl
+
+    def get(self, key=None, deadline=None):
+        """
+        Get the value for a key, loading it if needed
+
+        :param key: cache key
+        :param deadline: deadline a synchronous load must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: the (possibly stale) value
+        """
+        entry = self._get_entry(key)
+        if entry is not None:
+            age = time.time() - entry.loaded_at
+            if age < self.ttl:
+                return entry.value
+            if age < self.ttl + self.stale_ttl:
+                self._refresh_in_background(key)
+                return entry.value
+        return self._load(key, deadline)
+
+    def set(self, key, value):
+        """
+        Store a value
+
+        :param key: cache key
+        :param value: value to store
+        """
+        self.backend.set(self._get_backend_key(key), value, self.ttl + self.stale_ttl)
+
+    def invalidate(self, key=None):
+        """
+        Remove the value for a key, so the next request loads a fresh value
+
+        :param key: cache key
+        """
+        self.backend.delete(self._get_backend_key(key))
+
+    def clear(self):
+        """
+        Remove all values (of this cache's namespace)
+        """
+        self.backend.clear(self.namespace + ':')
+
+    def refresh(self, key=None, deadline=None):
+        """
+        Load a fresh value for a key, regardless of the age of the cached value
+
+        :param key: cache key
+        :param deadline: deadline the load must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: the fresh value
+        """
+        value = self.loader(key, deadline)
+        self.set(key, value)
+        return value
+
+    def _load(self, key, deadline):
+        with self._lock:
+            lock = self._load_locks.setdefault(key, threading.Lock())
+        with lock, self.backend.refresh_lock(self._get_backend_key(key)):
+            # Another thread (or process) may have loaded the value while we were waiting
+            entry = self._get_entry(key)
+            if self._is_fresh(entry):
+                return entry.value
+            return self.refresh(key, deadline)
+
+    def _refresh_in_background(self, key):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        threading.Thread(target=self._background_refresh, args=(key,), daemon=True).start()
+
+    def _background_refresh(self, key):
+        try:
+            with self.backend.refresh_lock(self._get_backend_key(key), blocking=False) as acquired:
+                # Leave the refresh to the process holding the lock, or which already did it
+                if acquired and not self._is_fresh(self._get_entry(key)):
+                    self.refresh(key)
+        except Exception:
+            # Keep serving the stale value, the next request will trigger another refresh
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+
+class AsyncTTLCache(TTLCache):
+    """
+    asyncio version of :class:`TTLCache`
+
+    The loader is a coroutine function (``await loader(key, deadline)``) and background refreshes are done in a task
+    on the running event loop. Please note the backend is accessed synchronously, and its refresh lock (see
+    :meth:`paynlsdk.api.cachebackend.CacheBackend.refresh_lock`) is only held to claim a load, never while awaiting the
+    loader, so processes sharing the backend may occasionally load the same value at once.
+    """
+    def __init__(self, loader, ttl: float=3600.0, stale_ttl: float=86400.0, namespace: str='cache',
+                 backend: CacheBackend=None):
+        super().__init__(loader, ttl, stale_ttl, namespace, backend)
+        self._tasks = set()
+        # asyncio locks are bound to the event loop using them, so every loop gets its own load locks
+        self._loop_load_locks = weakref.WeakKeyDictionary()
+
+    async def get(self, key=None, deadline=None):
+        entry = self._get_entry(key)
+        if entry is not None:
+            age = time.time() - entry.loaded_at
+            if age < self.ttl:
+                return entry.value
+            if age < self.ttl + self.stale_ttl:
+                self._refresh_in_background(key)
+                return entry.value
+        return await self._load(key, deadline)
+
+    async def refresh(self, key=None, deadline=None):
+        value = await self.loader(key, deadline)
+        self.set(key, value)
+        return value
+
+    async def _load(self, key, deadline):
+        loop = asyncio.get_running_loop()
+        load_locks = self._loop_load_locks.get(loop)
+        if load_locks is None:
+            load_locks = self._loop_load_locks[loop] = {}
+        lock = load_locks.get(key)
+        if lock is None:
+            lock = load_locks[key] = asyncio.Lock()
+        async with lock:
+            while True:
+                with self.backend.refresh_lock(self._get_backend_key(key), blocking=False) as acquired:
+                    entry = self._get_entry(key)
+                    if self._is_fresh(entry):
+                        return entry.value
+                if acquired:
+                    return await self.refresh(key, deadline)
+                # Another process is loading the value, don't block the event loop while waiting for it
+                await asyncio.sleep(0.01)
+
+    def _refresh_in_background(self, key):
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        task = asyncio.ensure_future(self._background_refresh(key))
+        # Keep a reference, the event loop only keeps weak references to tasks
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _background_refresh(self, key):
+        try:
+            with self.backend.refresh_lock(self._get_backend_key(key), blocking=False) as acquired:
+                stale = acquired and not self._is_fresh(self._get_entry(key))
+            if stale:
+                await self.refresh(key)
+        except Exception:
+            pass
+        finally:
+            self._refreshing.discard(key)
@@ -0,0 +1,486 @@
+import mmap
+import os
+import pickle
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class LRUCache(object):
+    """
+    Bounded, thread-safe cache dropping the least recently used values when full
+
+    Every value can have its own time to live.
+
+    :param int max_size: maximum number of values to keep
+    """
+    def __init__(self, max_size: int=10000):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        """
+        Get the value for a key
+
+        :param key: cache key
+        :param default: value to return if the key is not cached (or expired)
+        :return: the cached value
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: float=None):
+        """
+        Store a value
+
+        :param key: cache key
+        :param value: value to store
+        :param ttl: number of seconds to keep the value. Use None to keep it until it is dropped to make room
+        :type ttl: float
+        """
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        """
+        Remove the value for a key
+
+        :param key: cache key
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self, prefix: str=''):
+        """
+        Remove all values of which the key starts with the given prefix
+
+        :param prefix: key prefix (only applies to string keys). Use an empty string to remove all values
+        :type prefix: str
+        """
+        with self._lock:
+            if not prefix:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if isinstance(key, str) and key.startswith(prefix)]:
+                del self._entries[key]
+
+
+class CacheBackend(ABC):
+    """
+    Storage backend for the SDK's caches
+
+    Values are stored under string keys along with the (wall clock) time they were stored, so their age can be
+    determined, even by another process or after a restart.
+    The SDK's caches share the backend returned by :meth:`CacheBackend.get_default`, unless given one explicitly.
+    """
+    _default_backend = None
+    _default_backend_lock = threading.Lock()
+
+    @classmethod
+    def get_default(cls):
+        """
+        Get the shared backend
+
+        The shared backend is a :class:`MemoryCacheBackend`, unless set otherwise using :meth:`set_default`.
+        :return: shared cache backend
+        :rtype: CacheBackend
+        """
+        if CacheBackend._default_backend is None:
+            with CacheBackend._default_backend_lock:
+                if CacheBackend._default_backend is None:
+                    CacheBackend._default_backend = MemoryCacheBackend()
+        return CacheBackend._default_backend
+
+    @classmethod
+    def set_default(cls, backend):
+        """
+        Set the shared backend (e.g. to a :class:`SQLiteCacheBackend` to keep cached values between restarts)
+
+        :param backend: cache backend to share. Use None to reset to a memory backend on next use
+        :type backend: CacheBackend
+        """
+        with CacheBackend._default_backend_lock:
+            CacheBackend._default_backend = backend
+
+    @abstractmethod
+    def get(self, key: str):
+        """
+        Get a value
+
+        :param key: cache key
+        :type key: str
+        :return: tuple of the value and the time it was stored (see :func:`time.time`), or None if not found
+        :rtype: tuple
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value, ttl: float=None):
+        """
+        Store a value
+
+        :param key: cache key
+        :type key: str
+        :param value: value to store
+        :param ttl: number of seconds after which the backend may drop the value. Use None to keep it
+        :type ttl: float
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        """
+        Remove a value
+
+        :param key: cache key
+        :type key: str
+        """
+        pass
+
+    @abstractmethod
+    def clear(self, prefix: str=''):
+        """
+        Remove all values of which the key starts with the given prefix
+
+        :param prefix: key prefix. Use an empty string to remove all values
+        :type prefix: str
+        """
+        pass
+
+    @contextmanager
+    def refresh_lock(self, key: str, blocking: bool=True):
+        """
+        Get the right to (re)load the value for a key
+
+        Backends shared by several processes use this to make sure only one of them calls the API to refresh a value,
+        while the others keep using the current one. By default the right is always granted.
+
+        :param key: cache key
+        :type key: str
+        :param blocking: whether to wait for another process to finish refreshing
+        :type blocking: bool
+        :return: context manager yielding True if the value may be refreshed
+        """
+        yield True
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Cache backend keeping values in memory, dropping the least recently used values when full
+
+    :param int max_size: maximum number of values to keep
+    """
+    def __init__(self, max_size: int=10000):
+        self._cache = LRUCache(max_size)
+
+    def get(self, key: str):
+        return self._cache.get(key)
+
+    def set(self, key: str, value, ttl: float=None):
+        self._cache.set(key, (value, time.time()), ttl)
+
+    def delete(self, key: str):
+        self._cache.invalidate(key)
+
+    def clear(self, prefix: str=''):
+        self._cache.clear(prefix)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Cache backend keeping values in a SQLite database, so they survive restarts and can be shared by processes
+
+    The database uses write-ahead logging, so readers never block on a writer. Values are pickled and compressed
+    using zlib. Every thread (and process) uses its own connection.
+    Please note values are unpickled when read, so the database must only be writable by the application itself.
+
+    :param str path: path of the database file. It is created if it does not exist
+    :param int compress_level: zlib compression level (0 - 9)
+    :param float timeout: number of seconds to wait for a lock held by another connection
+    """
+    def __init__(self, path: str, compress_level: int=6, timeout: float=5.0):
+        self.path = path
+        self.compress_level = compress_level
+        self.timeout = timeout
+        self._local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        Get the database connection of the current thread
+
+        :return: database connection
+        :rtype: sqlite3.Connection
+        """
+        pid = os.getpid()
+        if getattr(self._local, 'pid', None) != pid:
+            # Never share a connection with a parent process
+            self._local.connection = self._connect()
+            self._local.pid = pid
+        return self._local.connection
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute('CREATE TABLE IF NOT EXISTS cache ('
+                           'key TEXT PRIMARY KEY, value BLOB NOT NULL, stored_at REAL NOT NULL, expires_at REAL)')
+        return connection
+
+    def get(self, key: str):
+        row = self.connection.execute('SELECT value, stored_at, expires_at FROM cache WHERE key = ?',
+                                      (key,)).fetchone()
+        if row is None:
+            return None
+        value, stored_at, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            self.delete(key)
+            return None
+        return pickle.loads(zlib.decompress(value)), stored_at
+
+    def set(self, key: str, value, ttl: float=None):
+        now = time.time()
+        data = zlib.compress(pickle.dumps(value, pickle.HIGHEST_PROTOCOL), self.compress_level)
+        self.connection.execute('INSERT OR REPLACE INTO cache (key, value, stored_at, expires_at) VALUES (?, ?, ?, ?)',
+                                (key, data, now, now + ttl if ttl is not None else None))
+
+    def delete(self, key: str):
+        self.connection.execute('DELETE FROM cache WHERE key = ?', (key,))
+
+    def clear(self, prefix: str=''):
+        if prefix:
+            self.connection.execute('DELETE FROM cache WHERE substr(key, 1, ?) = ?', (len(prefix), prefix))
+        else:
+            self.connection.execute('DELETE FROM cache')
+
+    def purge(self):
+        """
+        Remove all expired values
+        """
+        self.connection.execute('DELETE FROM cache WHERE expires_at <= ?', (time.time(),))
+
+
+class SnapshotCacheBackend(CacheBackend):
+    """
+    Cache backend publishing all values as a memory mapped snapshot file, shared by all processes on a host
+
+    Meant for pre-forked worker fleets (e.g. gunicorn): instead of every worker calling the API and keeping its own
+    copy, the first worker to find a value stale refreshes it (see :meth:`refresh_lock`) and publishes a new
+    snapshot, while the others keep serving the current value. Snapshots are written to a temporary file and
+    atomically renamed, after which a generation counter (in a small, memory mapped file) is increased. Readers only
+    compare this counter with the generation they loaded, which costs no system call; when it changed they map the
+    new snapshot and unpickle values lazily, at most once per generation.
+
+    Use a path on a memory backed filesystem (e.g. ``/dev/shm``). Please note this backend is only available on
+    platforms supporting ``fcntl`` (i.e. not on Windows), values are unpickled when read (so the files must only be
+    writable by the application itself) and every write rewrites the whole snapshot, so it is meant for a few,
+    rarely changing values.
+
+    :param str path: path of the snapshot file. The files ``path.gen``, ``path.lock`` and ``path.refresh`` are used
+                     as well
+    """
+    MAGIC = b'PNLC'
+    HEADER = struct.Struct('<4sQQ')  # magic, generation, index length
+    GENERATION = struct.Struct('<Q')
+
+    def __init__(self, path: str='/dev/shm/paynlsdk-cache'):
+        import fcntl  # noqa: F401 (fail early on platforms without fcntl)
+        self.path = path
+        self._lock = threading.Lock()
+        self._generation_map = None
+        # Generation, memory map, index and decoded values of the loaded snapshot. Always replaced as a whole, so
+        # readers never combine the index of one snapshot with the map of another
+        self._view = (None, None, {}, {})
+
+    def _open_generation(self):
+        import fcntl
+        fd = os.open(self.path + '.gen', os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            if os.fstat(fd).st_size < self.GENERATION.size:
+                os.ftruncate(fd, self.GENERATION.size)
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            return mmap.mmap(fd, self.GENERATION.size, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+
+    def get_generation(self) -> int:
+        """
+        Get the generation of the most recently published snapshot
+
+        :return: generation (0 if nothing was published yet)
+        :rtype: int
+        """
+        if self._generation_map is None:
+            with self._lock:
+                if self._generation_map is None:
+                    self._generation_map = self._open_generation()
+        return self.GENERATION.unpack_from(self._generation_map)[0]
+
+    def _read_snapshot(self):
+        """
+        Map the current snapshot file
+
+        :return: tuple of the memory map, generation and index. None if there is no (valid) snapshot
+        :rtype: tuple
+        """
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except FileNotFoundError:
+            return None
+        try:
+            if os.fstat(fd).st_size < self.HEADER.size:
+                return None
+            snapshot = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+        magic, generation, index_length = self.HEADER.unpack_from(snapshot)
+        if magic != self.MAGIC:
+            snapshot.close()
+            return None
+        index = pickle.loads(memoryview(snapshot)[self.HEADER.size:self.HEADER.size + index_length])
+        return snapshot, generation, index
+
+    def _refresh_view(self) -> tuple:
+        """
+        Get the view of the current snapshot, loading a newly published one
+
+        :return: tuple of the generation, memory map, index and decoded values
+        :rtype: tuple
+        """
+        generation = self.get_generation()
+        view = self._view
+        if generation == view[0]:
+            return view
+        with self._lock:
+            view = self._view
+            if generation == view[0]:
+                return view
+            result = self._read_snapshot()
+            if result is None:
+                view = (generation, None, {}, {})
+            else:
+                # The previous map is not closed: values may still be decoded from it by other threads
+                snapshot, generation, index = result
+                view = (generation, snapshot, index, {})
+            self._view = view
+            return view
+
+    def get(self, key: str):
+        _, snapshot, index, values = self._refresh_view()
+        item = index.get(key)
+        if item is None:
+            return None
+        offset, length, stored_at, expires_at = item
+        if expires_at is not None and expires_at <= time.time():
+            return None
+        if key not in values:
+            values[key] = pickle.loads(memoryview(snapshot)[offset:offset + length])
+        return values[key], stored_at
+
+    def set(self, key: str, value, ttl: float=None):
+        now = time.time()
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+        def update(entries):
+            entries[key] = (data, now, now + ttl if ttl is not None else None)
+        self._publish(update)
+
+    def delete(self, key: str):
+        self._publish(lambda entries: entries.pop(key, None))
+
+    def clear(self, prefix: str=''):
+        def update(entries):
+            for key in [key for key in entries if key.startswith(prefix)]:
+                del entries[key]
+        self._publish(update)
+
+    def _publish(self, update):
+        import fcntl
+        # Maps (and creates) the generation file before taking the lock, which mapping it takes as well
+        self.get_generation()
+        with self._lock:
+            fd = os.open(self.path + '.lock', os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                entries = {}
+                generation = 0
+                result = self._read_snapshot()
+                if result is not None:
+                    snapshot, generation, index = result
+                    for key, (offset, length, stored_at, expires_at) in index.items():
+                        entries[key] = (snapshot[offset:offset + length], stored_at, expires_at)
+                    snapshot.close()
+                update(entries)
+                now = time.time()
+                entries = {key: entry for key, entry in entries.items() if entry[2] is None or entry[2] > now}
+                generation = max(generation, self.get_generation()) + 1
+                self._write_snapshot(entries, generation)
+                generation_fd = os.open(self.path + '.gen', os.O_RDWR)
+                try:
+                    os.pwrite(generation_fd, self.GENERATION.pack(generation), 0)
+                finally:
+                    os.close(generation_fd)
+            finally:
+                os.close(fd)
+
+    def _write_snapshot(self, entries: dict, generation: int):
+        index = {}
+        blobs = []
+        offset = 0
+        for key, (data, stored_at, expires_at) in entries.items():
+            index[key] = [offset, len(data), stored_at, expires_at]
+            blobs.append(data)
+            offset += len(data)
+        # Offsets are relative to the end of the index until its length is known
+        index_length = len(pickle.dumps(index, pickle.HIGHEST_PROTOCOL))
+        while True:
+            start = self.HEADER.size + index_length
+            absolute = {key: (item[0] + start, item[1], item[2], item[3]) for key, item in index.items()}
+            index_data = pickle.dumps(absolute, pickle.HIGHEST_PROTOCOL)
+            if len(index_data) == index_length:
+                break
+            index_length = len(index_data)
+        temporary = '{}.{}.tmp'.format(self.path, os.getpid())
+        with open(temporary, 'wb') as file:
+            file.write(self.HEADER.pack(self.MAGIC, generation, index_length))
+            file.write(index_data)
+            for data in blobs:
+                file.write(data)
+        os.replace(temporary, self.path)
+
+    @contextmanager
+    def refresh_lock(self, key: str, blocking: bool=True):
+        import fcntl
+        fd = os.open(self.path + '.refresh', os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+                acquired = True
+            except BlockingIOError:
+                acquired = False
+            yield acquired
+        finally:
+            # Closing the file releases the lock
+            os.close(fd)
@@ -0,0 +1,221 @@
+import threading
+import time
+
+from paynlsdk.exceptions import CircuitOpenException
+
+
+class CircuitBreaker(object):
+    """
+    Circuit breaker for a single API method
+
+    The breaker starts out *closed*: calls are performed and their outcome is recorded in a rolling window.
+    Once at least ``minimum_calls`` calls are recorded within the window and the failure rate reaches
+    ``failure_rate_threshold``, the breaker *opens*: calls are refused immediately with a
+    :class:`paynlsdk.exceptions.CircuitOpenException`. After ``cooldown`` seconds the breaker becomes *half-open* and
+    lets ``half_open_max_calls`` trial calls through. If these succeed the breaker closes again, a failing trial call
+    opens it again for another cooldown period.
+
+    :param str name: name of the breaker (usually the API controller/method)
+    :param float failure_rate_threshold: failure rate (0.0 - 1.0) at which the breaker opens
+    :param int minimum_calls: minimum number of calls in the window before the failure rate is evaluated
+    :param float window: length of the rolling window in seconds
+    :param int buckets: number of buckets the rolling window is divided in
+    :param float cooldown: number of seconds the breaker stays open before allowing trial calls
+    :param int half_open_max_calls: number of trial calls when half-open
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self,
+                 name: str,
+                 failure_rate_threshold: float=0.5,
+                 minimum_calls: int=10,
+                 window: float=30.0,
+                 buckets: int=10,
+                 cooldown: float=30.0,
+                 half_open_max_calls: int=1
+                 ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.window = window
+        self.bucket_width = window / buckets
+        self.cooldown = cooldown
+        self.half_open_max_calls = half_open_max_calls
+        self._buckets = []  # list of [bucket start, successes, failures]
+        self._state = self.CLOSED
+        self._opened_at = None
+        self._trial_calls = 0
+        self._trial_successes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """
+        Get the current state of the breaker (closed, open or half-open)
+
+        :return: state
+        :rtype: str
+        """
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> str:
+        if self._state == self.OPEN and now - self._opened_at >= self.cooldown:
+            self._state = self.HALF_OPEN
+            self._trial_calls = 0
+            self._trial_successes = 0
+        return self._state
+
+    def before_call(self):
+        """
+        Register the start of a call
+
+        :raise paynlsdk.exceptions.CircuitOpenException: the breaker is open, the call must not be performed
+        """
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and self._trial_calls < self.half_open_max_calls:
+                self._trial_calls += 1
+                return
+            retry_after = max(0.0, self._opened_at + self.cooldown - now) if state == self.OPEN else 0.0
+        raise CircuitOpenException('Circuit for {} is {}'.format(self.name, state), self.name, retry_after)
+
+    def record_success(self):
+        """
+        Register a successful call
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._current_state(now) == self.HALF_OPEN:
+                self._trial_successes += 1
+                if self._trial_successes >= self.half_open_max_calls:
+                    self._close()
+                return
+            self._get_bucket(now)[1] += 1
+
+    def record_failure(self):
+        """
+        Register a failed call
+        """
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            if state == self.HALF_OPEN:
+                self._open(now)
+                return
+            if state == self.OPEN:
+                return
+            self._get_bucket(now)[2] += 1
+            successes, failures = self._totals()
+            calls = successes + failures
+            if calls >= self.minimum_calls and failures / calls >= self.failure_rate_threshold:
+                self._open(now)
+
+    def release_trial(self):
+        """
+        Register a call that ended without telling anything about the health of the API (e.g. it was cancelled)
+
+        When half-open, the trial slot of the call is given back, so another call can test the API
+        """
+        with self._lock:
+            if self._current_state(time.monotonic()) == self.HALF_OPEN and self._trial_calls > 0:
+                self._trial_calls -= 1
+
+    def reset(self):
+        """
+        Reset the breaker to the closed state, forgetting all recorded calls
+        """
+        with self._lock:
+            self._close()
+
+    def _open(self, now: float):
+        self._state = self.OPEN
+        self._opened_at = now
+        self._buckets = []
+
+    def _close(self):
+        self._state = self.CLOSED
+        self._opened_at = None
+        self._buckets = []
+
+    def _get_bucket(self, now: float) -> list:
+        start = now - now % self.bucket_width
+        if not self._buckets or self._buckets[-1][0] != start:
+            self._buckets.append([start, 0, 0])
+        # Drop buckets that have rolled out of the window
+        while self._buckets[0][0] <= now - self.window:
+            self._buckets.pop(0)
+        return self._buckets[-1]
+
+    def _totals(self) -> tuple:
+        return sum(bucket[1] for bucket in self._buckets), sum(bucket[2] for bucket in self._buckets)
+
+    def __repr__(self):
+        return '<CircuitBreaker {} {}>'.format(self.name, self.state)
+
+
+class CircuitBreakerRegistry(object):
+    """
+    Registry holding a :class:`CircuitBreaker` per API controller/method (e.g. Transaction/start)
+
+    All keyword arguments are passed to every :class:`CircuitBreaker` the registry creates.
+    """
+    def __init__(self, **settings):
+        self.settings = settings
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(request) -> str:
+        """
+        Get the breaker key for a request
+
+        :param request: the request
+        :type request: paynlsdk.api.requestbase.RequestBase
+        :return: key in the form of controller/method
+        :rtype: str
+        """
+        return '{}/{}'.format(request.get_controller(), request.get_method())
+
+    def get(self, key: str) -> CircuitBreaker:
+        """
+        Get (or create) the breaker for the given key
+
+        :param key: breaker key in the form of controller/method
+        :type key: str
+        :return: circuit breaker
+        :rtype: CircuitBreaker
+        """
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(key)
+                if breaker is None:
+                    breaker = CircuitBreaker(key, **self.settings)
+                    self._breakers[key] = breaker
+        return breaker
+
+    def get_for_request(self, request) -> CircuitBreaker:
+        """
+        Get (or create) the breaker for the given request
+
+        :param request: the request
+        :type request: paynlsdk.api.requestbase.RequestBase
+        :return: circuit breaker
+        :rtype: CircuitBreaker
+        """
+        return self.get(self.get_key(request))
+
+    def reset(self):
+        """
+        Reset all breakers to the closed state
+        """
+        with self._lock:
+            breakers = list(self._breakers.values())
+        for breaker in breakers:
+            breaker.reset()
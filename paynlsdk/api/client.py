@@ -1,11 +1,29 @@
 import json
+import logging
+import os
 import sys
+import threading
+import time
 import requests
 import base64
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, wait, FIRST_COMPLETED
+from typing import Iterable
+from paynlsdk.api.circuitbreaker import CircuitBreakerRegistry
+from paynlsdk.api.deadline import Deadline
+from paynlsdk.api.hedging import HedgePolicy
+from paynlsdk.api.hooks import CallContext, ClientHooks, redact_headers, redact_parameters
+from paynlsdk.api.jsonbackend import JSONBackend
+from paynlsdk.api.ratelimit import RateLimiter
 from paynlsdk.api.requestbase import RequestBase
-from paynlsdk.exceptions import ErrorException
+from paynlsdk.api.retry import RetryPolicy
+from paynlsdk.api.singleflight import SingleFlight, get_flight_key
+from paynlsdk.api.transport import Transport, RequestsTransport
+from paynlsdk.exceptions import ErrorException, DeadlineExceededException
+from paynlsdk.objects import Error
 from paynlsdk.validators import ParamValidator
 
+logger = logging.getLogger(__name__)
+
 PAYNL_END_POINT = "https://rest-api.pay.nl"
 PAYNL_CLIENT_VERSION = "1.0.2"
 
@@ -27,14 +45,138 @@ class APIAuthentication(object):
 
 
 class APIClient(object):
+    """
+    API client performing the actual HTTP calls to the Pay.nl API
+
+    The HTTP calls are performed by the client's transport (see :class:`paynlsdk.api.transport.Transport`). By default
+    this is a :class:`paynlsdk.api.transport.RequestsTransport`, owning a single :class:`requests.Session` with a
+    pooled, keep-alive capable HTTP adapter, configured by the pool arguments below.
+    The :mod:`paynlsdk.client` utility classes all share the client returned by :meth:`APIClient.get_default`
+
+    :param int pool_size: number of connection pools (one per host) to cache
+    :param int max_connections_per_host: maximum number of connections to keep in the pool of a single host
+    :param bool keep_alive: whether to keep connections alive between calls.
+                            If False, every call will open (and close) its own connection
+    :param bool pool_block: whether to block when no free connection is available in the pool (instead of
+                            opening an additional, non pooled connection)
+    :param float connect_timeout: default number of seconds to wait for a connection to be established
+    :param float read_timeout: default number of seconds to wait for data from the API
+    :param RetryPolicy retry_policy: policy for retrying failed calls to idempotent API methods.
+                                     Use None to never retry
+    :param CircuitBreakerRegistry circuit_breakers: circuit breakers (per API method) to protect the API with.
+                                                    Use None to disable circuit breaking
+    :param bool coalesce_reads: whether identical calls to idempotent API methods that are in flight at the same time
+                                are coalesced into a single HTTP call, sharing the parsed response
+    :param HedgePolicy hedge_policy: policy for firing a second, identical call to an idempotent API method when the
+                                     first one is slow. Use None to never hedge
+    :param RateLimiter rate_limiter: client side rate limiter (per API method) to stay within the API limits.
+                                     Use None to disable rate limiting
+    :param json_backend: JSON backend parsing the responses (see :class:`paynlsdk.api.jsonbackend.JSONBackend`),
+                         or the name of one: json (default), orjson, ujson or auto (the fastest one installed)
+    :type json_backend: str|JSONBackend
+    :param bool lite: whether to decode responses into plain dicts instead of response objects, for requests that do
+                      not set :attr:`paynlsdk.api.requestbase.RequestBase.lite` themselves.
+                      See :meth:`paynlsdk.api.schemaloader.SchemaLoader.load_lite`
+    :param Transport transport: transport performing the HTTP calls. Defaults to a
+                                :class:`paynlsdk.api.transport.RequestsTransport` using the pool arguments
+    :param ClientHooks hooks: hooks to call during every API call (see :class:`paynlsdk.api.hooks.ClientHooks`), e.g.
+                              to record metrics. Defaults to no hooks; add them using ``client.hooks.add()``
+    """
     print_debug = False
+    _default_client = None
+    _default_client_lock = threading.Lock()
 
-    def __init__(self):
+    def __init__(self,
+                 pool_size: int=10,
+                 max_connections_per_host: int=10,
+                 keep_alive: bool=True,
+                 pool_block: bool=False,
+                 connect_timeout: float=10.0,
+                 read_timeout: float=60.0,
+                 retry_policy: RetryPolicy=None,
+                 circuit_breakers: CircuitBreakerRegistry=None,
+                 coalesce_reads: bool=False,
+                 hedge_policy: HedgePolicy=None,
+                 rate_limiter: RateLimiter=None,
+                 json_backend='json',
+                 lite: bool=False,
+                 transport: Transport=None,
+                 hooks: ClientHooks=None
+                 ):
         self.__supported_status_codes = [200]
         self.end_point = PAYNL_END_POINT
         self.client_version = PAYNL_CLIENT_VERSION
         self.api_token = None
         self.service_id = None
+        self.pool_size = pool_size
+        self.max_connections_per_host = max_connections_per_host
+        self.keep_alive = keep_alive
+        self.pool_block = pool_block
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retry_policy = retry_policy
+        self.circuit_breakers = circuit_breakers
+        self.coalesce_reads = coalesce_reads
+        self.hedge_policy = hedge_policy
+        self.rate_limiter = rate_limiter
+        self.json_backend = JSONBackend.create(json_backend) if isinstance(json_backend, str) else json_backend
+        self.lite = lite
+        self.transport = transport if transport is not None else self._create_transport()
+        self.hooks = hooks if hooks is not None else ClientHooks()
+        self._hedge_executor_lock = threading.Lock()
+        self._hedge_executor = None
+        self._hedge_executor_pid = None
+        self._single_flight = self._create_single_flight()
+
+    @classmethod
+    def get_default(cls):
+        """
+        Get the shared client instance
+
+        The shared instance is created on first use and is used by all :mod:`paynlsdk.client` utility classes.
+        :return: shared API client
+        :rtype: APIClient
+        """
+        if cls._default_client is None:
+            with cls._default_client_lock:
+                if cls._default_client is None:
+                    cls._default_client = cls()
+        return cls._default_client
+
+    @classmethod
+    def set_default(cls, client):
+        """
+        Set the shared client instance (e.g. to use a client with a different pool configuration)
+
+        The previously shared client (if any) will NOT be closed.
+        :param client: API client to share. Use None to reset to a default instance on next use
+        :type client: APIClient
+        """
+        with cls._default_client_lock:
+            cls._default_client = client
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        Get the pooled HTTP session of the client's :class:`paynlsdk.api.transport.RequestsTransport`
+
+        :return: HTTP session
+        :rtype: requests.Session
+        """
+        return self.transport.session
+
+    def close(self):
+        """
+        Close the transport (e.g. all pooled connections) of this client
+
+        The transport will be used again if the client is used again after closing it.
+        """
+        self.transport.close()
+        with self._hedge_executor_lock:
+            if self._hedge_executor is not None:
+                self._hedge_executor.shutdown(wait=False)
+            self._hedge_executor = None
+            self._hedge_executor_pid = None
 
     def get_auth(self, as_string: bool=True):
         """
@@ -61,7 +203,9 @@ class APIClient(object):
 
     def perform_request(self,
                         request: RequestBase,
-                        method: str='POST'
+                        method: str='POST',
+                        timeout=None,
+                        deadline: Deadline=None
                         ):
         """
         Performs the actual call to the API and fill the responses.
@@ -82,10 +226,399 @@ class APIClient(object):
         :type request: paynlsdk.api.requestbase.RequestBase
         :param method: HTTP method (stick to POST!)
         :type method: str
+        :param timeout: timeout for this call, overriding the client's timeouts.
+                        Either a number of seconds or a (connect timeout, read timeout) tuple
+        :type timeout: float|tuple
+        :param deadline: deadline the call must finish within. Timeouts will be capped to the remaining time
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: void
         :rtype: void
         :raise paynlsdk.exceptions.ErrorException: generic error occurred
         :raise paynlsdk.exceptions.SchemaException: error occurred during result parsing (schema load/validation failure)
+        :raise paynlsdk.exceptions.DeadlineExceededException: the call could not be finished before the deadline
+        :raise paynlsdk.exceptions.CircuitOpenException: the circuit breaker for the API method is open
+        """
+        hooks = self.hooks
+        if not hooks.active:
+            url, headers, parameters = self._prepare_request(request, method)
+            self._perform_prepared(request, method, url, headers, parameters, timeout, deadline, None)
+            return
+
+        call = CallContext(request, method)
+        try:
+            started = time.monotonic()
+            call.url, call.headers, call.parameters = self._prepare_request(request, method)
+            call.timings.encode = time.monotonic() - started
+            hooks.call(ClientHooks.BEFORE_REQUEST, call)
+            self._perform_prepared(request, method, call.url, call.headers, call.parameters, timeout, deadline, call)
+        except Exception as e:
+            call.error = e
+            hooks.call(ClientHooks.ON_ERROR, call)
+            raise
+
+    def _perform_prepared(self, request: RequestBase, method: str, url: str, headers: dict, parameters: dict,
+                          timeout, deadline: Deadline, call: CallContext):
+        """
+        Perform a prepared request, coalesced with an identical call in flight if the client coalesces reads
+        """
+        if not self.coalesce_reads or not request.is_idempotent():
+            self._perform(request, method, url, headers, parameters, timeout, deadline, call)
+            return
+
+        leader, shared = self._single_flight.do(
+            get_flight_key(method, url, parameters),
+            lambda: self._perform(request, method, url, headers, parameters, timeout, deadline, call),
+            deadline.remaining() if deadline is not None else None)
+        if shared:
+            self._share_response(leader, request)
+
+    def _create_transport(self) -> Transport:
+        return RequestsTransport(self.pool_size, self.max_connections_per_host, self.keep_alive, self.pool_block)
+
+    def _create_single_flight(self):
+        return SingleFlight()
+
+    @staticmethod
+    def _share_response(leader: RequestBase, request: RequestBase):
+        """
+        Fill a request with the (already parsed) response of an identical, coalesced request
+        """
+        if leader.lite != request.lite:
+            # The leader's response has the other form: decode the raw response again
+            request.json_backend = leader.json_backend
+            request.raw_response = leader.raw_response
+            return
+        request._raw_response = leader.raw_response
+        request.response = leader.response
+
+    def _perform(self, request: RequestBase, method: str, url: str, headers: dict, parameters: dict, timeout,
+                 deadline: Deadline, call: CallContext=None) -> RequestBase:
+        """
+        Perform the HTTP call for a prepared request and fill the response
+
+        :return: the request
+        :rtype: paynlsdk.api.requestbase.RequestBase
+        """
+        response = self._send_with_retry(request, method, url, headers, parameters, timeout, deadline, call)
+        if call is not None:
+            call.status_code = response.status_code
+            call.raw_response = response.content
+            self.hooks.call(ClientHooks.AFTER_RESPONSE, call)
+
+        if not self._is_supported_status_code(response.status_code):
+            response.raise_for_status()
+
+        if self.print_debug:
+            logger.debug('Response object: %s', response)
+            logger.debug('Raw response: %s', response.text)
+
+        self._handle_response(request, response.content, call)
+        return request
+
+    def _send(self, method: str, url: str, headers: dict, parameters: dict, timeout, deadline: Deadline,
+              call: CallContext=None):
+        """
+        Perform a single HTTP call
+
+        :return: HTTP response
+        :rtype: requests.Response
+        :raise paynlsdk.exceptions.DeadlineExceededException: the call could not be finished before the deadline
+        """
+        timeout = self._get_timeout(timeout, deadline, url)
+        try:
+            if call is None:
+                return self.transport.send(method, url, headers, parameters, timeout)
+            call.attempts += 1
+            return self.transport.send(method, url, headers, parameters, timeout, call.timings)
+        except requests.exceptions.Timeout as e:
+            if deadline is not None and deadline.is_expired():
+                raise DeadlineExceededException('Deadline of {}s exceeded while calling {}'.format(
+                    deadline.timeout, url)) from e
+            raise
+
+    def _send_attempt(self, request: RequestBase, method: str, url: str, headers: dict, parameters: dict, timeout,
+                      deadline: Deadline, call: CallContext=None):
+        """
+        Perform a single attempt of the HTTP call, hedged according to the client's hedge policy
+
+        :return: HTTP response of the first call to answer
+        :rtype: requests.Response
+        """
+        policy = self.hedge_policy
+        if policy is None:
+            return self._send(method, url, headers, parameters, timeout, deadline, call)
+        policy.register_call()
+        delay = policy.get_delay(request)
+        if delay is None:
+            return self._send_timed(request, method, url, headers, parameters, timeout, deadline, call)
+
+        executor = self._get_hedge_executor()
+        args = (request, method, url, headers, parameters, timeout, deadline, call)
+        futures = [executor.submit(self._send_timed, *args)]
+        done, pending = wait(futures, delay)
+        if not done and self._may_hedge(request):
+            logger.debug('Hedging %s after %.3fs', url, delay)
+            futures.append(executor.submit(self._send_timed, *args))
+            pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for loser in pending:
+                        loser.add_done_callback(self._close_response)
+                    return future.result()
+        # All calls failed: report the failure of the first one
+        return futures[0].result()
+
+    def _may_hedge(self, request: RequestBase) -> bool:
+        # Ask the hedge budget first, so a refused hedge never takes a rate limiter token. A budget token is given
+        # back when the rate limiter refuses the hedge
+        if not self.hedge_policy.allow_hedge():
+            return False
+        if self.rate_limiter is not None and self.rate_limiter.try_acquire(request):
+            self.hedge_policy.refund_hedge()
+            return False
+        return True
+
+    def _send_timed(self, request: RequestBase, method: str, url: str, headers: dict, parameters: dict, timeout,
+                    deadline: Deadline, call: CallContext=None):
+        started = time.monotonic()
+        response = self._send(method, url, headers, parameters, timeout, deadline, call)
+        if self._is_supported_status_code(response.status_code):
+            self.hedge_policy.record_latency(request, time.monotonic() - started)
+        return response
+
+    @staticmethod
+    def _close_response(future):
+        if future.exception() is None:
+            future.result().close()
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        pid = os.getpid()
+        if self._hedge_executor is None or self._hedge_executor_pid != pid:
+            with self._hedge_executor_lock:
+                if self._hedge_executor is None or self._hedge_executor_pid != pid:
+                    self._hedge_executor = ThreadPoolExecutor(max_workers=max(2, 2 * self.max_connections_per_host))
+                    self._hedge_executor_pid = pid
+        return self._hedge_executor
+
+    def _send_with_retry(self, request: RequestBase, method: str, url: str, headers: dict, parameters: dict,
+                         timeout, deadline: Deadline, call: CallContext=None):
+        """
+        Perform the HTTP call, guarded by the circuit breaker and retried according to the client's retry policy
+
+        :return: HTTP response of the last attempt
+        :rtype: requests.Response
+        :raise paynlsdk.exceptions.CircuitOpenException: the circuit breaker for the API method is open
+        """
+        policy = self.retry_policy
+        breaker = self.circuit_breakers.get_for_request(request) if self.circuit_breakers is not None else None
+        if policy is not None:
+            policy.register_call()
+        attempt = 1
+        while True:
+            if deadline is not None:
+                deadline.check('calling {}'.format(url))
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(request, deadline)
+            if breaker is not None:
+                breaker.before_call()
+            try:
+                response = self._send_attempt(request, method, url, headers, parameters, timeout, deadline, call)
+            except DeadlineExceededException:
+                if breaker is not None:
+                    breaker.record_failure()
+                raise
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if breaker is not None:
+                    breaker.record_failure()
+                if policy is None:
+                    raise
+                delay = policy.get_backoff(attempt)
+                if not self._may_retry(request, attempt, delay, deadline):
+                    raise
+            except BaseException:
+                # Not a failure of the API (e.g. a cancelled call or a local error), but a half-open breaker would
+                # wait for its trial call forever
+                if breaker is not None:
+                    breaker.release_trial()
+                raise
+            else:
+                self._record_status(breaker, response.status_code)
+                if policy is None or self._is_supported_status_code(response.status_code) \
+                        or not policy.is_retryable_status(response.status_code):
+                    return response
+                delay = policy.get_delay(attempt, response.headers)
+                if delay is None or not self._may_retry(request, attempt, delay, deadline):
+                    return response
+                response.close()
+            logger.debug('Retrying %s in %.3fs (attempt %d)', url, delay, attempt + 1)
+            time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _record_status(breaker, status_code: int):
+        if breaker is None:
+            return
+        # Only server errors indicate the API is in trouble. Client errors (including throttling) do not
+        if status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    def _may_retry(self, request: RequestBase, attempt: int, delay: float, deadline: Deadline) -> bool:
+        # Never wait for a retry that cannot finish before the deadline anyway
+        if deadline is not None and deadline.remaining() <= delay:
+            return False
+        return self.retry_policy.allow_retry(request, attempt)
+
+    def perform_many(self,
+                     requests: Iterable[RequestBase],
+                     method: str='POST',
+                     max_workers: int=8,
+                     timeout: float=None,
+                     ordered: bool=True,
+                     fail_fast: bool=False
+                     ):
+        """
+        Performs many calls to the API concurrently, using a bounded pool of worker threads.
+
+        This is a generator yielding a tuple of ``(request, response_or_exception)`` for every given request.
+        For a successful call the second item is the request's response, for a failed call it is the raised exception.
+        The given requests are consumed lazily: no more than ``max_workers`` calls are in flight at any time and
+        only a limited number of finished results is buffered, so the requests may be an (endless) generator.
+
+        :param requests: the generic requests to perform
+        :type requests: Iterable[paynlsdk.api.requestbase.RequestBase]
+        :param method: HTTP method (stick to POST!)
+        :type method: str
+        :param max_workers: maximum number of calls performed concurrently
+        :type max_workers: int
+        :param timeout: maximum number of seconds a single call may take once it has started.
+                        A call exceeding this time is abandoned and reported with a
+                        :class:`concurrent.futures.TimeoutError`. Use None to wait indefinitely
+        :type timeout: float
+        :param ordered: True to yield results in the order of the given requests,
+                        False to yield results in order of completion
+        :type ordered: bool
+        :param fail_fast: True to stop at the first failed call and raise its exception,
+                          False to yield exceptions along with successful responses
+        :type fail_fast: bool
+        :return: generator of (request, response or exception) tuples
+        :rtype: Iterator[tuple]
+        """
+        if max_workers < 1:
+            raise ValueError('max_workers must be at least 1')
+        iterator = iter(requests)
+        max_buffered = max_workers * 4
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='paynlsdk')
+        # Items in submission order. Finished items are kept here until they are yielded
+        items = []
+        exhausted = False
+        try:
+            while True:
+                running = sum(1 for item in items if not item.finished)
+                while not exhausted and running < max_workers and len(items) < max_buffered:
+                    try:
+                        request = next(iterator)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    item = _BatchItem(request)
+                    item.future = executor.submit(self._perform_batch_item, item, method, timeout)
+                    items.append(item)
+                    running += 1
+                if not items:
+                    return
+
+                unfinished = [item.future for item in items if not item.finished]
+                if unfinished:
+                    wait(unfinished, timeout=self._next_batch_timeout(items, timeout), return_when=FIRST_COMPLETED)
+                now = time.monotonic()
+                for item in items:
+                    if item.finished:
+                        continue
+                    if item.future.done():
+                        item.finish(item.future.result())
+                    elif timeout is not None and item.started is not None and now - item.started >= timeout:
+                        item.future.cancel()
+                        item.finish(TimeoutError('Call to {} did not finish within {} seconds'.format(
+                            item.request.get_url(), timeout)))
+
+                if ordered:
+                    ready = []
+                    while items and items[0].finished:
+                        ready.append(items.pop(0))
+                else:
+                    ready = [item for item in items if item.finished]
+                    ready.sort(key=lambda ready_item: ready_item.finished_at)
+                    items = [item for item in items if not item.finished]
+
+                for item in ready:
+                    if fail_fast and isinstance(item.result, Exception):
+                        raise item.result
+                    yield item.request, item.result
+        finally:
+            for item in items:
+                item.future.cancel()
+            executor.shutdown(wait=False)
+
+    def _perform_batch_item(self, item, method: str, timeout: float):
+        item.started = time.monotonic()
+        try:
+            # A deadline makes sure an abandoned call does not keep its worker busy for long
+            self.perform_request(item.request, method, deadline=Deadline(timeout) if timeout is not None else None)
+            return item.request.response
+        except Exception as e:
+            return e
+
+    @staticmethod
+    def _next_batch_timeout(items, timeout: float):
+        if timeout is None:
+            return None
+        expiries = [item.started + timeout for item in items if not item.finished and item.started is not None]
+        if not expiries:
+            # Nothing has started yet; check again once the first call could have timed out
+            return timeout
+        return max(0.0, min(expiries) - time.monotonic())
+
+    def _get_timeout(self, timeout, deadline: Deadline, url: str):
+        """
+        Determine the (connect timeout, read timeout) tuple to use for a call
+
+        :param timeout: timeout for the call, or None to use the client's timeouts
+        :type timeout: float|tuple
+        :param deadline: deadline for the call, if any
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :param url: url that is about to be called
+        :type url: str
+        :return: connect and read timeout
+        :rtype: tuple
+        :raise paynlsdk.exceptions.DeadlineExceededException: the deadline has already expired
+        """
+        if timeout is None:
+            connect_timeout, read_timeout = self.connect_timeout, self.read_timeout
+        elif isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+        else:
+            connect_timeout, read_timeout = timeout, timeout
+        if deadline is not None:
+            deadline.check('calling {}'.format(url))
+            remaining = deadline.remaining()
+            connect_timeout = remaining if connect_timeout is None else min(connect_timeout, remaining)
+            read_timeout = remaining if read_timeout is None else min(read_timeout, remaining)
+        return connect_timeout, read_timeout
+
+    def _prepare_request(self, request: RequestBase, method: str):
+        """
+        Prepare a request for sending: complete the credentials and build the url, headers and parameters
+
+        :param request: the generic request to prepare
+        :type request: paynlsdk.api.requestbase.RequestBase
+        :param method: HTTP method
+        :type method: str
+        :return: tuple of url, HTTP headers and request parameters
+        :rtype: tuple
         """
         headers = {
           'Accept': 'application/json',
@@ -101,35 +634,76 @@ class APIClient(object):
         if request.requires_service_id() and ParamValidator.is_empty(request.service_id)\
                 and ParamValidator.not_empty(APIAuthentication.service_id):
                 request.service_id = APIAuthentication.service_id
+        if request.lite is None:
+            request.lite = self.lite
 
         # Build url
-        url = "{0}/{1}".format(PAYNL_END_POINT, request.get_url())
+        url = "{0}/{1}".format(self.end_point, request.get_url())
         parameters = request.get_parameters()
         if APIAuthentication.use_http_auth and 'token' in parameters:
             del parameters['token']
 
         if self.print_debug:
-            print("Calling {} using {}".format(url, method))
-            print("HTTP Headers: {}".format(json.dumps(headers)))
-            print("Params: {}".format(json.dumps(parameters)))
+            logger.debug('Calling %s using %s', url, method)
+            logger.debug('HTTP Headers: %s', json.dumps(redact_headers(headers)))
+            logger.debug('Params: %s', json.dumps(redact_parameters(parameters)))
 
-        if method.upper() == 'GET':
-            response = requests.get(url, verify=True, headers=headers, params=parameters)
-        else:
-            response = requests.post(url, verify=True, headers=headers, data=parameters)
+        return url, headers, parameters
 
-        if response.status_code not in self.__supported_status_codes:
-            response.raise_for_status()
+    def _is_supported_status_code(self, status_code: int) -> bool:
+        return status_code in self.__supported_status_codes
 
-        if self.print_debug:
-            print("Response object: {}".format(response))
-            print("Raw response: {}".format(response.text))
+    def _handle_response(self, request: RequestBase, raw_response, call: CallContext=None):
+        """
+        Let the request class interpret the raw response
 
+        :param request: the generic request that has been performed
+        :type request: paynlsdk.api.requestbase.RequestBase
+        :param raw_response: raw (JSON) response body as returned by the API
+        :type raw_response: bytes
+        :param call: the call to report to the client's hooks, or None
+        :type call: paynlsdk.api.hooks.CallContext
+        :raise paynlsdk.exceptions.ErrorException: generic error occurred
+        :raise paynlsdk.exceptions.SchemaException: error occurred during result parsing (schema load/validation failure)
+        """
         # Now the we have a response, let the request class handle the response.
-        request.raw_response = response.text
+        request.json_backend = self.json_backend
+        if call is None:
+            request.raw_response = raw_response
+        else:
+            started = time.monotonic()
+            try:
+                request.raw_response = raw_response
+            finally:
+                call.timings.schema_load = time.monotonic() - started
+            self.hooks.call(ClientHooks.ON_PARSE, call)
 
         if self.print_debug:
-            print(type(request.response))
+            logger.debug('Response type: %s', type(request.response))
+
+        response = request.response
+        if isinstance(response, dict):
+            # Lite response
+            error = response.get('request')
+            if error is not None and not error.get('result'):
+                raise ErrorException(Error(**error))
+        elif response.is_error():
+            raise ErrorException(response.request)
+
+
+class _BatchItem(object):
+    """
+    Bookkeeping for a single request performed by :meth:`APIClient.perform_many`
+    """
+    def __init__(self, request: RequestBase):
+        self.request = request
+        self.future = None
+        self.started = None
+        self.finished = False
+        self.finished_at = None
+        self.result = None
 
-        if request.response.is_error():
-            raise ErrorException(request.response.request)
+    def finish(self, result):
+        self.finished = True
+        self.finished_at = time.monotonic()
+        self.result = result
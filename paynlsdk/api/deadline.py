@@ -0,0 +1,51 @@
+import time
+
+from paynlsdk.exceptions import DeadlineExceededException
+
+
+class Deadline(object):
+    """
+    Deadline (latency budget) for one or more API calls
+
+    A deadline is created with the number of seconds the call(s) may take in total.
+    Every call that is given the deadline will cap its connect and read timeouts to the remaining time and will
+    raise a :class:`paynlsdk.exceptions.DeadlineExceededException` instead of starting (or waiting for) a call
+    that cannot finish in time. The same deadline can be passed to multiple subsequent calls.
+
+    :param float timeout: number of seconds from now until the deadline expires
+    """
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+
+    def remaining(self) -> float:
+        """
+        Get the remaining time until the deadline expires
+
+        :return: remaining number of seconds (never negative)
+        :rtype: float
+        """
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def is_expired(self) -> bool:
+        """
+        Check if the deadline has expired
+
+        :return: True if the deadline has expired, False otherwise
+        :rtype: bool
+        """
+        return time.monotonic() >= self.expires_at
+
+    def check(self, description: str='call'):
+        """
+        Assert the deadline has not yet expired
+
+        :param description: description of what is about to be done (used in the exception message)
+        :type description: str
+        :raise paynlsdk.exceptions.DeadlineExceededException: deadline has expired
+        """
+        if self.is_expired():
+            raise DeadlineExceededException('Deadline of {}s exceeded before {}'.format(self.timeout, description))
+
+    def __repr__(self):
+        return '<Deadline timeout={} remaining={:.3f}>'.format(self.timeout, self.remaining())
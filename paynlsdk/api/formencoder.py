@@ -0,0 +1,172 @@
+from paynlsdk.validators import ParamValidator
+
+
+class FormField(object):
+    """
+    Field of a :class:`FormEncoder` field map: maps an attribute of the encoded object onto a parameter
+
+    :param str attribute: attribute of the object holding the value
+    :param str name: name of the parameter. Nested parameters are named ``prefix[name]``
+    :param str omit: when to leave the parameter out: empty (the default, see
+                     :meth:`paynlsdk.validators.ParamValidator.is_empty`), null (only None) or never
+    :param bool required: whether an empty value raises a TypeError (see
+                          :meth:`paynlsdk.validators.ParamValidator.assert_not_empty`)
+    :param str param_name: name of the parameter used in the TypeError. Defaults to the attribute
+    :param callable format: function converting the value into the parameter value (e.g. formatting a date)
+    :param default: value (or nested object) to use when the value is left out
+    :param FormEncoder encoder: encoder of the nested object, or of every item if ``many`` is set
+    :param bool many: whether the value is a list of nested objects, encoded as ``name[index][...]``
+    :param bool mapping: whether the value is a dict, encoded as ``name[key]=value``
+    """
+    def __init__(self, attribute: str, name: str, omit: str='empty', required: bool=False, param_name: str=None,
+                 format=None, default=None, encoder=None, many: bool=False, mapping: bool=False):
+        if omit not in ('empty', 'null', 'never'):
+            raise ValueError('Invalid omit "{}", use empty, null or never'.format(omit))
+        self.attribute = attribute
+        self.name = name
+        self.omit = omit
+        self.required = required
+        self.param_name = param_name or attribute
+        self.format = format
+        self.default = default
+        self.encoder = encoder
+        self.many = many
+        self.mapping = mapping
+
+
+class FormEncoder(object):
+    """
+    Encoder turning an object into flat (bracket notation) form parameters, e.g. ``saleData[orderData][0][price]``
+
+    The encoder is driven by a field map: a :class:`FormField` per parameter. On first use the field map is compiled
+    into straight-line Python code and the parameter keys are cached per prefix (and per list index), so once warm,
+    encoding an object (e.g. a cart with many order lines) no longer builds any keys.
+
+    :param list fields: field map: the :class:`FormField` instances of the parameters, in order
+    """
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+        self._function = None
+        self._keys = {}
+        self._item_keys = {}
+
+    def encode(self, obj, parameters: dict=None, prefix: str='') -> dict:
+        """
+        Encode an object
+
+        :param obj: object to encode
+        :param parameters: parameters to add the encoded parameters to. Defaults to a new dict
+        :type parameters: dict
+        :param prefix: prefix of the parameters (e.g. enduser). Defaults to no prefix
+        :type prefix: str
+        :return: the parameters
+        :rtype: dict
+        :raise TypeError: a required value is empty
+        """
+        if parameters is None:
+            parameters = {}
+        self.get_function()(obj, parameters, self.get_keys(prefix))
+        return parameters
+
+    def get_keys(self, prefix: str='') -> tuple:
+        """
+        Get the keys of the parameters for a prefix
+
+        :param prefix: prefix of the parameters
+        :type prefix: str
+        :return: the key of every field, in order
+        :rtype: tuple
+        """
+        keys = self._keys.get(prefix)
+        if keys is None:
+            keys = self._keys[prefix] = self._build_keys(prefix)
+        return keys
+
+    def get_item_keys(self, prefix: str, number: int) -> list:
+        """
+        Get the keys of the parameters of the items of a list
+
+        :param prefix: prefix of the list (e.g. saleData[orderData])
+        :type prefix: str
+        :param number: number of items
+        :type number: int
+        :return: list of (at least) ``number`` tuples, holding the keys of the item with that index
+        :rtype: list
+        """
+        item_keys = self._item_keys.get(prefix)
+        if item_keys is None or len(item_keys) < number:
+            # Replaced as a whole, so other threads never see a partially built list
+            known = item_keys or []
+            item_keys = known + [self._build_keys('{}[{}]'.format(prefix, index))
+                                 for index in range(len(known), max(number, 2 * len(known)))]
+            self._item_keys[prefix] = item_keys
+        return item_keys
+
+    def _build_keys(self, prefix: str) -> tuple:
+        if not prefix:
+            return tuple(field.name for field in self.fields)
+        return tuple('{}[{}]'.format(prefix, field.name) for field in self.fields)
+
+    def get_function(self):
+        """
+        Get the compiled encoder function
+
+        :return: function ``encode(obj, parameters, keys)``, with ``keys`` as returned by :meth:`get_keys`
+        :rtype: callable
+        """
+        if self._function is None:
+            self._function = self._compile()
+        return self._function
+
+    def _compile(self):
+        names = {'ParamValidator': ParamValidator}
+        lines = ['def encode(obj, out, keys):']
+        for index, field in enumerate(self.fields):
+            lines.append('    value = obj.{}'.format(field.attribute))
+            if field.required or field.omit == 'empty':
+                present = 'value is not None and (value.strip() if type(value) is str else value)'
+            elif field.omit == 'null':
+                present = 'value is not None'
+            else:
+                present = None
+            indent = '    '
+            if field.required:
+                lines.append('    if not ({}):'.format(present))
+                lines.append('        ParamValidator.assert_not_empty(value, {!r})'.format(field.param_name))
+            elif present is not None:
+                if field.default is not None:
+                    names['default{}'.format(index)] = field.default
+                    lines.append('    if not ({}):'.format(present))
+                    lines.append('        value = default{}'.format(index))
+                else:
+                    lines.append('    if {}:'.format(present))
+                    indent = '        '
+            lines.extend(indent + line for line in self._compile_value(index, field, names))
+        if len(lines) == 1:
+            lines.append('    pass')
+        namespace = dict(names)
+        exec(compile('\n'.join(lines), '<form encoder>', 'exec'), namespace)
+        return namespace['encode']
+
+    @staticmethod
+    def _compile_value(index: int, field: FormField, names: dict) -> list:
+        """
+        Generate the code adding the parameter(s) of a field
+        """
+        key = 'keys[{}]'.format(index)
+        if field.encoder is not None:
+            names['encode{}'.format(index)] = field.encoder.get_function()
+            if field.many:
+                names['item_keys{}'.format(index)] = field.encoder.get_item_keys
+                return ['for item, item_keys in zip(value, item_keys{0}({1}, len(value))):'.format(index, key),
+                        '    encode{}(item, out, item_keys)'.format(index)]
+            names['keys{}'.format(index)] = field.encoder.get_keys
+            return ['encode{0}(value, out, keys{0}({1}))'.format(index, key)]
+        expression = 'item' if field.mapping else 'value'
+        if field.format is not None:
+            names['format{}'.format(index)] = field.format
+            expression = 'format{}({})'.format(index, expression)
+        if field.mapping:
+            return ['for name, item in value.items():',
+                    '    out[{}{}] = {}'.format(key, " + '[' + str(name) + ']'", expression)]
+        return ['out[{}] = {}'.format(key, expression)]
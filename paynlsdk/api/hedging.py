@@ -0,0 +1,165 @@
+import threading
+from collections import deque
+
+from paynlsdk.api.retry import RetryBudget
+
+
+class LatencyTracker(object):
+    """
+    Rolling window of the latencies observed for a single API method
+
+    :param int window_size: number of most recent latencies to keep
+    """
+    def __init__(self, window_size: int=200):
+        self._samples = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._samples)
+
+    def record(self, latency: float):
+        """
+        Register an observed latency
+
+        :param latency: latency in seconds
+        :type latency: float
+        """
+        with self._lock:
+            self._samples.append(latency)
+
+    def percentile(self, percentile: float):
+        """
+        Get the given percentile of the observed latencies
+
+        :param percentile: percentile (0.0 - 1.0)
+        :type percentile: float
+        :return: latency in seconds, or None if no latencies are observed yet
+        :rtype: float
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(percentile * len(samples)))]
+
+
+class HedgePolicy(object):
+    """
+    Policy describing when a hedged (second, identical) call is fired
+
+    When the first call to an idempotent API method has not returned after the hedge delay, an identical call is fired
+    and whichever answers first is used. The hedge delay is the observed ``percentile`` latency of the API method
+    (e.g. the p95 of *Transaction/status*), or a fixed ``delay`` if given. Until ``min_samples`` latencies are observed
+    for an API method (and no fixed delay is given), calls to it are not hedged.
+
+    Hedging trades extra calls for lower tail latency, so the number of hedged calls is limited by a budget that is
+    shared by all API methods: every call deposits ``budget.ratio`` tokens and every hedge withdraws a full token.
+
+    :param float percentile: percentile (0.0 - 1.0) of the observed latency to use as hedge delay
+    :param float delay: fixed hedge delay in seconds, overriding the observed percentile
+    :param float min_delay: minimum hedge delay in seconds
+    :param int min_samples: minimum number of observed latencies before the percentile is used
+    :param int window_size: number of most recent latencies to keep per API method
+    :param RetryBudget budget: hedge budget. Defaults to allowing hedges for 5% of the calls
+    """
+    def __init__(self,
+                 percentile: float=0.95,
+                 delay: float=None,
+                 min_delay: float=0.005,
+                 min_samples: int=20,
+                 window_size: int=200,
+                 budget: RetryBudget=None
+                 ):
+        self.percentile = percentile
+        self.delay = delay
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.window_size = window_size
+        self.budget = budget if budget is not None else RetryBudget(ratio=0.05)
+        self._trackers = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(request) -> str:
+        """
+        Get the key latencies are tracked by for a request
+
+        :param request: the request
+        :type request: paynlsdk.api.requestbase.RequestBase
+        :return: key in the form of controller/method
+        :rtype: str
+        """
+        return '{}/{}'.format(request.get_controller(), request.get_method())
+
+    def get_tracker(self, key: str) -> LatencyTracker:
+        """
+        Get (or create) the latency tracker for the given key
+
+        :param key: key in the form of controller/method
+        :type key: str
+        :return: latency tracker
+        :rtype: LatencyTracker
+        """
+        tracker = self._trackers.get(key)
+        if tracker is None:
+            with self._lock:
+                tracker = self._trackers.get(key)
+                if tracker is None:
+                    tracker = LatencyTracker(self.window_size)
+                    self._trackers[key] = tracker
+        return tracker
+
+    def get_delay(self, request):
+        """
+        Get the number of seconds to wait for the first call before firing a hedged call
+
+        :param request: the request
+        :type request: paynlsdk.api.requestbase.RequestBase
+        :return: delay in seconds, or None if the request is not to be hedged
+        :rtype: float
+        """
+        if not request.is_idempotent():
+            return None
+        if self.delay is not None:
+            return max(self.min_delay, self.delay)
+        tracker = self.get_tracker(self.get_key(request))
+        if len(tracker) < self.min_samples:
+            return None
+        return max(self.min_delay, tracker.percentile(self.percentile))
+
+    def record_latency(self, request, latency: float):
+        """
+        Register the latency of a successful call
+
+        :param request: the request
+        :type request: paynlsdk.api.requestbase.RequestBase
+        :param latency: latency in seconds
+        :type latency: float
+        """
+        self.get_tracker(self.get_key(request)).record(latency)
+
+    def register_call(self):
+        """
+        Register a new (non hedged) call with the hedge budget
+        """
+        if self.budget is not None:
+            self.budget.deposit()
+
+    def allow_hedge(self) -> bool:
+        """
+        Check if a hedged call may be fired
+
+        Please note a successful check withdraws a token from the hedge budget. Use :meth:`refund_hedge` when the hedged
+        call is not fired after all
+
+        :return: True if the hedged call is allowed
+        :rtype: bool
+        """
+        return self.budget is None or self.budget.try_withdraw()
+
+    def refund_hedge(self):
+        """
+        Give back the hedge budget token of a hedged call that was allowed, but not fired
+        """
+        if self.budget is not None:
+            self.budget.refund()
@@ -0,0 +1,213 @@
+import threading
+
+from paynlsdk.api.requestbase import RequestBase
+
+
+REDACTED = '***'
+
+
+def redact_headers(headers: dict) -> dict:
+    """
+    Copy HTTP headers, hiding the credentials of the authorization header (keeping its scheme, e.g. Basic)
+    """
+    headers = dict(headers)
+    for name in headers:
+        if name.lower() == 'authorization':
+            headers[name] = headers[name].split(' ', 1)[0] + ' ' + REDACTED
+    return headers
+
+
+def redact_parameters(parameters: dict) -> dict:
+    """
+    Copy request parameters, hiding the API token
+    """
+    parameters = dict(parameters)
+    if 'token' in parameters:
+        parameters['token'] = REDACTED
+    return parameters
+
+
+class CallTimings(object):
+    """
+    Monotonic timings (in seconds) of the stages of a single API call
+
+    Stages that have not been performed (yet) are None. When a call is retried or hedged, the network timings are those
+    of the last HTTP attempt that finished.
+
+    :ivar float encode: preparing the request: credentials, url, headers and parameter encoding
+    :ivar float connect: establishing the connection (including the TLS handshake). 0 when a pooled connection was
+                         reused
+    :ivar float ttfb: time to first byte: from sending the request until the response headers arrived, excluding
+                      the connect time
+    :ivar float body_read: reading the response body
+    :ivar float schema_load: parsing the JSON response body and loading the response schema
+    """
+    __slots__ = ('encode', 'connect', 'ttfb', 'body_read', 'schema_load')
+
+    def __init__(self):
+        self.encode = None
+        self.connect = None
+        self.ttfb = None
+        self.body_read = None
+        self.schema_load = None
+
+    def as_dict(self) -> dict:
+        """
+        Get the timings as a dict, e.g. to pass them to a metrics library
+
+        :return: dict of the stage name to its timing
+        :rtype: dict
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return str(self.as_dict())
+
+
+class CallContext(object):
+    """
+    A single API call, as passed to the :class:`ClientHooks`
+
+    The headers and parameters are the ones sent, so ``before_request`` hooks may add or change them. Use
+    :meth:`get_redacted_headers` and :meth:`get_redacted_parameters` to log them: these hide the credentials.
+
+    :ivar RequestBase request: the request being performed
+    :ivar str endpoint: name of the API method, e.g. Transaction::status
+    :ivar str method: HTTP method
+    :ivar str url: url called
+    :ivar dict headers: HTTP headers
+    :ivar dict parameters: request parameters
+    :ivar int attempts: number of HTTP calls made (including retries and hedged calls)
+    :ivar int status_code: HTTP status code of the response
+    :ivar bytes raw_response: raw (JSON) response body
+    :ivar Exception error: error the call failed with (for ``on_error`` hooks)
+    :ivar CallTimings timings: timings of the stages of the call
+    """
+    def __init__(self, request: RequestBase, method: str):
+        self.request = request
+        self.endpoint = '{}::{}'.format(request.get_controller(), request.get_method())
+        self.method = method
+        self.url = None
+        self.headers = None
+        self.parameters = None
+        self.attempts = 0
+        self.status_code = None
+        self.raw_response = None
+        self.error = None
+        self.timings = CallTimings()
+
+    def get_redacted_headers(self) -> dict:
+        """
+        Get the HTTP headers with the authorization header hidden
+
+        :return: copy of the HTTP headers
+        :rtype: dict
+        """
+        return redact_headers(self.headers or {})
+
+    def get_redacted_parameters(self) -> dict:
+        """
+        Get the request parameters with the API token hidden
+
+        :return: copy of the request parameters
+        :rtype: dict
+        """
+        return redact_parameters(self.parameters or {})
+
+    def __repr__(self):
+        return '<CallContext {} {} attempts={} status={} timings={}>'.format(
+            self.endpoint, self.method, self.attempts, self.status_code, self.timings)
+
+
+class ClientHooks(object):
+    """
+    Hooks (callbacks) called by an :class:`paynlsdk.api.client.APIClient` during every API call, e.g. to record
+    metrics or to log calls
+
+    Every hook receives the :class:`CallContext` of the call. The events are:
+
+    * before_request: the request has been encoded (``timings.encode``), right before the HTTP call
+    * after_response: the HTTP response has been received (``timings.connect``, ``ttfb`` and ``body_read``)
+    * on_parse: the response has been decoded (``timings.schema_load``), before API errors are raised
+    * on_error: the call failed; ``error`` holds the exception, which is raised again after the hooks
+
+    Hooks of an event are called in the order they were added, in the thread (or task) performing the call. Exceptions
+    raised by a hook are not caught. Calls coalesced into an identical call in flight (see the ``coalesce_reads``
+    argument of the client) only call the before_request (and on_error) hooks themselves.
+    When no hooks have been added, the client skips collecting the call details and timings altogether.
+    """
+    BEFORE_REQUEST = 'before_request'
+    AFTER_RESPONSE = 'after_response'
+    ON_PARSE = 'on_parse'
+    ON_ERROR = 'on_error'
+    EVENTS = (BEFORE_REQUEST, AFTER_RESPONSE, ON_PARSE, ON_ERROR)
+
+    def __init__(self):
+        self.active = False
+        self._hooks = {event: () for event in self.EVENTS}
+        self._lock = threading.Lock()
+
+    def add(self, event: str, hook):
+        """
+        Add a hook
+
+        :param event: event to call the hook on: before_request, after_response, on_parse or on_error
+        :type event: str
+        :param hook: callable receiving the :class:`CallContext`
+        :type hook: callable
+        :return: the hook
+        :raise ValueError: unknown event
+        """
+        if event not in self._hooks:
+            raise ValueError('Unknown event "{}", use one of {}'.format(event, ', '.join(self.EVENTS)))
+        with self._lock:
+            # Replaced as a whole, so calls in flight keep iterating the hooks they started with
+            self._hooks[event] = self._hooks[event] + (hook,)
+            self.active = True
+        return hook
+
+    def add_for(self, event: str):
+        """
+        Get a decorator adding the decorated function as a hook
+
+        :param event: event to call the hook on
+        :type event: str
+        :return: decorator
+        """
+        return lambda hook: self.add(event, hook)
+
+    def remove(self, event: str, hook):
+        """
+        Remove a hook
+
+        :param event: event the hook was added for
+        :type event: str
+        :param hook: the hook to remove
+        :type hook: callable
+        :raise ValueError: the hook was not added for the event
+        """
+        with self._lock:
+            hooks = list(self._hooks.get(event, ()))
+            hooks.remove(hook)
+            self._hooks[event] = tuple(hooks)
+            self.active = any(self._hooks.values())
+
+    def clear(self):
+        """
+        Remove all hooks
+        """
+        with self._lock:
+            self._hooks = {event: () for event in self.EVENTS}
+            self.active = False
+
+    def call(self, event: str, context: CallContext):
+        """
+        Call the hooks of an event
+
+        :param event: the event
+        :type event: str
+        :param context: the call
+        :type context: CallContext
+        """
+        for hook in self._hooks[event]:
+            hook(context)
@@ -0,0 +1,97 @@
+import json
+from abc import ABC, abstractmethod
+
+
+class JSONBackend(ABC):
+    """
+    JSON parser used to decode API responses
+
+    All backends parse the raw response body (bytes) directly, so the body doesn't have to be decoded into a string
+    first. Use :meth:`JSONBackend.create` to get a backend by name.
+
+    :cvar str name: name of the backend
+    """
+    name = None
+
+    @abstractmethod
+    def loads(self, data):
+        """
+        Parse a JSON document
+
+        :param data: JSON document
+        :type data: bytes|str
+        :return: the parsed document
+        :rtype: dict|list
+        """
+        pass
+
+    @staticmethod
+    def create(name: str='auto'):
+        """
+        Create a backend by name
+
+        :param name: name of the backend: json (the standard library), orjson or ujson.
+                     Use auto for the fastest backend installed (orjson, ujson, json; in that order)
+        :type name: str
+        :return: the backend
+        :rtype: JSONBackend
+        :raise ImportError: the package of the backend is not installed
+        :raise ValueError: the backend is unknown
+        """
+        if name == 'auto':
+            for backend_class in (OrjsonBackend, UjsonBackend):
+                try:
+                    return backend_class()
+                except ImportError:
+                    continue
+            return StdlibJSONBackend()
+        for backend_class in (StdlibJSONBackend, OrjsonBackend, UjsonBackend):
+            if backend_class.name == name:
+                return backend_class()
+        raise ValueError('Unknown JSON backend "{}"'.format(name))
+
+
+class StdlibJSONBackend(JSONBackend):
+    """
+    JSON backend using the :mod:`json` module of the standard library
+    """
+    name = 'json'
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+class OrjsonBackend(JSONBackend):
+    """
+    JSON backend using `orjson <https://github.com/ijl/orjson>`_
+    """
+    name = 'orjson'
+
+    def __init__(self):
+        try:
+            import orjson
+        except ImportError:
+            raise ImportError('The orjson JSON backend requires the orjson package. '
+                              'Please install it using "pip install paynlsdk[orjson]"')
+        self._loads = orjson.loads
+
+    def loads(self, data):
+        return self._loads(data)
+
+
+class UjsonBackend(JSONBackend):
+    """
+    JSON backend using `ujson <https://github.com/ultrajson/ultrajson>`_
+    """
+    name = 'ujson'
+
+    def __init__(self):
+        try:
+            import ujson
+        except ImportError:
+            raise ImportError('The ujson JSON backend requires the ujson package. '
+                              'Please install it using "pip install paynlsdk[ujson]"')
+        self._loads = ujson.loads
+
+    def loads(self, data):
+        return self._loads(data)
@@ -0,0 +1,207 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from paynlsdk.api.deadline import Deadline
+from paynlsdk.exceptions import DeadlineExceededException
+
+
+class MemoryBucketStore(object):
+    """
+    Store keeping the token buckets of a :class:`RateLimiter` in memory (shared by all threads of a process)
+    """
+    def __init__(self):
+        self._states = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Get exclusive access to the bucket states
+
+        :return: context manager yielding a dict of bucket name to [tokens, timestamp]
+        """
+        with self._lock:
+            yield self._states
+
+
+class FileBucketStore(object):
+    """
+    Store keeping the token buckets of a :class:`RateLimiter` in a file, shared by all processes on a host
+
+    Access is serialized using an exclusive ``flock`` on the file, so all processes (e.g. gunicorn workers) using the
+    same path share the same buckets. Use a path on a memory backed filesystem (e.g. ``/dev/shm``) to keep the
+    overhead low. Please note this store is only available on platforms supporting ``fcntl`` (i.e. not on Windows).
+
+    :param str path: path of the file holding the bucket states. It is created if it does not exist
+    """
+    def __init__(self, path: str):
+        import fcntl  # noqa: F401 (fail early on platforms without fcntl)
+        self.path = path
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Get exclusive access to the bucket states
+
+        The states are written back to the file when the context is left without an exception.
+
+        :return: context manager yielding a dict of bucket name to [tokens, timestamp]
+        """
+        import fcntl
+        # flock does not exclude threads sharing a file description, so serialize threads within this process first
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                data = b''
+                while True:
+                    chunk = os.read(fd, 65536)
+                    if not chunk:
+                        break
+                    data += chunk
+                try:
+                    states = json.loads(data.decode()) if data else {}
+                except ValueError:
+                    states = {}
+                yield states
+                data = json.dumps(states, separators=(',', ':')).encode()
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.write(fd, data)
+                os.ftruncate(fd, len(data))
+            finally:
+                # Closing the file releases the lock
+                os.close(fd)
+
+
+class RateLimiter(object):
+    """
+    Client side token bucket rate limiter
+
+    Every API controller/method (e.g. *Transaction/start*) has its own bucket holding up to ``burst`` tokens, refilled
+    with ``rate`` tokens per second. Every call takes a token from the bucket of its API method, waiting for one to
+    become available if the bucket is empty. Limits for specific API methods can be given in ``limits``.
+
+    Optionally, all calls share a global bucket as well (``global_rate``/``global_burst``). The API methods listed in
+    ``priority`` (interactive calls, like starting a transaction) get a priority lane in this global bucket: other
+    calls leave a ``priority_reserve`` fraction of its tokens for them, so bulk jobs can not starve the checkout.
+
+    The buckets are kept in a store; use a :class:`FileBucketStore` to share the limits between all processes on a
+    host instead of applying them per process.
+
+    :param float rate: default number of calls per second per API method
+    :param float burst: default maximum number of tokens per API method (at least 1). Defaults to ``rate``, but at
+                        least 1
+    :param dict limits: limits per API method, mapping controller/method to a (rate, burst) tuple
+    :param float global_rate: number of calls per second for all API methods together. Use None for no global limit
+    :param float global_burst: maximum number of tokens of the global bucket. Defaults to ``global_rate``, but at least
+                               1. It must be able to hold the token of a call plus the priority reserve
+    :param tuple priority: API methods (controller/method) using the priority lane
+    :param float priority_reserve: fraction (0.0 - 1.0) of the global bucket reserved for priority calls
+    :param store: store keeping the buckets. Defaults to a :class:`MemoryBucketStore`
+    :type store: MemoryBucketStore|FileBucketStore
+    :raise ValueError: a bucket can never hold the tokens a call needs
+    """
+    GLOBAL_BUCKET = '*'
+
+    def __init__(self,
+                 rate: float=20.0,
+                 burst: float=None,
+                 limits: dict=None,
+                 global_rate: float=None,
+                 global_burst: float=None,
+                 priority: tuple=('Transaction/start',),
+                 priority_reserve: float=0.25,
+                 store=None
+                 ):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.limits = limits if limits is not None else {}
+        self.global_rate = global_rate
+        if global_burst is None and global_rate is not None:
+            global_burst = max(1.0, global_rate)
+        self.global_burst = global_burst
+        self.priority = priority
+        self.priority_reserve = priority_reserve
+        self.store = store if store is not None else MemoryBucketStore()
+        # A bucket that can never hold the tokens of a call would make calls wait forever
+        for key, (_, key_burst) in dict(self.limits, **{'default': (rate, self.burst)}).items():
+            if key_burst < 1:
+                raise ValueError('Burst of {} must be at least 1, got {}'.format(key, key_burst))
+        if global_rate is not None and self.global_burst < 1 + priority_reserve * self.global_burst:
+            raise ValueError('Global burst {} can not hold a call plus the priority reserve of {}'.format(
+                self.global_burst, priority_reserve))
+
+    @staticmethod
+    def get_key(request) -> str:
+        """
+        Get the bucket key for a request
+
+        :param request: the request
+        :type request: paynlsdk.api.requestbase.RequestBase
+        :return: key in the form of controller/method
+        :rtype: str
+        """
+        return '{}/{}'.format(request.get_controller(), request.get_method())
+
+    def _get_buckets(self, key: str) -> list:
+        rate, burst = self.limits.get(key, (self.rate, self.burst))
+        buckets = [(key, rate, burst, 1.0)]
+        if self.global_rate is not None:
+            reserve = 0.0 if key in self.priority else self.priority_reserve * self.global_burst
+            buckets.append((self.GLOBAL_BUCKET, self.global_rate, self.global_burst, 1.0 + reserve))
+        return buckets
+
+    def try_acquire(self, request) -> float:
+        """
+        Try to take a token for a call
+
+        :param request: the request to call
+        :type request: paynlsdk.api.requestbase.RequestBase
+        :return: 0.0 if the call may be performed, otherwise the number of seconds to wait before trying again
+        :rtype: float
+        """
+        buckets = self._get_buckets(self.get_key(request))
+        now = time.time()
+        wait = 0.0
+        with self.store.transaction() as states:
+            tokens = []
+            for name, rate, burst, required in buckets:
+                available, updated = states.get(name, (burst, now))
+                available = min(burst, available + max(0.0, now - updated) * rate)
+                tokens.append(available)
+                if available < required:
+                    wait = max(wait, (required - available) / rate)
+            for (name, rate, burst, required), available in zip(buckets, tokens):
+                states[name] = [available if wait else available - 1.0, now]
+        return wait
+
+    def acquire(self, request, deadline: Deadline=None):
+        """
+        Take a token for a call, waiting for one to become available if needed
+
+        :param request: the request to call
+        :type request: paynlsdk.api.requestbase.RequestBase
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :raise paynlsdk.exceptions.DeadlineExceededException: no token will become available before the deadline
+        """
+        while True:
+            wait = self.try_acquire(request)
+            if not wait:
+                return
+            self.check_wait(request, wait, deadline)
+            time.sleep(wait)
+
+    def check_wait(self, request, wait: float, deadline: Deadline):
+        """
+        Verify waiting for a token does not exceed the deadline
+
+        :raise paynlsdk.exceptions.DeadlineExceededException: the wait would exceed the deadline
+        """
+        if deadline is not None and deadline.remaining() < wait:
+            raise DeadlineExceededException('Deadline of {}s exceeded while waiting for the rate limit of {}'.format(
+                deadline.timeout, self.get_key(request)))
@@ -1,7 +1,6 @@
-import json
-
 from marshmallow import Schema, fields, post_load, pre_load
 
+from paynlsdk.api.formencoder import FormEncoder, FormField
 from paynlsdk.api.requestbase import RequestBase
 from paynlsdk.api.responsebase import ResponseBase
 from paynlsdk.objects import ErrorSchema, RefundFailInfoSchema, RefundSuccessInfoSchema
@@ -81,7 +80,6 @@ class ResponseSchema(Schema):
         if 'refunded_transactions' in data:
             rs = {}
             for item in data['refunded_transactions']:
-                print(item)
                 rs[item.order_id] = item
             data['refunded_transactions'] = rs
         #  This is NASTY. Perform conversion due to fields.Dict NOT taking nesteds in 2.x (aka undo preprocessing).
@@ -94,6 +92,18 @@ class ResponseSchema(Schema):
         return Response(**data)
 
 
+REQUEST_ENCODER = FormEncoder([
+    FormField('transaction_id', 'transactionId', omit='never'),
+    FormField('amount', 'amount'),
+    FormField('description', 'description'),
+    FormField('process_date', 'processDate'),
+    # products[<product id>]=<quantity>
+    FormField('products', 'products', mapping=True),
+    FormField('vat_percentage', 'fVatPercentage'),
+    FormField('exchange_url', 'exchangeUrl'),
+])
+
+
 class Request(RequestBase):
     """
     Request object for the Refund::transaction API
@@ -148,28 +158,14 @@ class Request(RequestBase):
         # Get default api parameters
         rs = self.get_std_parameters()
         # Add own parameters
-        rs['transactionId'] = self.transaction_id
-        if ParamValidator.not_empty(self.amount):
-            rs['amount'] = self.amount
-        if ParamValidator.not_empty(self.description):
-            rs['description'] = self.description
-        if ParamValidator.not_empty(self.process_date):
-            rs['processDate'] = self.process_date
-        if ParamValidator.not_empty(self.products):
-            rs['products'] = self.products
-        if ParamValidator.not_empty(self.vat_percentage):
-            rs['fVatPercentage'] = self.vat_percentage
-        if ParamValidator.not_empty(self.exchange_url):
-            rs['exchangeUrl'] = self.exchange_url
-        return rs
+        return REQUEST_ENCODER.encode(self, rs)
 
     @RequestBase.raw_response.setter
     def raw_response(self, raw_response):
         self._raw_response = raw_response
         # Do error checking.
-        rs = json.loads(self.raw_response)
-        schema = ResponseSchema(partial=True)
-        response, errors = schema.load(rs)
+        rs = self.parse_raw_response()
+        response, errors = self.load_schema(ResponseSchema, rs)
         self.handle_schema_errors(errors)
         self._response = response
 
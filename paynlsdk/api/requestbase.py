@@ -1,17 +1,24 @@
 from urllib.parse import urlencode
 from abc import ABC, abstractmethod
 
+from paynlsdk.api.jsonbackend import JSONBackend, StdlibJSONBackend
 from paynlsdk.api.responsebase import ResponseBase
+from paynlsdk.api.schemaloader import SchemaLoader
 from paynlsdk.exceptions import SchemaException
 from paynlsdk.validators import ParamValidator
 
 
+_stdlib_json_backend = StdlibJSONBackend()
+
+
 class RequestBase(ABC):
     def __init__(self):
         self._api_token = None
         self._service_id = None
         self._raw_response = None
         self._response = None
+        self.json_backend: JSONBackend = None
+        self.lite: bool = None
 
     @property
     def api_token(self):
@@ -62,6 +69,16 @@ class RequestBase(ABC):
     def get_query_string(self):
         pass
 
+    def is_idempotent(self):
+        """
+        Whether the API method only reads data, so performing the same call more than once is safe
+        (e.g. to retry a failed call). Defaults to False; read-only API methods override this.
+
+        :return: True if the call may safely be repeated
+        :rtype: bool
+        """
+        return False
+
     def get_url(self):
         return 'v{0}/{1}/{2}/json'.format(self.get_version(), self.get_controller(), self.get_method())
 
@@ -85,6 +102,38 @@ class RequestBase(ABC):
     def get_parameters(self):
         pass
 
+    def parse_raw_response(self):
+        """
+        Parse the raw (JSON) response
+
+        Uses the JSON backend of the client that performed the request, or the standard library if not set.
+
+        :return: the parsed response
+        :rtype: dict|list
+        """
+        backend = self.json_backend if self.json_backend is not None else _stdlib_json_backend
+        return backend.loads(self.raw_response)
+
+    def load_schema(self, schema_class, data, many: bool=False):
+        """
+        Decode (part of) the response using a schema, see :meth:`paynlsdk.api.schemaloader.SchemaLoader.load`
+
+        If :attr:`lite` is set, the response is decoded into plain dicts instead
+        (see :meth:`paynlsdk.api.schemaloader.SchemaLoader.load_lite`).
+
+        :param schema_class: schema class
+        :type schema_class: type
+        :param data: decoded JSON response
+        :type data: dict|list
+        :param many: whether the data is a list of objects
+        :type many: bool
+        :return: tuple of the result and a dict of errors
+        :rtype: tuple
+        """
+        if self.lite:
+            return SchemaLoader.load_lite(schema_class, data, many=many)
+        return SchemaLoader.load(schema_class, data, many=many)
+
     def handle_schema_errors(self, error_dict):
         if error_dict:
             raise SchemaException(error_dict)
@@ -0,0 +1,183 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+
+class RetryBudget(object):
+    """
+    Budget limiting the number of retries relative to the number of calls
+
+    Every call deposits ``ratio`` tokens into the budget and every retry withdraws a full token, so on average no more
+    than ``ratio`` retries are done per call. This prevents retries from amplifying the load on the API during an
+    outage. To allow retries when there is little traffic, the budget is also refilled with
+    ``min_retries_per_second`` tokens per second.
+
+    :param float ratio: number of retries allowed per call
+    :param float min_retries_per_second: number of retries that are always allowed per second
+    :param float max_tokens: maximum number of tokens the budget can hold
+    """
+    def __init__(self, ratio: float=0.1, min_retries_per_second: float=1.0, max_tokens: float=10.0):
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, amount: float=0.0):
+        now = time.monotonic()
+        amount += (now - self._last_refill) * self.min_retries_per_second
+        self._last_refill = now
+        self._tokens = min(self.max_tokens, self._tokens + amount)
+
+    def deposit(self):
+        """
+        Register a call (not being a retry)
+        """
+        with self._lock:
+            self._refill(self.ratio)
+
+    def try_withdraw(self) -> bool:
+        """
+        Try to withdraw a token for a retry
+
+        :return: True if the retry is allowed, False if the budget is exhausted
+        :rtype: bool
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+    def refund(self):
+        """
+        Give back a withdrawn token, when the retry was not performed after all
+        """
+        with self._lock:
+            self._refill(1.0)
+
+
+class RetryPolicy(object):
+    """
+    Policy describing if and when a failed call will be retried
+
+    Only calls to idempotent API methods (see :meth:`paynlsdk.api.requestbase.RequestBase.is_idempotent`) are ever
+    retried. A call is retried when the connection failed or timed out, or when the API answered with one of the
+    ``retry_statuses``. The delay before a retry is chosen using exponential backoff with full jitter, unless the API
+    sent a ``Retry-After`` header, which will be honoured (up to ``max_retry_after`` seconds).
+
+    :param int max_attempts: maximum number of attempts per call (including the first one)
+    :param float backoff_base: backoff (in seconds) for the first retry. Doubles for every subsequent retry
+    :param float backoff_max: maximum backoff in seconds
+    :param tuple retry_statuses: HTTP status codes that will be retried
+    :param float max_retry_after: maximum number of seconds to honour from a Retry-After header.
+                                  If the API asks to wait longer, the call will not be retried
+    :param RetryBudget budget: retry budget. Defaults to a :class:`RetryBudget` using its default settings
+    """
+    def __init__(self,
+                 max_attempts: int=3,
+                 backoff_base: float=0.1,
+                 backoff_max: float=5.0,
+                 retry_statuses: tuple=(429, 500, 502, 503, 504),
+                 max_retry_after: float=30.0,
+                 budget: RetryBudget=None
+                 ):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = retry_statuses
+        self.max_retry_after = max_retry_after
+        self.budget = budget if budget is not None else RetryBudget()
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        """
+        Check if a call that resulted in the given HTTP status may be retried
+
+        :param status_code: HTTP status code
+        :type status_code: int
+        :return: True if the status code is retryable
+        :rtype: bool
+        """
+        return status_code in self.retry_statuses
+
+    def get_backoff(self, attempt: int) -> float:
+        """
+        Get the delay before the next attempt, using exponential backoff with full jitter
+
+        :param attempt: number of the attempt that just failed (starting at 1)
+        :type attempt: int
+        :return: delay in seconds
+        :rtype: float
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1))))
+
+    def get_delay(self, attempt: int, headers=None):
+        """
+        Get the delay before the next attempt, honouring a Retry-After header if available
+
+        :param attempt: number of the attempt that just failed (starting at 1)
+        :type attempt: int
+        :param headers: HTTP response headers of the failed attempt, if any
+        :type headers: dict
+        :return: delay in seconds, or None if the API asked to wait longer than ``max_retry_after``
+        :rtype: float
+        """
+        retry_after = self.parse_retry_after(headers.get('Retry-After') if headers is not None else None)
+        if retry_after is None:
+            return self.get_backoff(attempt)
+        if retry_after > self.max_retry_after:
+            return None
+        return retry_after
+
+    @staticmethod
+    def parse_retry_after(value: str):
+        """
+        Parse the value of a Retry-After header (either a number of seconds or an HTTP date)
+
+        :param value: header value
+        :type value: str
+        :return: number of seconds to wait, or None if no (valid) value is given
+        :rtype: float
+        """
+        if value is None:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return None
+        if retry_at is None:
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def allow_retry(self, request, attempt: int) -> bool:
+        """
+        Check if a failed attempt for the given request may be retried
+
+        Please note a successful check withdraws a token from the retry budget
+
+        :param request: the request that failed
+        :type request: paynlsdk.api.requestbase.RequestBase
+        :param attempt: number of the attempt that just failed (starting at 1)
+        :type attempt: int
+        :return: True if the request may be retried
+        :rtype: bool
+        """
+        if attempt >= self.max_attempts or not request.is_idempotent():
+            return False
+        return self.budget is None or self.budget.try_withdraw()
+
+    def register_call(self):
+        """
+        Register a new (non retry) call with the retry budget
+        """
+        if self.budget is not None:
+            self.budget.deposit()
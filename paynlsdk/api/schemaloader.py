@@ -0,0 +1,328 @@
+import threading
+
+from marshmallow import Schema, fields, missing
+from marshmallow.decorators import PRE_LOAD, POST_LOAD, VALIDATES, VALIDATES_SCHEMA
+
+
+class _Fallback(Exception):
+    """
+    Raised by compiled decoders for input they do not handle themselves
+    """
+    pass
+
+
+class DecoderCompiler(object):
+    """
+    Compiler turning a (marshmallow 2) schema class into straight-line Python code decoding a dict
+
+    For every field the generated code looks up the key (the field name, then its ``load_from`` name), takes a fast
+    path for the common, already correctly typed values (e.g. a str for a String field) and defers to the field's own
+    ``deserialize`` for anything else. Nested schemas are compiled as well and the schema's ``pre_load`` and
+    ``post_load`` processors are invoked as marshmallow would. Pre-processors are handed a shallow copy of their
+    input, so the input is never modified.
+
+    The generated code raises an exception for any input it does not decode the way marshmallow would, including
+    invalid input. :meth:`SchemaLoader.load` then decodes the input using the schema itself, which yields the exact
+    same result (or errors) as before.
+
+    In lite mode the ``post_load`` processors are skipped, so the decoder returns the plain dicts (keyed by attribute
+    name) that marshmallow would have handed to them, instead of response objects.
+    Schemas that can not be compiled are still decoded by marshmallow, including their ``post_load`` processors.
+
+    :param bool partial: whether the top level schema ignores missing required fields
+    :param bool lite: whether to skip the ``post_load`` processors
+    """
+    def __init__(self, partial: bool=True, lite: bool=False):
+        self.partial = partial
+        self.lite = lite
+        self._names = {}
+        self._lines = []
+        self._functions = {}
+
+    @staticmethod
+    def is_compilable(schema_class) -> bool:
+        """
+        Check if a schema can be compiled
+
+        Schemas using validators or processors receiving the whole collection are not supported.
+
+        :param schema_class: schema class
+        :type schema_class: type
+        :return: True if the schema can be compiled
+        :rtype: bool
+        """
+        processors = getattr(schema_class, '__processors__', {})
+        for (tag, pass_many), names in processors.items():
+            # The processors are kept in a defaultdict, so tags without processors may be present
+            if names and (tag in (VALIDATES, VALIDATES_SCHEMA) or (tag in (PRE_LOAD, POST_LOAD) and pass_many)):
+                return False
+        return True
+
+    def compile(self, schema_class, many: bool=False):
+        """
+        Compile the decoder for a schema
+
+        :param schema_class: schema class
+        :type schema_class: type
+        :param many: whether the decoder decodes a list of objects
+        :type many: bool
+        :return: decoder function: ``decoder(data)``, returning the decoded object(s)
+        :rtype: callable
+        """
+        name = self._compile_schema(schema_class, self.partial)
+        if many:
+            self._lines.append('def decode_many(data):')
+            self._lines.append('    if type(data) is not list:')
+            self._lines.append('        raise _Fallback')
+            self._lines.append('    return [{}(item) for item in data]'.format(name))
+            name = 'decode_many'
+        namespace = dict(self._names, _Fallback=_Fallback, missing=missing, PRE_LOAD=PRE_LOAD, POST_LOAD=POST_LOAD)
+        exec(compile('\n'.join(self._lines), '<decoder {}>'.format(schema_class.__name__), 'exec'), namespace)
+        return namespace[name]
+
+    def _add_name(self, prefix: str, value) -> str:
+        name = '{}{}'.format(prefix, len(self._names))
+        self._names[name] = value
+        return name
+
+    def _compile_schema(self, schema_class, partial: bool) -> str:
+        """
+        Generate the code of the function decoding a single object
+
+        :return: name of the function
+        :rtype: str
+        """
+        key = (schema_class, partial)
+        if key in self._functions:
+            return self._functions[key]
+        name = 'decode_{}_{}'.format(schema_class.__name__, len(self._functions))
+        self._functions[key] = name
+        schema = schema_class()
+        if not self.is_compilable(schema_class) or any('.' in (field.attribute or attr_name)
+                                                       for attr_name, field in schema.fields.items()):
+            # Leave it to marshmallow, through the schema's load()
+            loader = self._add_name('schema', schema_class(partial=partial))
+            self._lines.extend([
+                'def {}(data):'.format(name),
+                '    result, errors = {}.load(data)'.format(loader),
+                '    if errors:',
+                '        raise _Fallback',
+                '    return result',
+            ])
+            return name
+        processors = getattr(schema_class, '__processors__', {})
+        schema_name = self._add_name('schema', schema)
+        body = ['    if type(data) is not dict:', '        raise _Fallback', '    original = data']
+        if processors.get((PRE_LOAD, False)):
+            body.append('    data = {}._invoke_load_processors(PRE_LOAD, dict(data), False, original_data=data)'
+                        .format(schema_name))
+        body.append('    result = {}')
+        for attr_name, field in schema.fields.items():
+            if field.dump_only:
+                continue
+            body.extend(self._compile_field(attr_name, field, partial))
+        if processors.get((POST_LOAD, False)) and not self.lite:
+            body.append('    return {}._invoke_load_processors(POST_LOAD, result, False, original_data=original)'
+                        .format(schema_name))
+        else:
+            body.append('    return result')
+        self._lines.append('def {}(data):'.format(name))
+        self._lines.extend(body)
+        return name
+
+    def _compile_field(self, attr_name: str, field, partial: bool) -> list:
+        field_name = self._add_name('field', field)
+        lines = ['    value = data.get({!r}, missing)'.format(attr_name)]
+        if field.load_from:
+            lines.append('    if value is missing:')
+            lines.append('        value = data.get({!r}, missing)'.format(field.load_from))
+        if not partial:
+            if field.missing is not missing:
+                lines.append('    if value is missing:')
+                if callable(field.missing):
+                    lines.append('        value = {}.missing()'.format(field_name))
+                else:
+                    lines.append('        value = {}.missing'.format(field_name))
+            if field.required:
+                lines.append('    if value is missing:')
+                lines.append('        raise _Fallback')
+        key = field.attribute or attr_name
+        arguments = '(value, {!r}, data)'.format(field.load_from or attr_name)
+        lines.append('    if value is not missing:')
+        if field.validators:
+            lines.append('        result[{!r}] = {}.deserialize{}'.format(key, field_name, arguments))
+            return lines
+        # Without validators, deserializing a value other than None comes down to the field's _deserialize()
+        fast_path = self._compile_fast_path(field)
+        if fast_path is not None:
+            condition, expression = fast_path
+            lines.append('        if {}:'.format(condition))
+            lines.append('            result[{!r}] = {}'.format(key, expression))
+            lines.append('        elif value is not None:')
+        else:
+            lines.append('        if value is not None:')
+        lines.append('            result[{!r}] = {}._deserialize{}'.format(key, field_name, arguments))
+        lines.append('        else:')
+        lines.append('            result[{!r}] = {}.deserialize{}'.format(key, field_name, arguments))
+        return lines
+
+    def _compile_fast_path(self, field):
+        """
+        Get the condition under which a value can be decoded without calling the field, and the expression doing so
+
+        :return: tuple of the condition and the expression, or None if there is no fast path
+        :rtype: tuple
+        """
+        if isinstance(field, fields.Boolean):
+            return 'value is True or value is False', 'value'
+        if isinstance(field, fields.Integer):
+            return 'type(value) is int or type(value) is str', 'int(value)'
+        if isinstance(field, fields.Float):
+            return 'type(value) is float or type(value) is int or type(value) is str', 'float(value)'
+        if isinstance(field, fields.String):
+            return 'type(value) is str', 'value'
+        if isinstance(field, fields.Nested):
+            nested = self._compile_nested(field)
+            if nested is None:
+                return None
+            if field.many:
+                return 'type(value) is list', '[{}(item) for item in value]'.format(nested)
+            return 'type(value) is dict', '{}(value)'.format(nested)
+        if isinstance(field, fields.List) and isinstance(field.container, fields.Nested):
+            nested = self._compile_nested(field.container)
+            if nested is None or field.container.many or field.container.validators:
+                return None
+            return 'type(value) is list', '[{}(item) for item in value]'.format(nested)
+        return None
+
+    def _compile_nested(self, field):
+        if field.only or field.exclude:
+            return None
+        schema = field.schema
+        if not isinstance(schema, Schema) or schema.partial or schema.only or schema.exclude:
+            return None
+        return self._compile_schema(type(schema), False)
+
+
+class SchemaLoader(object):
+    """
+    Loader decoding API responses using schema instances created once per schema class and thread
+
+    Creating a schema instance builds (and copies) all of its fields, which is costly for schemas with many (nested)
+    fields. Instances are therefore kept per thread, which makes reusing them thread safe.
+
+    When ``compiled`` is enabled, responses are decoded by code generated from the schemas
+    (see :class:`DecoderCompiler`) instead, which skips most of marshmallow's per field machinery. The result is
+    identical; invalid responses are still decoded by marshmallow, so errors are reported the same way. Enable this
+    using ``SchemaLoader.compiled = True``
+
+    :meth:`load_lite` always uses compiled decoders, skipping the ``post_load`` processors creating the response objects.
+
+    :cvar bool compiled: whether to use compiled decoders
+    """
+    compiled = False
+    _local = threading.local()
+
+    @classmethod
+    def _get_cache(cls) -> dict:
+        try:
+            return cls._local.cache
+        except AttributeError:
+            cls._local.cache = {}
+            return cls._local.cache
+
+    @classmethod
+    def get_schema(cls, schema_class, many: bool=False, partial: bool=True) -> Schema:
+        """
+        Get the schema instance of the current thread
+
+        :param schema_class: schema class
+        :type schema_class: type
+        :param many: whether the schema loads a list of objects
+        :type many: bool
+        :param partial: whether to ignore missing required fields
+        :type partial: bool
+        :return: the schema instance
+        :rtype: marshmallow.Schema
+        """
+        cache = cls._get_cache()
+        key = ('schema', schema_class, many, partial)
+        schema = cache.get(key)
+        if schema is None:
+            schema = cache[key] = schema_class(partial=partial, many=many)
+        return schema
+
+    @classmethod
+    def get_decoder(cls, schema_class, many: bool=False, partial: bool=True, lite: bool=False):
+        """
+        Get the compiled decoder of the current thread
+
+        :param schema_class: schema class
+        :type schema_class: type
+        :param many: whether the decoder decodes a list of objects
+        :type many: bool
+        :param partial: whether to ignore missing required fields
+        :type partial: bool
+        :param lite: whether the decoder skips the ``post_load`` processors (see :class:`DecoderCompiler`)
+        :type lite: bool
+        :return: decoder function: ``decoder(data)``, returning the decoded object(s)
+        :rtype: callable
+        """
+        cache = cls._get_cache()
+        key = ('decoder', schema_class, many, partial, lite)
+        decoder = cache.get(key)
+        if decoder is None:
+            decoder = cache[key] = DecoderCompiler(partial, lite).compile(schema_class, many)
+        return decoder
+
+    @classmethod
+    def load(cls, schema_class, data, many: bool=False, partial: bool=True):
+        """
+        Decode data using a schema
+
+        :param schema_class: schema class
+        :type schema_class: type
+        :param data: decoded JSON data
+        :type data: dict|list
+        :param many: whether the data is a list of objects
+        :type many: bool
+        :param partial: whether to ignore missing required fields
+        :type partial: bool
+        :return: tuple of the result and a dict of errors (see :meth:`marshmallow.Schema.load`)
+        :rtype: tuple
+        """
+        if cls.compiled:
+            try:
+                return cls.get_decoder(schema_class, many, partial)(data), {}
+            except Exception:
+                # Let marshmallow decode (or report on) anything the decoder doesn't handle
+                pass
+        return cls.get_schema(schema_class, many, partial).load(data)
+
+    @classmethod
+    def load_lite(cls, schema_class, data, many: bool=False, partial: bool=True):
+        """
+        Decode data into plain dicts using a schema
+
+        The fields are mapped (``load_from``) and converted and the ``pre_load`` processors are applied, but no
+        ``post_load`` processors, so no response objects are created.
+
+        :param schema_class: schema class
+        :type schema_class: type
+        :param data: decoded JSON data
+        :type data: dict|list
+        :param many: whether the data is a list of objects
+        :type many: bool
+        :param partial: whether to ignore missing required fields
+        :type partial: bool
+        :return: tuple of the result and a dict of errors (see :meth:`marshmallow.Schema.load`)
+        :rtype: tuple
+        """
+        try:
+            return cls.get_decoder(schema_class, many, partial, lite=True)(data), {}
+        except Exception:
+            # Let marshmallow report on anything the decoder doesn't handle
+            result, errors = cls.get_schema(schema_class, many, partial).load(data)
+            if not errors:
+                raise
+            return None, errors
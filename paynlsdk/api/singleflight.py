@@ -0,0 +1,123 @@
+import asyncio
+import json
+import threading
+
+from paynlsdk.exceptions import DeadlineExceededException
+
+
+def get_flight_key(method: str, url: str, parameters: dict) -> str:
+    """
+    Get the key identifying identical calls
+
+    :param method: HTTP method
+    :type method: str
+    :param url: url to call
+    :type url: str
+    :param parameters: request parameters
+    :type parameters: dict
+    :return: key
+    :rtype: str
+    """
+    return '{} {} {}'.format(method.upper(), url, json.dumps(parameters, sort_keys=True, default=str))
+
+
+class _Flight(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+
+
+class SingleFlight(object):
+    """
+    Coalesces identical calls that are in flight at the same time (thread based)
+
+    The first caller for a key (the leader) performs the call. Every caller asking for the same key while the call is
+    in flight waits for, and shares, the leader's result (or exception).
+    """
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn, timeout: float=None):
+        """
+        Perform ``fn`` unless an identical call is already in flight
+
+        :param key: key identifying the call
+        :type key: str
+        :param fn: callable performing the call
+        :type fn: callable
+        :param timeout: maximum number of seconds to wait for a call in flight. None to wait indefinitely
+        :type timeout: float
+        :return: tuple of the result and whether the result was shared with another caller
+        :rtype: tuple
+        :raise paynlsdk.exceptions.DeadlineExceededException: the call in flight did not finish within the timeout
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+        if not leader:
+            if not flight.done.wait(timeout):
+                raise DeadlineExceededException('Deadline exceeded while waiting for identical call in flight')
+            if flight.exception is not None:
+                raise flight.exception
+            return flight.result, True
+        try:
+            flight.result = fn()
+            return flight.result, False
+        except BaseException as e:
+            flight.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+
+class AsyncSingleFlight(object):
+    """
+    Coalesces identical calls that are in flight at the same time (asyncio based)
+
+    This is the asyncio equivalent of :class:`SingleFlight`. Please note a single instance should only be used from
+    one event loop at a time.
+    """
+    def __init__(self):
+        self._flights = {}
+
+    async def do(self, key: str, fn, timeout: float=None):
+        """
+        Await ``fn()`` unless an identical call is already in flight
+
+        :param key: key identifying the call
+        :type key: str
+        :param fn: callable returning the awaitable performing the call
+        :type fn: callable
+        :param timeout: maximum number of seconds to wait for a call in flight. None to wait indefinitely
+        :type timeout: float
+        :return: tuple of the result and whether the result was shared with another caller
+        :rtype: tuple
+        :raise paynlsdk.exceptions.DeadlineExceededException: the call in flight did not finish within the timeout
+        """
+        future = self._flights.get(key)
+        if future is not None:
+            try:
+                # Shielded: a waiter giving up must not cancel the call for everyone else
+                return await asyncio.wait_for(asyncio.shield(future), timeout), True
+            except asyncio.TimeoutError:
+                raise DeadlineExceededException('Deadline exceeded while waiting for identical call in flight')
+        future = asyncio.get_running_loop().create_future()
+        self._flights[key] = future
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result, False
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved, in case nobody else was waiting for it
+            future.exception()
+            raise
+        finally:
+            del self._flights[key]
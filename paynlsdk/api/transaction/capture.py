@@ -1,7 +1,6 @@
-import json
-
 from marshmallow import Schema, fields, post_load
 
+from paynlsdk.api.formencoder import FormEncoder, FormField
 from paynlsdk.api.requestbase import RequestBase
 from paynlsdk.api.responsebase import ResponseBase
 from paynlsdk.objects import ErrorSchema
@@ -32,6 +31,14 @@ class ResponseSchema(Schema):
         return Response(**data)
 
 
+REQUEST_ENCODER = FormEncoder([
+    FormField('transaction_id', 'transactionId', omit='never'),
+    # products[<product id>]=<quantity>
+    FormField('products', 'products', mapping=True),
+    FormField('tracktrace', 'tracktrace'),
+])
+
+
 class Request(RequestBase):
     """
     Request object for the Transaction::capture API
@@ -70,20 +77,14 @@ class Request(RequestBase):
         # Get default api parameters
         rs = self.get_std_parameters()
         # Add own parameters
-        rs['transactionId'] = self.transaction_id
-        if self.products.__len__() > 0:
-            rs['products'] = self.products
-        if ParamValidator.not_empty(self.tracktrace):
-            rs['tracktrace'] = self.tracktrace
-        return rs
+        return REQUEST_ENCODER.encode(self, rs)
 
     @RequestBase.raw_response.setter
     def raw_response(self, raw_response):
         self._raw_response = raw_response
         # Do error checking.
-        rs = json.loads(self.raw_response)
-        schema = ResponseSchema(partial=True)
-        response, errors = schema.load(rs)
+        rs = self.parse_raw_response()
+        response, errors = self.load_schema(ResponseSchema, rs)
         self.handle_schema_errors(errors)
         self._response = response
 
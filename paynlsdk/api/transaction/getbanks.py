@@ -1,5 +1,3 @@
-import json
-
 from paynlsdk.api.requestbase import RequestBase
 from paynlsdk.api.responsebase import ResponseBase
 from paynlsdk.objects import Error, BankDetails, BankDetailsSchema
@@ -51,6 +49,9 @@ class Request(RequestBase):
     def get_query_string(self):
         return ''
 
+    def is_idempotent(self):
+        return True
+
     def get_parameters(self):
         # Get default api parameters
         rs = self.get_std_parameters()
@@ -61,12 +62,14 @@ class Request(RequestBase):
     def raw_response(self, raw_response):
         self._raw_response = raw_response
         # Do error checking.
-        rs = json.loads(self.raw_response)
+        rs = self.parse_raw_response()
         # The raw result IS a list, so we need the "many=True" argument
-        schema = BankDetailsSchema(partial=True, many=True)
         # Bit of an oddball here. Result is a pure array of banks, so we'll mimic a decent response
-        banks, errors = schema.load(rs)
+        banks, errors = self.load_schema(BankDetailsSchema, rs, many=True)
         self.handle_schema_errors(errors)
+        if self.lite:
+            self._response = {"banks": banks}
+            return
         kwargs = {"result": Error(result=True), "banks": banks}
         self._response = Response(**kwargs)
 
@@ -1,4 +1,3 @@
-import json
 from typing import Dict
 
 from marshmallow import Schema, fields, post_load, pre_load
@@ -97,6 +96,9 @@ class Request(RequestBase):
     def get_query_string(self):
         return ''
 
+    def is_idempotent(self):
+        return True
+
     def get_parameters(self):
         # Get default api parameters
         rs = self.get_std_parameters()
@@ -109,9 +111,8 @@ class Request(RequestBase):
     def raw_response(self, raw_response):
         self._raw_response = raw_response
         # Do error checking.
-        rs = json.loads(self.raw_response)
-        schema = ResponseSchema(partial=True)
-        response, errors = schema.load(rs)
+        rs = self.parse_raw_response()
+        response, errors = self.load_schema(ResponseSchema, rs)
         self.handle_schema_errors(errors)
         self._response = response
 
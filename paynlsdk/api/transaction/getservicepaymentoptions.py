@@ -1,5 +1,3 @@
-import json
-
 from marshmallow import Schema, fields, pre_load, post_load
 
 from paynlsdk.api.requestbase import RequestBase
@@ -18,6 +16,7 @@ class Response(ResponseBase):
     :param Merchant merchant: Merchant details
     :param Service merchant: Service details
     :param dict settings: any relevant settings (key/value)
+    :param payment_options Dict[int, PaymentOption]: payment options
     :param country_options Dict[str, CountryOption]: country options
     :param payment_profiles Dict[str, ServicePaymentProfile]: payment profile info
     """
@@ -25,14 +24,14 @@ class Response(ResponseBase):
                  merchant: Merchant=None,
                  service: Service=None,
                  settings: dict=None,
-                 # payment_options: dict=None,
+                 payment_options: Dict[int, PaymentOption]=None,
                  country_options: Dict[str, CountryOption]=None,
                  payment_profiles: Dict[int, ServicePaymentProfile]=None,
                  *args, **kwargs):
         self.merchant = merchant
         self.service = service
         self.settings = settings
-        # self.payment_options = payment_options
+        self.payment_options: Dict[int, PaymentOption] = payment_options
         self.country_options: Dict[str, CountryOption] = country_options
         self.payment_profiles: Dict[int, ServicePaymentProfile] = payment_profiles
         super().__init__(**kwargs)
@@ -134,6 +133,9 @@ class Request(RequestBase):
     def get_query_string(self):
         return ''
 
+    def is_idempotent(self):
+        return True
+
     def get_parameters(self):
         # Get default api parameters
         rs = self.get_std_parameters()
@@ -146,9 +148,8 @@ class Request(RequestBase):
     def raw_response(self, raw_response):
         self._raw_response = raw_response
         # Do error checking.
-        rs = json.loads(self.raw_response)
-        schema = ResponseSchema(partial=True)
-        response, errors = schema.load(rs)
+        rs = self.parse_raw_response()
+        response, errors = self.load_schema(ResponseSchema, rs)
         self.handle_schema_errors(errors)
         self._response = response
 
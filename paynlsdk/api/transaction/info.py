@@ -1,14 +1,13 @@
-import json
-
-from marshmallow import Schema, fields, post_load, pre_load
+from marshmallow import Schema, fields, missing, post_load, pre_load
 
 from paynlsdk.api.requestbase import RequestBase
 from paynlsdk.api.responsebase import ResponseBase
+from paynlsdk.api.schemaloader import SchemaLoader
 from paynlsdk.objects import ErrorSchema, Connection, ConnectionSchema, EndUser, EndUserSchema,\
     PaymentDetails, PaymentDetailsSchema, StornoDetails, StornoDetailsSchema,\
     SalesData, SalesDataSchema, StatsDetails, StatsDetailsSchema
 from paynlsdk.validators import ParamValidator
-from paynlsdk.exceptions import TransactionStatusException, TransactionNotAuthorizedException
+from paynlsdk.exceptions import SchemaException, TransactionStatusException, TransactionNotAuthorizedException
 
 
 class Response(ResponseBase):
@@ -48,7 +47,7 @@ class Response(ResponseBase):
         """
         from paynlsdk.api.transaction.status import Request
         from paynlsdk.api.client import APIClient
-        client = APIClient()
+        client = APIClient.get_default()
         request = Request(self.transaction_id)
         client.perform_request(request)
         return request.response
@@ -269,7 +268,7 @@ class Response(ResponseBase):
             raise TransactionStatusException('Cannot decline transaction because it does not have the status VERIFY')
         from paynlsdk.api.transaction.approve import Request
         from paynlsdk.api.client import APIClient
-        client = APIClient()
+        client = APIClient.get_default()
         request = Request(self.transaction_id)
         client.perform_request(request)
         return request.response.result
@@ -286,7 +285,7 @@ class Response(ResponseBase):
             raise TransactionStatusException('Cannot decline transaction because it does not have the status VERIFY')
         from paynlsdk.api.transaction.decline import Request
         from paynlsdk.api.client import APIClient
-        client = APIClient()
+        client = APIClient.get_default()
         request = Request(self.transaction_id)
         client.perform_request(request)
         return request.response.result
@@ -304,7 +303,7 @@ class Response(ResponseBase):
         # We will NOT use the "utility" methds here but the full API implementation
         from paynlsdk.api.transaction.voidauthorization import Request
         from paynlsdk.api.client import APIClient
-        client = APIClient()
+        client = APIClient.get_default()
         request = Request(self.transaction_id)
         client.perform_request(request)
         return request.response.result
@@ -322,7 +321,7 @@ class Response(ResponseBase):
         # We will NOT use the "utility" methds here but the full API implementation
         from paynlsdk.api.transaction.capture import Request
         from paynlsdk.api.client import APIClient
-        client = APIClient()
+        client = APIClient.get_default()
         request = Request(self.transaction_id)
         client.perform_request(request)
         return request.response.result
@@ -350,16 +349,57 @@ class ResponseSchema(Schema):
         return Response(**data)
 
 
+class LazyResponse(Response):
+    """
+    Response object for the Transaction::info API, decoding its details on first access
+
+    Only the request result is decoded up front; the connection, enduser, sale data, payment, storno and stats details
+    are decoded (using the :class:`ResponseSchema` fields) the first time they are accessed. Please note details that
+    do not match their schema raise a :class:`paynlsdk.exceptions.SchemaException` when they are accessed, instead of
+    when the response is parsed.
+
+    :param dict data: parsed JSON response
+    :param str transaction_id: transaction ID
+    """
+    def __init__(self, data: dict, transaction_id: str=None):
+        ResponseBase.__init__(self)
+        self._data = data
+        self.transaction_id = transaction_id
+        self.request = self._decode('request')
+
+    def __getattr__(self, name):
+        # Only called for attributes that have not been set (i.e. decoded) yet
+        if name not in ResponseSchema._declared_fields or '_data' not in self.__dict__:
+            raise AttributeError(name)
+        value = self._decode(name)
+        setattr(self, name, value)
+        return value
+
+    def _decode(self, name: str):
+        field = ResponseSchema._declared_fields[name]
+        value = self._data.get(name, missing)
+        if value is missing and field.load_from:
+            value = self._data.get(field.load_from, missing)
+        if value is missing:
+            return None
+        result, errors = SchemaLoader.load(field.nested, value, partial=False)
+        if errors:
+            raise SchemaException({field.load_from or name: errors})
+        return result
+
+
 class Request(RequestBase):
     """
     Request object for the Transaction::info API
 
     :param str transaction_id: transaction ID
     :param str entrance_code: entrance code
+    :param bool lazy: whether to decode the details of the response on first access (see :class:`LazyResponse`)
     """
-    def __init__(self, transaction_id: str=None, entrance_code: str=None):
+    def __init__(self, transaction_id: str=None, entrance_code: str=None, lazy: bool=False):
         self.transaction_id = transaction_id
         self.entrance_code = entrance_code
+        self.lazy = lazy
         super().__init__()
 
     def requires_api_token(self):
@@ -380,6 +420,9 @@ class Request(RequestBase):
     def get_query_string(self):
         return ''
 
+    def is_idempotent(self):
+        return True
+
     def get_parameters(self):
         # Validation
         ParamValidator.assert_not_empty(self.transaction_id, 'transaction_id')
@@ -394,13 +437,18 @@ class Request(RequestBase):
     @RequestBase.raw_response.setter
     def raw_response(self, raw_response):
         self._raw_response = raw_response
-        rs = json.loads(self.raw_response)
-        schema = ResponseSchema(partial=True)
-        response, errors = schema.load(rs)
-        self.handle_schema_errors(errors)
-        self._response = response
+        rs = self.parse_raw_response()
+        if self.lazy and not self.lite and isinstance(rs, dict):
+            self._response = LazyResponse(rs)
+        else:
+            response, errors = self.load_schema(ResponseSchema, rs)
+            self.handle_schema_errors(errors)
+            self._response = response
         #  Map transaction ID on response
-        self._response.transaction_id = self.transaction_id
+        if self.lite:
+            self._response['transaction_id'] = self.transaction_id
+        else:
+            self._response.transaction_id = self.transaction_id
 
     @property
     def response(self) -> Response:
@@ -1,5 +1,3 @@
-import json
-
 from marshmallow import Schema, fields, post_load, pre_load
 
 from paynlsdk.api.requestbase import RequestBase
@@ -80,7 +78,6 @@ class ResponseSchema(Schema):
         if 'refunded_transactions' in data:
             rs = {}
             for item in data['refunded_transactions']:
-                print(item)
                 rs[item.order_id] = item
             data['refunded_transactions'] = rs
         #  This is NASTY. Perform conversion due to fields.Dict NOT taking nesteds in 2.x (aka undo preprocessing).
@@ -151,9 +148,8 @@ class Request(RequestBase):
     def raw_response(self, raw_response):
         self._raw_response = raw_response
         # Do error checking.
-        rs = json.loads(self.raw_response)
-        schema = ResponseSchema(partial=True)
-        response, errors = schema.load(rs)
+        rs = self.parse_raw_response()
+        response, errors = self.load_schema(ResponseSchema, rs)
         self.handle_schema_errors(errors)
         self._response = response
 
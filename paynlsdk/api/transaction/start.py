@@ -1,12 +1,15 @@
-import json
+from datetime import datetime
+from types import MappingProxyType
+from typing import List
 
 from marshmallow import Schema, fields, pre_load, post_load
 
 from paynlsdk.api.client import PAYNL_CLIENT_VERSION
+from paynlsdk.api.formencoder import FormEncoder, FormField
 from paynlsdk.api.requestbase import RequestBase
 from paynlsdk.api.responsebase import ResponseBase
 from paynlsdk.objects import TransactionData, TransactionStartStatsData, SalesData, TransactionEndUser, ErrorSchema,\
-    TransactionStartEnduser, TransactionStartEnduserSchema, TransactionStartInfo, TransactionStartInfoSchema
+    OrderData, TransactionStartEnduser, TransactionStartEnduserSchema, TransactionStartInfo, TransactionStartInfoSchema
 from paynlsdk.validators import ParamValidator
 
 
@@ -54,6 +57,129 @@ class ResponseSchema(Schema):
         return Response(**data)
 
 
+def format_date(value: datetime) -> str:
+    return value.strftime('%d-%m-%Y')
+
+
+def format_datetime(value: datetime) -> str:
+    return value.strftime('%d-%m-%Y %H:%M:%s')
+
+
+def format_flag(value) -> int:
+    return 1 if value else 0
+
+
+TRANSACTION_DATA_ENCODER = FormEncoder([
+    FormField('currency', 'currency'),
+    FormField('costs_vat', 'costsVat'),
+    FormField('order_exchange_url', 'orderExchangeUrl'),
+    FormField('description', 'description'),
+    FormField('expire_date', 'expireDate', format=format_datetime),
+    FormField('order_number', 'orderNumber'),
+])
+
+STATS_DATA_ENCODER = FormEncoder([
+    FormField('promotor_id', 'promotorId'),
+    FormField('info', 'info'),
+    FormField('tool', 'tool'),
+    FormField('extra1', 'extra1'),
+    FormField('extra2', 'extra2'),
+    FormField('extra3', 'extra3'),
+    FormField('domain_id', 'domainId'),
+    FormField('object', 'object', default='pythonsdk v' + PAYNL_CLIENT_VERSION),
+])
+
+ORDER_DATA_ENCODER = FormEncoder([
+    FormField('product_id', 'productId', required=True, param_name='sales_data.order_data.product_id'),
+    FormField('price', 'price', required=True, param_name='sales_data.order_data.price'),
+    FormField('quantity', 'quantity', required=True, param_name='sales_data.order_data.quantity'),
+    FormField('description', 'description'),
+    FormField('vat_code', 'vatCode'),
+    FormField('vat_percentage', 'vatPercentage'),
+    FormField('product_type', 'productType'),
+])
+
+SALES_DATA_ENCODER = FormEncoder([
+    FormField('delivery_date', 'deliveryDate', omit='null', format=format_date),
+    FormField('invoice_date', 'invoiceDate', omit='null', format=format_date),
+    FormField('order_data', 'orderData', encoder=ORDER_DATA_ENCODER, many=True),
+])
+
+ADDRESS_ENCODER = FormEncoder([
+    FormField('street_name', 'streetName'),
+    FormField('street_number', 'streetNumber'),
+    FormField('street_number_extension', 'streetNumberExtension'),
+    FormField('zip_code', 'zipCode'),
+    FormField('city', 'city'),
+    FormField('region_code', 'regionCode'),
+    FormField('country_code', 'countryCode'),
+])
+
+INVOICE_ADDRESS_ENCODER = FormEncoder([
+    FormField('initials', 'initials'),
+    FormField('last_name', 'lastName'),
+    FormField('gender', 'gender'),
+] + list(ADDRESS_ENCODER.fields))
+
+COMPANY_ENCODER = FormEncoder([
+    FormField('name', 'name'),
+    FormField('coc_number', 'cocNumber'),
+    FormField('vat_number', 'vatNumber'),
+    FormField('country_code', 'countryCode'),
+])
+
+END_USER_ENCODER = FormEncoder([
+    FormField('access_code', 'accessCode'),
+    FormField('language', 'language'),
+    FormField('initials', 'initials'),
+    FormField('last_name', 'lastName'),
+    FormField('gender', 'gender'),
+    FormField('dob', 'dob', format=format_date),
+    FormField('phone_number', 'phoneNumber'),
+    FormField('email_address', 'emailAddress'),
+    FormField('bank_account', 'bankAccount'),
+    FormField('iban', 'iban'),
+    FormField('bic', 'bic'),
+    FormField('send_confirm_email', 'sendConfirmMail', omit='never', format=format_flag),
+    FormField('customer_reference', 'customerReference'),
+    FormField('customer_trust', 'customerTrust'),
+    FormField('address', 'address', omit='null', encoder=ADDRESS_ENCODER),
+    FormField('invoice_address', 'invoiceAddress', omit='null', encoder=INVOICE_ADDRESS_ENCODER),
+    FormField('company', 'company', omit='null', encoder=COMPANY_ENCODER),
+])
+
+REQUEST_ENCODER = FormEncoder([
+    FormField('amount', 'amount', required=True),
+    FormField('ip_address', 'ipAddress', required=True),
+    FormField('finish_url', 'finishUrl', required=True),
+    FormField('payment_option_id', 'paymentOptionId'),
+    FormField('payment_option_sub_id', 'paymentOptionSubId'),
+    FormField('test_mode', 'testMode', omit='never', format=format_flag),
+    FormField('transfer_type', 'transferType'),
+    FormField('transfer_value', 'transferValue'),
+    FormField('transaction', 'transaction', omit='null', encoder=TRANSACTION_DATA_ENCODER),
+    # Always send the stats data, so the object (the SDK version by default) is sent
+    FormField('stats_data', 'statsData', omit='null', encoder=STATS_DATA_ENCODER, default=TransactionStartStatsData()),
+    FormField('sale_data', 'saleData', omit='null', encoder=SALES_DATA_ENCODER),
+    FormField('end_user', 'enduser', omit='null', encoder=END_USER_ENCODER),
+])
+
+
+def _select_fields(encoder: FormEncoder, *attributes) -> list:
+    fields_by_attribute = {field.attribute: field for field in encoder.fields}
+    return [fields_by_attribute[attribute] for attribute in attributes]
+
+
+#  Parameters shared by all requests created from a StartTemplate
+TEMPLATE_ENCODER = FormEncoder(_select_fields(
+    REQUEST_ENCODER, 'finish_url', 'payment_option_id', 'payment_option_sub_id', 'test_mode', 'transfer_type',
+    'transfer_value', 'transaction', 'stats_data', 'end_user'))
+
+#  Per transaction parameters of requests created from a StartTemplate
+TEMPLATE_DELTA_ENCODER = FormEncoder(_select_fields(
+    REQUEST_ENCODER, 'amount', 'ip_address', 'transaction', 'sale_data', 'end_user'))
+
+
 class Request(RequestBase):
     """
     Request object for the Transaction::start API
@@ -98,6 +224,7 @@ class Request(RequestBase):
         self.test_mode = test_mode
         self.transfer_type = transfer_type
         self.transfer_value = transfer_value
+        self.template: StartTemplate = None
         super().__init__()
 
     def requires_api_token(self):
@@ -119,188 +246,28 @@ class Request(RequestBase):
         return ''
 
     def get_parameters(self):
+        if self.template is not None:
+            # The shared parameters are validated and encoded by the template already
+            rs = self.get_std_parameters()
+            rs.update(self.template.parameters)
+            return TEMPLATE_DELTA_ENCODER.encode(self, rs)
         # Validation
-        ParamValidator.assert_not_empty(self.amount, 'amount')
-        ParamValidator.assert_not_empty(self.ip_address, 'ip_address')
-        ParamValidator.assert_not_empty(self.finish_url, 'finish_url')
+        self.validate_transfer()
+        # Default api parameters
+        rs = self.get_std_parameters()
+        #  Append our own parameters, including the complex types
+        return REQUEST_ENCODER.encode(self, rs)
+
+    def validate_transfer(self):
         if ParamValidator.not_empty(self.transfer_value) and (self.transfer_type == 'transaction'
                                                               or self.transfer_type == 'merchant'):
             raise ValueError('TransferValue cannot be set without valid TransferType, please fix this.')
-        # Default api parameters
-        rs = self.get_std_parameters()
-        #  Append our own parameters
-        rs['amount'] = self.amount
-        rs['ipAddress'] = self.ip_address
-        rs['finishUrl'] = self.finish_url
-        if ParamValidator.not_empty(self.payment_option_id):
-            rs['paymentOptionId'] = self.payment_option_id
-        if ParamValidator.not_empty(self.payment_option_sub_id):
-            rs['paymentOptionSubId'] = self.payment_option_sub_id
-        if self.test_mode:
-            rs['testMode'] = 1
-        else:
-            rs['testMode'] = 0
-        if ParamValidator.not_empty(self.transfer_type):
-            rs['transferType'] = self.transfer_type
-        if ParamValidator.not_empty(self.transfer_value):
-            rs['transferValue'] = self.transfer_value
-        # Now handle complex types
-        self._merge_transaction_dict(rs)
-        self._merge_stats_data_dict(rs)
-        self._merge_sales_data_dict(rs)
-        self._merge_end_user_dict(rs)
-        return rs
-
-    def _merge_transaction_dict(self, innerdict):
-        if ParamValidator.is_null(self.transaction):
-            return
-        if ParamValidator.not_empty(self.transaction.currency):
-            innerdict['transaction[currency]'] = self.transaction.currency
-        if ParamValidator.not_empty(self.transaction.costs_vat):
-            innerdict['transaction[costsVat]'] = self.transaction.costs_vat
-        if ParamValidator.not_empty(self.transaction.order_exchange_url):
-            innerdict['transaction[orderExchangeUrl]'] = self.transaction.order_exchange_url
-        if ParamValidator.not_empty(self.transaction.description):
-            innerdict['transaction[description]'] = self.transaction.description
-        if ParamValidator.not_empty(self.transaction.expire_date):
-            innerdict['transaction[expireDate]'] = self.transaction.expire_date.strftime('%d-%m-%Y %H:%M:%s')
-        if ParamValidator.not_empty(self.transaction.order_number):
-            innerdict['transaction[orderNumber]'] = self.transaction.order_number
-
-    def _merge_stats_data_dict(self, innerdict):
-        if ParamValidator.is_null(self.stats_data):
-            innerdict['statsData[object]'] = 'pythonsdk v' + PAYNL_CLIENT_VERSION
-            return
-        if ParamValidator.is_empty(self.stats_data.object):
-            innerdict['statsData[object]'] = 'pythonsdk v' + PAYNL_CLIENT_VERSION
-
-        if ParamValidator.not_empty(self.stats_data.promotor_id):
-            innerdict['statsData[promotorId]'] = self.stats_data.promotor_id
-        if ParamValidator.not_empty(self.stats_data.info):
-            innerdict['statsData[info]'] = self.stats_data.info
-        if ParamValidator.not_empty(self.stats_data.tool):
-            innerdict['statsData[tool]'] = self.stats_data.tool
-        if ParamValidator.not_empty(self.stats_data.extra1):
-            innerdict['statsData[extra1]'] = self.stats_data.extra1
-        if ParamValidator.not_empty(self.stats_data.extra2):
-            innerdict['statsData[extra2]'] = self.stats_data.extra2
-        if ParamValidator.not_empty(self.stats_data.extra3):
-            innerdict['statsData[extra3]'] = self.stats_data.extra3
-        if ParamValidator.not_empty(self.stats_data.domain_id):
-            innerdict['statsData[domainId]'] = self.stats_data.domain_id
-        if ParamValidator.not_empty(self.stats_data.object):
-            innerdict['statsData[object]'] = self.stats_data.object
-
-    def _merge_sales_data_dict(self, innerdict):
-        if ParamValidator.is_null(self.sale_data):
-            return
-        if not ParamValidator.is_null(self.sale_data.delivery_date):
-            innerdict['saleData[deliveryDate]'] = self.sale_data.delivery_date.strftime('%d-%m-%Y')
-        if not ParamValidator.is_null(self.sale_data.invoice_date):
-            innerdict['saleData[invoiceDate]'] = self.sale_data.invoice_date.strftime('%d-%m-%Y')
-        if ParamValidator.not_empty(self.sale_data.order_data) and len(self.sale_data.order_data) > 0:
-            i=0
-            for item in self.sale_data.order_data:
-                ParamValidator.assert_not_empty(item.product_id, 'sales_data.order_data.product_id')
-                ParamValidator.assert_not_empty(item.price, 'sales_data.order_data.price')
-                ParamValidator.assert_not_empty(item.quantity, 'sales_data.order_data.quantity')
-                innerdict['saleData[orderData][{}][productId]'.format(i)] = item.product_id
-                innerdict['saleData[orderData][{}][price]'.format(i)] = item.price
-                innerdict['saleData[orderData][{}][quantity]'.format(i)] = item.quantity
-                if ParamValidator.not_empty(item.description):
-                    innerdict['saleData[orderData][{}][description]'.format(i)] = item.description
-                if ParamValidator.not_empty(item.vat_code):
-                    innerdict['saleData[orderData][{}][vatCode]'.format(i)] = item.vat_code
-                if ParamValidator.not_empty(item.vat_percentage):
-                    innerdict['saleData[orderData][{}][vatPercentage]'.format(i)] = item.vat_percentage
-                if ParamValidator.not_empty(item.product_type):
-                    innerdict['saleData[orderData][{}][productType]'.format(i)] = item.product_type
-
-    def _merge_end_user_dict(self, innerdict):
-        if ParamValidator.is_null(self.end_user):
-            return
-        if ParamValidator.not_empty(self.end_user.access_code):
-            innerdict['enduser[accessCode]'] = self.end_user.access_code
-        if ParamValidator.not_empty(self.end_user.language):
-            innerdict['enduser[language]'] = self.end_user.language
-        if ParamValidator.not_empty(self.end_user.initials):
-            innerdict['enduser[initials]'] = self.end_user.initials
-        if ParamValidator.not_empty(self.end_user.last_name):
-            innerdict['enduser[lastName]'] = self.end_user.last_name
-        if ParamValidator.not_empty(self.end_user.gender):
-            innerdict['enduser[gender]'] = self.end_user.gender
-        if ParamValidator.not_empty(self.end_user.dob):
-            innerdict['enduser[dob]'] = self.end_user.dob.strftime('%d-%m-%Y')
-        if ParamValidator.not_empty(self.end_user.phone_number):
-            innerdict['enduser[phoneNumber]'] = self.end_user.phone_number
-        if ParamValidator.not_empty(self.end_user.email_address):
-            innerdict['enduser[emailAddress]'] = self.end_user.email_address
-        if ParamValidator.not_empty(self.end_user.bank_account):
-            innerdict['enduser[bankAccount]'] = self.end_user.bank_account
-        if ParamValidator.not_empty(self.end_user.iban):
-            innerdict['enduser[iban]'] = self.end_user.iban
-        if ParamValidator.not_empty(self.end_user.bic):
-            innerdict['enduser[bic]'] = self.end_user.bic
-        if self.end_user.send_confirm_email:
-            innerdict['enduser[sendConfirmMail]'] = 1
-        else:
-            innerdict['enduser[sendConfirmMail]'] = 0
-        if ParamValidator.not_empty(self.end_user.customer_reference):
-            innerdict['enduser[customerReference]'] = self.end_user.customer_reference
-        if ParamValidator.not_empty(self.end_user.customer_trust):
-            innerdict['enduser[customerTrust]'] = self.end_user.customer_trust
-        if not ParamValidator.is_null(self.end_user.address):
-            if not ParamValidator.is_empty(self.end_user.address.street_name):
-                innerdict['enduser[address][streetName]'] = self.end_user.address.street_name
-            if not ParamValidator.is_empty(self.end_user.address.street_number):
-                innerdict['enduser[address][streetNumber]'] = self.end_user.address.street_number
-            if not ParamValidator.is_empty(self.end_user.address.street_number_extension):
-                innerdict['enduser[address][streetNumberExtension]'] = self.end_user.address.street_number_extension
-            if not ParamValidator.is_empty(self.end_user.address.zip_code):
-                innerdict['enduser[address][zipCode]'] = self.end_user.address.zip_code
-            if not ParamValidator.is_empty(self.end_user.address.city):
-                innerdict['enduser[address][city]'] = self.end_user.address.city
-            if not ParamValidator.is_empty(self.end_user.address.region_code):
-                innerdict['enduser[address][regionCode]'] = self.end_user.address.region_code
-            if not ParamValidator.is_empty(self.end_user.address.country_code):
-                innerdict['enduser[address][countryCode]'] = self.end_user.address.country_code
-        if not ParamValidator.is_null(self.end_user.invoice_address):
-            if not ParamValidator.is_empty(self.end_user.invoice_address.initials):
-                innerdict['enduser[invoiceAddress][initials]'] = self.end_user.invoice_address.initials
-            if not ParamValidator.is_empty(self.end_user.invoice_address.last_name):
-                innerdict['enduser[invoiceAddress][lastName]'] = self.end_user.invoice_address.last_name
-            if not ParamValidator.is_empty(self.end_user.invoice_address.gender):
-                innerdict['enduser[invoiceAddress][gender]'] = self.end_user.invoice_address.gender
-            if not ParamValidator.is_empty(self.end_user.invoice_address.street_name):
-                innerdict['enduser[invoiceAddress][streetName]'] = self.end_user.invoice_address.street_name
-            if not ParamValidator.is_empty(self.end_user.invoice_address.street_number):
-                innerdict['enduser[invoiceAddress][streetNumber]'] = self.end_user.invoice_address.street_number
-            if not ParamValidator.is_empty(self.end_user.invoice_address.street_number_extension):
-                innerdict['enduser[invoiceAddress][streetNumberExtension]'] = self.end_user.invoice_address.street_number_extension
-            if not ParamValidator.is_empty(self.end_user.invoice_address.zip_code):
-                innerdict['enduser[invoiceAddress][zipCode]'] = self.end_user.invoice_address.zip_code
-            if not ParamValidator.is_empty(self.end_user.invoice_address.city):
-                innerdict['enduser[invoiceAddress][city]'] = self.end_user.invoice_address.city
-            if not ParamValidator.is_empty(self.end_user.invoice_address.region_code):
-                innerdict['enduser[invoiceAddress][regionCode]'] = self.end_user.invoice_address.region_code
-            if not ParamValidator.is_empty(self.end_user.invoice_address.country_code):
-                innerdict['enduser[invoiceAddress][countryCode]'] = self.end_user.invoice_address.country_code
-        if not ParamValidator.is_null(self.end_user.company):
-            if not ParamValidator.is_empty(self.end_user.company.name):
-                innerdict['enduser[company][name]'] = self.end_user.company.name
-            if not ParamValidator.is_empty(self.end_user.company.coc_number):
-                innerdict['enduser[company][cocNumber]'] = self.end_user.company.coc_number
-            if not ParamValidator.is_empty(self.end_user.company.vat_number):
-                innerdict['enduser[company][vatNumber]'] = self.end_user.company.vat_number
-            if not ParamValidator.is_empty(self.end_user.company.country_code):
-                innerdict['enduser[company][countryCode]'] = self.end_user.company.country_code
 
     @RequestBase.raw_response.setter
     def raw_response(self, raw_response):
         self._raw_response = raw_response
-        rs = json.loads(self.raw_response)
-        schema = ResponseSchema(partial=True)
-        response, errors = schema.load(rs)
+        rs = self.parse_raw_response()
+        response, errors = self.load_schema(ResponseSchema, rs)
         self.handle_schema_errors(errors)
         self._response = response
 
@@ -319,3 +286,94 @@ class Request(RequestBase):
         # print('{}::respone.setter'.format(self.__module__ + '.' + self.__class__.__qualname__))
         self._response = response
 
+
+class StartTemplate(object):
+    """
+    Template for Transaction::start requests sharing most of their parameters
+
+    The parameters shared by all transactions (e.g. the finish url, stats data, currency, exchange url or the company
+    of the end user) are validated and encoded once, when the template is created. Requests created from the template
+    only encode the per transaction parameters, which are merged into (and override) the template's parameters.
+    The template is immutable, so it can be shared between threads.
+
+    :param str finish_url: URL where end user will be redirected to
+    :param int payment_option_id: payment option ID
+    :param int payment_option_sub_id: payment suboption ID
+    :param TransactionData transaction: shared transaction data details (e.g. currency and exchange url)
+    :param TransactionStartStatsData stats_data: transaction stats data details
+    :param TransactionEndUser end_user: shared end user details (e.g. the company)
+    :param bool test_mode: True to perform transactions in TEST modus
+    :param str transfer_type: transfer type.
+                              Use transaction, merchant or alliance to change the benificiary owner of the transaction
+    :param str transfer_value: transfer_value. MerchantId (M-xxxx-xxxx) or orderId
+    """
+    def __init__(self,
+                 finish_url: str=None,
+                 payment_option_id: int=None,
+                 payment_option_sub_id: int=None,
+                 transaction: TransactionData=None,
+                 stats_data: TransactionStartStatsData=None,
+                 end_user: TransactionEndUser=None,
+                 test_mode: bool=False,
+                 transfer_type: str=None,
+                 transfer_value: str=None,
+                 ):
+        request = Request(finish_url=finish_url, payment_option_id=payment_option_id,
+                          payment_option_sub_id=payment_option_sub_id, transaction=transaction, stats_data=stats_data,
+                          end_user=end_user, test_mode=test_mode, transfer_type=transfer_type,
+                          transfer_value=transfer_value)
+        request.validate_transfer()
+        self._parameters = MappingProxyType(TEMPLATE_ENCODER.encode(request))
+
+    @property
+    def parameters(self):
+        """
+        Get the encoded shared parameters
+
+        :return: read-only mapping of the parameters
+        :rtype: types.MappingProxyType
+        """
+        return self._parameters
+
+    def create_request(self,
+                       amount: int,
+                       ip_address: str,
+                       order_number: str=None,
+                       order_data: List[OrderData]=None,
+                       transaction: TransactionData=None,
+                       end_user: TransactionEndUser=None,
+                       sale_data: SalesData=None,
+                       ) -> Request:
+        """
+        Create a request for a transaction
+
+        :param amount: transaction amount in cents
+        :type amount: int
+        :param ip_address: IP address of end user
+        :type ip_address: str
+        :param order_number: order number. Shortcut for ``transaction=TransactionData(order_number=order_number)``
+        :type order_number: str
+        :param order_data: order lines. Shortcut for ``sale_data=SalesData(order_data=order_data)``
+        :type order_data: List[OrderData]
+        :param transaction: transaction data details, overriding those of the template
+        :type transaction: TransactionData
+        :param end_user: end user details, overriding those of the template
+        :type end_user: TransactionEndUser
+        :param sale_data: transaction sales details
+        :type sale_data: SalesData
+        :return: the request
+        :rtype: paynlsdk.api.transaction.start.Request
+        :raise ValueError: both a shortcut and the details it is a shortcut for are given
+        """
+        if order_number is not None:
+            if transaction is not None:
+                raise ValueError('Set the order number either using order_number or in transaction, not both')
+            transaction = TransactionData(order_number=order_number)
+        if order_data is not None:
+            if sale_data is not None:
+                raise ValueError('Set the order lines either using order_data or in sale_data, not both')
+            sale_data = SalesData(order_data=order_data)
+        request = Request(amount=amount, ip_address=ip_address, transaction=transaction, end_user=end_user,
+                          sale_data=sale_data)
+        request.template = self
+        return request
@@ -1,5 +1,3 @@
-import json
-
 from marshmallow import Schema, fields, post_load
 
 from paynlsdk.api.requestbase import RequestBase
@@ -75,9 +73,8 @@ class Request(RequestBase):
     def raw_response(self, raw_response):
         self._raw_response = raw_response
         # Do error checking.
-        rs = json.loads(self.raw_response)
-        schema = ResponseSchema(partial=True)
-        response, errors = schema.load(rs)
+        rs = self.parse_raw_response()
+        response, errors = self.load_schema(ResponseSchema, rs)
         self.handle_schema_errors(errors)
         self._response = response
 
@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from paynlsdk.api.hooks import CallTimings
+
+
+class Transport(ABC):
+    """
+    Transport performing the HTTP calls of an :class:`paynlsdk.api.client.APIClient`
+
+    A transport returns a :class:`requests.Response` (or an object offering the same ``status_code``, ``content``,
+    ``text``, ``headers``, ``raise_for_status()`` and ``close()``) and reports failed connections and timeouts by
+    raising :class:`requests.exceptions.ConnectionError` and :class:`requests.exceptions.Timeout`, so the client's
+    retry policy, circuit breakers and deadlines work the same for every transport.
+    """
+    @abstractmethod
+    def send(self, method: str, url: str, headers: dict, parameters: dict, timeout, timings: CallTimings=None):
+        """
+        Perform a single HTTP call
+
+        When ``timings`` is given, the transport records the connect, time to first byte and body read timings of the
+        call in it (as far as it can tell them apart).
+
+        :param method: HTTP method
+        :type method: str
+        :param url: url to call
+        :type url: str
+        :param headers: HTTP headers
+        :type headers: dict
+        :param parameters: request parameters (sent as query string for GET, as form data otherwise)
+        :type parameters: dict
+        :param timeout: (connect timeout, read timeout) tuple
+        :type timeout: tuple
+        :param timings: timings to record the network stages of the call in, or None
+        :type timings: paynlsdk.api.hooks.CallTimings
+        :return: HTTP response
+        :rtype: requests.Response
+        :raise requests.exceptions.ConnectionError: the connection failed
+        :raise requests.exceptions.Timeout: the call timed out
+        """
+        pass
+
+    def close(self):
+        """
+        Release the resources (e.g. pooled connections) of the transport
+
+        The transport may be used again after closing it.
+        """
+        pass
+
+
+# Seconds spent establishing connections by the current thread, see RequestsTransport.send
+_connect_time = threading.local()
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        started = time.monotonic()
+        super().connect()
+        _connect_time.elapsed = getattr(_connect_time, 'elapsed', 0.0) + time.monotonic() - started
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        started = time.monotonic()
+        super().connect()
+        _connect_time.elapsed = getattr(_connect_time, 'elapsed', 0.0) + time.monotonic() - started
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class RequestsTransport(Transport):
+    """
+    Transport performing the HTTP calls using `requests`
+
+    The transport owns a single :class:`requests.Session` with a pooled, keep-alive capable HTTP adapter.
+    The session is thread-safe to use and is created lazily on first use (and re-created after a fork).
+
+    :param int pool_size: number of connection pools (one per host) to cache
+    :param int max_connections_per_host: maximum number of connections to keep in the pool of a single host
+    :param bool keep_alive: whether to keep connections alive between calls.
+                            If False, every call will open (and close) its own connection
+    :param bool pool_block: whether to block when no free connection is available in the pool (instead of
+                            opening an additional, non pooled connection)
+    """
+    def __init__(self,
+                 pool_size: int=10,
+                 max_connections_per_host: int=10,
+                 keep_alive: bool=True,
+                 pool_block: bool=False
+                 ):
+        self.pool_size = pool_size
+        self.max_connections_per_host = max_connections_per_host
+        self.keep_alive = keep_alive
+        self.pool_block = pool_block
+        self._session = None
+        self._session_pid = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        Get the pooled HTTP session
+
+        :return: HTTP session
+        :rtype: requests.Session
+        """
+        pid = os.getpid()
+        if self._session is None or self._session_pid != pid:
+            with self._session_lock:
+                if self._session is None or self._session_pid != pid:
+                    # Never share pooled sockets with a parent process (e.g. pre-forking servers)
+                    self._session = self._create_session()
+                    self._session_pid = pid
+        return self._session
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.max_connections_per_host,
+                              pool_block=self.pool_block)
+        # Let new connections record the time spent connecting (including the TLS handshake)
+        adapter.poolmanager.pool_classes_by_scheme = {'http': _TimedHTTPConnectionPool,
+                                                      'https': _TimedHTTPSConnectionPool}
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def send(self, method: str, url: str, headers: dict, parameters: dict, timeout, timings: CallTimings=None):
+        get = method.upper() == 'GET'
+        if timings is None:
+            if get:
+                return self.session.get(url, verify=True, headers=headers, params=parameters, timeout=timeout)
+            return self.session.post(url, verify=True, headers=headers, data=parameters, timeout=timeout)
+
+        # Stream the response, so reading the body can be timed separately from waiting for the headers
+        _connect_time.elapsed = 0.0
+        started = time.monotonic()
+        if get:
+            response = self.session.get(url, verify=True, headers=headers, params=parameters, timeout=timeout,
+                                        stream=True)
+        else:
+            response = self.session.post(url, verify=True, headers=headers, data=parameters, timeout=timeout,
+                                         stream=True)
+        headers_received = time.monotonic()
+        response.content
+        timings.connect = _connect_time.elapsed
+        timings.ttfb = headers_received - started - timings.connect
+        timings.body_read = time.monotonic() - headers_received
+        return response
+
+    def close(self):
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+            self._session_pid = None
@@ -0,0 +1,57 @@
+from typing import List
+
+from paynlsdk.api.cache import AsyncTTLCache
+from paynlsdk.api.deadline import Deadline
+from paynlsdk.objects import BankDetails
+
+
+async def _load_banks_response(key, deadline: Deadline):
+    from paynlsdk.client.aio.transaction import Transaction
+    return await Transaction.get_banks_response(deadline=deadline)
+
+
+class Banks(object):
+    """
+    asyncio version of :class:`paynlsdk.client.banks.Banks`
+
+    :cvar AsyncTTLCache cache: cache holding the getbanks response
+    """
+    cache = AsyncTTLCache(_load_banks_response, ttl=3600.0, stale_ttl=86400.0, namespace='banks')
+
+    @staticmethod
+    async def get_list(use_cache: bool=True, deadline: Deadline=None) -> List[BankDetails]:
+        """
+        Gets the list of banks.
+
+        :param use_cache: whether to use the cached list of banks (if available)
+        :type use_cache: bool
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: List of banks
+        :rtype: List[BankDetails]
+        """
+        response = await Banks.get_list_response(use_cache, deadline=deadline)
+        return response.banks
+
+    @staticmethod
+    async def get_list_response(use_cache: bool=True, deadline: Deadline=None):
+        """
+        Get a get_banks :class:`paynlsdk.api.transaction.getbanks.Response` instance
+
+        :param use_cache: whether to use the cached response (if available)
+        :type use_cache: bool
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: Response object
+        :rtype: paynlsdk.api.transaction.getbanks.Response
+        """
+        if use_cache:
+            return await Banks.cache.get(deadline=deadline)
+        return await Banks.cache.refresh(deadline=deadline)
+
+    @staticmethod
+    def invalidate():
+        """
+        Clear the cached list of banks, so the next call fetches it from the API
+        """
+        Banks.cache.invalidate()
@@ -0,0 +1,44 @@
+from paynlsdk.api.asyncclient import AsyncAPIClient
+
+
+class Refund(object):
+    """
+    asyncio version of :class:`paynlsdk.client.refund.Refund`
+    """
+    @staticmethod
+    async def info(refund_id: str):
+        """
+        Return refund info
+
+        :param refund_id: Refund ID (starts wih "RF-")
+        :type refund_id: str
+        :return: Info Response
+        :rtype: paynlsdk.api.refund.info.Response
+        """
+        from paynlsdk.api.refund.info import Request
+        client = AsyncAPIClient.get_default()
+        request = Request(refund_id)
+        await client.perform_request(request)
+        return request.response
+
+    @staticmethod
+    async def transaction(transaction_id: str,
+                          amount: int=None,
+                          description: str=None,
+                          process_date: str=None,
+                          products: dict={},
+                          vat_percentage: float=None,
+                          exchange_url: str=None):
+        """
+        Refund a transaction
+
+        See :meth:`paynlsdk.client.refund.Refund.transaction` for a description of the arguments
+
+        :return: Transaction refund response
+        :rtype: paynlsdk.api.refund.transaction.Response
+        """
+        from paynlsdk.api.refund.transaction import Request
+        client = AsyncAPIClient.get_default()
+        request = Request(transaction_id, amount, description, process_date, products, vat_percentage, exchange_url)
+        await client.perform_request(request)
+        return request.response
@@ -0,0 +1,492 @@
+from datetime import datetime
+
+from paynlsdk.api.asyncclient import AsyncAPIClient
+from paynlsdk.api.deadline import Deadline
+from paynlsdk.client.transactioncache import TransactionCache
+from paynlsdk.objects import TransactionData, TransactionStartStatsData, SalesData, TransactionEndUser, BankDetails, \
+    OrderData
+
+from typing import List
+
+
+class Transaction(object):
+    """
+    asyncio version of :class:`paynlsdk.client.transaction.Transaction`
+
+    All methods are coroutines and use the shared :class:`paynlsdk.api.asyncclient.AsyncAPIClient`.
+    Request instances can still be obtained through :class:`paynlsdk.client.transaction.Transaction`
+
+    :cvar TransactionCache response_cache: opt-in cache for info and status responses. None to disable
+    """
+    response_cache: TransactionCache = None
+
+    @staticmethod
+    async def approve(order_id: str, entrance_code: str=None, deadline: Deadline=None):
+        """
+        Approve a transaction
+
+        :param order_id: order ID
+        :type order_id: str
+        :param entrance_code: entrance code
+        :type entrance_code: str
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: Result of the approval
+        :rtype:  bool
+        """
+        response = await Transaction.approve_response(order_id, entrance_code, deadline=deadline)
+        return response.result
+
+    @staticmethod
+    async def decline(order_id: str, entrance_code: str=None, deadline: Deadline=None):
+        """
+        Decline a transaction
+
+        :param order_id: order ID
+        :type order_id: str
+        :param entrance_code: entrance code
+        :type entrance_code: str
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: Result of the decline
+        :rtype:  bool
+        """
+        response = await Transaction.decline_response(order_id, entrance_code, deadline=deadline)
+        return response.result
+
+    @staticmethod
+    async def capture(transaction_id: str, products: dict={}, tracktrace: str=None, deadline: Deadline=None):
+        """
+        Capture a transaction
+
+        :param transaction_id: order ID
+        :type transaction_id: str
+        :param products: entrance code
+        :type products: dict (keys: product id, value: quantity)
+        :param tracktrace: track and trace code
+        :type tracktrace: str
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: Result of the capture
+        :rtype:  bool
+        """
+        response = await Transaction.capture_response(transaction_id, products, tracktrace, deadline=deadline)
+        return response.result
+
+    @staticmethod
+    async def void(transaction_id: str, deadline: Deadline=None):
+        """
+        Void a transaction
+
+        :param transaction_id: transaction ID
+        :type transaction_id: str
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: Result of the void
+        :rtype:  bool
+        """
+        response = await Transaction.void_response(transaction_id, deadline=deadline)
+        return response.result
+
+    @staticmethod
+    async def get_banks(deadline: Deadline=None) -> List[BankDetails]:
+        """
+        Gets the list of banks.
+
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: List of banks
+        :rtype: List[BankDetails]
+        """
+        response = await Transaction.get_banks_response(deadline=deadline)
+        return response.banks
+
+    @staticmethod
+    async def get_service(payment_method_id: int, deadline: Deadline=None):
+        """
+        Get a transaction getservice :class:`paynlsdk.api.transaction.getservice.Response` instance
+
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: Transaction getservice response instance
+        :rtype: paynlsdk.api.transaction.getservice.Response
+        """
+        return await Transaction.get_service_response(payment_method_id, deadline=deadline)
+
+    @staticmethod
+    async def get_service_payment_options(payment_method_id: int=None, deadline: Deadline=None):
+        """
+        Get a transaction getservicepaymentoptions :class:`paynlsdk.api.transaction.getservicepaymentoptions.Response` instance
+
+        :param payment_method_id: payment method ID
+        :type payment_method_id: int
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: Transaction getservicepaymentoptions response instance
+        :rtype: paynlsdk.api.transaction.getservicepaymentoptions.Response
+        """
+        return await Transaction.get_service_payment_options_response(payment_method_id, deadline=deadline)
+
+    @staticmethod
+    async def info(transaction_id: str, entrance_code: str=None, use_cache: bool=True, deadline: Deadline=None,
+                   lazy: bool=False):
+        """
+        Get a transaction info :class:`paynlsdk.api.transaction.info.Response` instance
+
+        :param transaction_id: transaction ID
+        :type transaction_id: str
+        :param entrance_code: entrance code
+        :type entrance_code: str
+        :param use_cache: whether to use the :attr:`Transaction.response_cache` (if configured)
+        :type use_cache: bool
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :param lazy: whether to decode the details of the response on first access
+                     (see :class:`paynlsdk.api.transaction.info.LazyResponse`)
+        :type lazy: bool
+        :return: Transaction info response instance
+        :rtype: paynlsdk.api.transaction.info.Response
+        """
+        return await Transaction.info_response(transaction_id, entrance_code, use_cache, deadline=deadline, lazy=lazy)
+
+    @staticmethod
+    async def status(transaction_id: str, use_cache: bool=True, deadline: Deadline=None):
+        """
+        Get transaction status
+
+        :param transaction_id: transaction ID
+        :type transaction_id: str
+        :param use_cache: whether to use the :attr:`Transaction.response_cache` (if configured)
+        :type use_cache: bool
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: transaction status
+        :rtype: paynlsdk.api.transaction.status.Response
+        """
+        return await Transaction.status_response(transaction_id, use_cache, deadline=deadline)
+
+    @staticmethod
+    async def refund(transaction_id: str, amount: int=None, description: str=None, process_date: datetime=None,
+                     deadline: Deadline=None):
+        """
+        Refund (part of) a transaction
+
+        :param transaction_id: transaction ID
+        :type transaction_id: str
+        :param amount: transaction amount to refund
+        :type amount: int
+        :param description: refund description
+        :type description: str
+        :param process_date: date at which refund needs to be processed
+        :type process_date: str
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: refund result
+        :rtype: paynlsdk.api.transaction.refund.Response
+        """
+        return await Transaction.refund_response(transaction_id, amount, description, process_date,
+                                                 deadline=deadline)
+
+    @staticmethod
+    async def start(amount: str,
+                    ip_address: str,
+                    finish_url: str,
+                    payment_option_id: int=None,
+                    payment_option_sub_id: int=None,
+                    transaction: TransactionData=None,
+                    stats_data: TransactionStartStatsData=None,
+                    end_user: TransactionEndUser=None,
+                    sale_data: SalesData=None,
+                    test_mode: bool=False,
+                    transfer_type: str=None,
+                    transfer_value: str=None,
+                    deadline: Deadline=None
+                    ):
+        """
+        Get a transaction start :class:`paynlsdk.api.transaction.start.Response` instance
+
+        See :meth:`paynlsdk.client.transaction.Transaction.start` for a description of the arguments
+
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: Transaction start response instance
+        :rtype: paynlsdk.api.transaction.start.Response
+        """
+        return await Transaction.start_response(amount, ip_address, finish_url, payment_option_id,
+                                                payment_option_sub_id, transaction, stats_data, end_user, sale_data,
+                                                test_mode, transfer_type, transfer_value, deadline=deadline)
+
+    @staticmethod
+    async def approve_response(order_id: str, entrance_code: str=None, deadline: Deadline=None):
+        """
+        Get a transaction approve :class:`paynlsdk.api.transaction.approve.Response` instance
+
+        :param order_id: order ID
+        :type order_id: str
+        :param entrance_code: entrance code
+        :type entrance_code: str
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: Transaction approve response instance
+        :rtype: paynlsdk.api.transaction.approve.Response
+        """
+        from paynlsdk.api.transaction.approve import Request
+        client = AsyncAPIClient.get_default()
+        request = Request(order_id, entrance_code)
+        await client.perform_request(request, deadline=deadline)
+        return request.response
+
+    @staticmethod
+    async def decline_response(order_id: str, entrance_code: str=None, deadline: Deadline=None):
+        """
+        Get a transaction decline :class:`paynlsdk.api.transaction.decline.Response` instance
+
+        :param order_id: order ID
+        :type order_id: str
+        :param entrance_code: entrance code
+        :type entrance_code: str
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: Transaction decline response instance
+        :rtype: paynlsdk.api.transaction.decline.Response
+        """
+        from paynlsdk.api.transaction.decline import Request
+        client = AsyncAPIClient.get_default()
+        request = Request(order_id, entrance_code)
+        await client.perform_request(request, deadline=deadline)
+        return request.response
+
+    @staticmethod
+    async def capture_response(transaction_id: str, products: dict={}, tracktrace: str=None, deadline: Deadline=None):
+        """
+        Get a transaction capture :class:`paynlsdk.api.transaction.capture.Response` instance
+
+        :param transaction_id: order ID
+        :type transaction_id: str
+        :param products: entrance code
+        :type products: dict (keys: product id, value: quantity)
+        :param tracktrace: track and trace code
+        :type tracktrace: str
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: Transaction capture response instance
+        :rtype: paynlsdk.api.transaction.capture.Response
+        """
+        from paynlsdk.api.transaction.capture import Request
+        client = AsyncAPIClient.get_default()
+        request = Request(transaction_id, products, tracktrace)
+        await client.perform_request(request, deadline=deadline)
+        return request.response
+
+    @staticmethod
+    async def void_response(transaction_id: str, deadline: Deadline=None):
+        """
+        Get a transaction void :class:`paynlsdk.api.transaction.voidauthorization.Response` instance
+
+        :param transaction_id: transaction ID
+        :type transaction_id: str
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: Transaction void response instance
+        :rtype: paynlsdk.api.transaction.voidauthorization.Response
+        """
+        from paynlsdk.api.transaction.voidauthorization import Request
+        client = AsyncAPIClient.get_default()
+        request = Request(transaction_id)
+        await client.perform_request(request, deadline=deadline)
+        return request.response
+
+    @staticmethod
+    async def get_banks_response(deadline: Deadline=None):
+        """
+        Get a transaction getbanks :class:`paynlsdk.api.transaction.getbanks.Response` instance
+
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: Transaction getbanks response instance
+        :rtype: paynlsdk.api.transaction.getbanks.Response
+        """
+        from paynlsdk.api.transaction.getbanks import Request
+        client = AsyncAPIClient.get_default()
+        request = Request()
+        await client.perform_request(request, deadline=deadline)
+        return request.response
+
+    @staticmethod
+    async def get_service_response(payment_method_id: int, deadline: Deadline=None):
+        """
+        Get a transaction getservice :class:`paynlsdk.api.transaction.getservice.Response` instance
+
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: Transaction getservice response instance
+        :rtype: paynlsdk.api.transaction.getservice.Response
+        """
+        from paynlsdk.api.transaction.getservice import Request
+        client = AsyncAPIClient.get_default()
+        request = Request(payment_method_id)
+        await client.perform_request(request, deadline=deadline)
+        return request.response
+
+    @staticmethod
+    async def get_service_payment_options_response(payment_method_id: int=None, deadline: Deadline=None):
+        """
+        Get a transaction getservicepaymentoptions :class:`paynlsdk.api.transaction.getservicepaymentoptions.Response` instance
+
+        :param payment_method_id: payment method ID
+        :type payment_method_id: int
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: Transaction getservicepaymentoptions response instance
+        :rtype: paynlsdk.api.transaction.getservicepaymentoptions.Response
+        """
+        from paynlsdk.api.transaction.getservicepaymentoptions import Request
+        client = AsyncAPIClient.get_default()
+        request = Request(payment_method_id)
+        await client.perform_request(request, deadline=deadline)
+        return request.response
+
+    @staticmethod
+    async def info_response(transaction_id: str, entrance_code: str=None, use_cache: bool=True,
+                            deadline: Deadline=None, lazy: bool=False):
+        """
+        Get a transaction info :class:`paynlsdk.api.transaction.info.Response` instance
+
+        :param transaction_id: transaction ID
+        :type transaction_id: str
+        :param entrance_code: entrance code
+        :type entrance_code: str
+        :param use_cache: whether to use the :attr:`Transaction.response_cache` (if configured)
+        :type use_cache: bool
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :param lazy: whether to decode the details of the response on first access
+                     (see :class:`paynlsdk.api.transaction.info.LazyResponse`)
+        :type lazy: bool
+        :return: Transaction info response instance
+        :rtype: paynlsdk.api.transaction.info.Response
+        """
+        cache = Transaction.response_cache
+        if use_cache and cache is not None:
+            response = cache.get('info', transaction_id, entrance_code)
+            if response is not None:
+                return response
+        from paynlsdk.api.transaction.info import Request
+        client = AsyncAPIClient.get_default()
+        request = Request(transaction_id, entrance_code, lazy)
+        await client.perform_request(request, deadline=deadline)
+        if cache is not None:
+            cache.set('info', transaction_id, request.response, entrance_code)
+        return request.response
+
+    @staticmethod
+    async def status_response(transaction_id: str, use_cache: bool=True, deadline: Deadline=None):
+        """
+        Get a transaction status :class:`paynlsdk.api.transaction.status.Response` instance
+
+        :param transaction_id: transaction ID
+        :type transaction_id: str
+        :param use_cache: whether to use the :attr:`Transaction.response_cache` (if configured)
+        :type use_cache: bool
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: Transaction status response instance
+        :rtype: paynlsdk.api.transaction.status.Response
+        """
+        cache = Transaction.response_cache
+        if use_cache and cache is not None:
+            response = cache.get('status', transaction_id)
+            if response is not None:
+                return response
+        from paynlsdk.api.transaction.status import Request
+        client = AsyncAPIClient.get_default()
+        request = Request(transaction_id)
+        await client.perform_request(request, deadline=deadline)
+        if cache is not None:
+            cache.set('status', transaction_id, request.response)
+        return request.response
+
+    @staticmethod
+    async def refund_response(transaction_id: str, amount: int=None, description: str=None,
+                              process_date: datetime=None, deadline: Deadline=None):
+        """
+        Get a transaction refund :class:`paynlsdk.api.transaction.refund.Response` instance
+
+        :param transaction_id: transaction ID
+        :type transaction_id: str
+        :param amount: transaction amount to refund
+        :type amount: int
+        :param description: refund description
+        :type description: str
+        :param process_date: date at which refund needs to be processed
+        :type process_date: str
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: transaction refund response
+        :rtype: paynlsdk.api.transaction.refund.Response
+        """
+        from paynlsdk.api.transaction.refund import Request
+        client = AsyncAPIClient.get_default()
+        request = Request(transaction_id, amount, description, process_date)
+        await client.perform_request(request, deadline=deadline)
+        return request.response
+
+    @staticmethod
+    async def start_response(amount: str,
+                             ip_address: str,
+                             finish_url: str,
+                             payment_option_id: int=None,
+                             payment_option_sub_id: int=None,
+                             transaction: TransactionData=None,
+                             stats_data: TransactionStartStatsData=None,
+                             end_user: TransactionEndUser=None,
+                             sale_data: SalesData=None,
+                             test_mode: bool=False,
+                             transfer_type: str=None,
+                             transfer_value: str=None,
+                             deadline: Deadline=None
+                             ):
+        """
+        Get a transaction start :class:`paynlsdk.api.transaction.start.Response` instance
+
+        See :meth:`paynlsdk.client.transaction.Transaction.start_response` for a description of the arguments
+
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: Transaction start response instance
+        :rtype: paynlsdk.api.transaction.start.Response
+        """
+        from paynlsdk.api.transaction.start import Request
+        client = AsyncAPIClient.get_default()
+        request = Request(amount, ip_address, finish_url, payment_option_id, payment_option_sub_id,
+                          transaction, stats_data, end_user, sale_data, test_mode, transfer_type, transfer_value)
+        await client.perform_request(request, deadline=deadline)
+        return request.response
+
+    @staticmethod
+    async def start_from_template(template,
+                                  amount: int,
+                                  ip_address: str,
+                                  order_number: str=None,
+                                  order_data: List[OrderData]=None,
+                                  transaction: TransactionData=None,
+                                  end_user: TransactionEndUser=None,
+                                  sale_data: SalesData=None,
+                                  deadline: Deadline=None
+                                  ):
+        """
+        Get a transaction start :class:`paynlsdk.api.transaction.start.Response` instance for a transaction created
+        from a :class:`paynlsdk.api.transaction.start.StartTemplate`
+
+        See :meth:`paynlsdk.client.transaction.Transaction.start_from_template` for a description of the arguments
+
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: Transaction start response instance
+        :rtype: paynlsdk.api.transaction.start.Response
+        """
+        client = AsyncAPIClient.get_default()
+        request = template.create_request(amount, ip_address, order_number, order_data, transaction, end_user,
+                                          sale_data)
+        await client.perform_request(request, deadline=deadline)
+        return request.response
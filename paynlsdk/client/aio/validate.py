@@ -0,0 +1,51 @@
+from paynlsdk.api.asyncclient import AsyncAPIClient
+from paynlsdk.api.deadline import Deadline
+
+
+class Validate(object):
+    """
+    asyncio version of :class:`paynlsdk.client.validate.Validate`
+
+    Verdicts are shared with :class:`paynlsdk.client.validate.Validate` through its ``ip_validator``
+    """
+    @staticmethod
+    async def pay_server_ip(ip_address: str, use_cache: bool=True, deadline: Deadline=None):
+        """
+        Validate a Pay server IP
+
+        :param ip_address: IP address
+        :type ip_address: str
+        :param use_cache: whether to use the local validator (cached verdicts and known networks) before calling the API
+        :type use_cache: bool
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: validation result
+        :rtype: bool
+        """
+        from paynlsdk.client.validate import Validate as SyncValidate
+        validator = SyncValidate.ip_validator
+        if use_cache:
+            verdict = validator.lookup(ip_address)
+            if verdict is not None:
+                return verdict
+        response = await Validate.pay_server_ip_response(ip_address, deadline=deadline)
+        validator.record(ip_address, response.result)
+        return response.result
+
+    @staticmethod
+    async def pay_server_ip_response(ip_address: str, deadline: Deadline=None):
+        """
+        Get a Pay server IP validation :class:`paynlsdk.api.validate.payserverip.Response` instance
+
+        :param ip_address: IP address
+        :type ip_address: str
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: Response instance
+        :rtype: paynlsdk.api.validate.payserverip.Response
+        """
+        from paynlsdk.api.validate.payserverip import Request
+        client = AsyncAPIClient.get_default()
+        request = Request(ip_address)
+        await client.perform_request(request, deadline=deadline)
+        return request.response
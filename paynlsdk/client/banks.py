@@ -1,31 +1,64 @@
 from typing import List
+
+from paynlsdk.api.cache import TTLCache
+from paynlsdk.api.deadline import Deadline
 from paynlsdk.objects import BankDetails
 
 
+def _load_banks_response(key, deadline: Deadline):
+    from paynlsdk.client.transaction import Transaction
+    return Transaction.get_banks_response(deadline=deadline)
+
+
 class Banks(object):
+    """
+    Bank list utility class
+
+    The list of banks hardly ever changes, so the :class:`paynlsdk.api.transaction.getbanks.Response` is cached for an
+    hour by default and refreshed in the background after that.
+    Configure the cache using e.g. ``Banks.cache.ttl = 600`` and clear it using :meth:`Banks.invalidate`
+
+    :cvar TTLCache cache: cache holding the getbanks response
+    """
+    cache = TTLCache(_load_banks_response, ttl=3600.0, stale_ttl=86400.0, namespace='banks')
+
     @staticmethod
-    def get_list() -> List[BankDetails]:
+    def get_list(use_cache: bool=True, deadline: Deadline=None) -> List[BankDetails]:
         """
         Gets the list of banks.
 
         Please note this method is a mapping from the paynlsdk.client.transaction.Transaction.get_banks() method,
         that returns the internal List object of banks.
+        :param use_cache: whether to use the cached list of banks (if available)
+        :type use_cache: bool
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: List of banks
         :rtype: List[BankDetails]
         """
-        from paynlsdk.client.transaction import Transaction
-        return Transaction.get_banks().banks
+        return Banks.get_list_response(use_cache, deadline=deadline).banks
 
     @staticmethod
-    def get_list_response():
+    def get_list_response(use_cache: bool=True, deadline: Deadline=None):
         """
         Get a get_banks :class:`paynlsdk.api.transaction.getbanks.Response` instance
 
         Please note this method is a mapping from the paynlsdk.client.transaction.Transaction.get_banks() method,
         that returns the internal List object of banks.
+        :param use_cache: whether to use the cached response (if available)
+        :type use_cache: bool
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: Response object
         :rtype: paynlsdk.api.transaction.getbanks.Response
         """
-        from paynlsdk.client.transaction import Transaction
-        return Transaction.get_banks_response()
+        if use_cache:
+            return Banks.cache.get(deadline=deadline)
+        return Banks.cache.refresh(deadline=deadline)
 
+    @staticmethod
+    def invalidate():
+        """
+        Clear the cached list of banks, so the next call fetches it from the API
+        """
+        Banks.cache.invalidate()
@@ -1,29 +1,79 @@
 from typing import List, Dict
 
-from paynlsdk.api.client import APIClient
+from paynlsdk.api.cache import TTLCache
+from paynlsdk.api.client import APIAuthentication
+from paynlsdk.api.deadline import Deadline
+from paynlsdk.client.serviceconfig import ServiceConfig
 from paynlsdk.objects import ServicePaymentProfile
 
 
+def _load_service_config(key, deadline: Deadline) -> ServiceConfig:
+    from paynlsdk.client.transaction import Transaction
+    return ServiceConfig(Transaction.get_service_payment_options_response(deadline=deadline))
+
+
 class PaymentMethods(object):
+    """
+    Payment methods utility class
+
+    The service configuration (payment profiles and options) is loaded once and cached as an indexed
+    :class:`paynlsdk.client.serviceconfig.ServiceConfig`. It is fresh for an hour by default and refreshed in the
+    background after that. The configuration is cached per service ID and token code, so switching the
+    :class:`paynlsdk.api.client.APIAuthentication` credentials never serves another service's configuration.
+    Configure the cache using e.g. ``PaymentMethods.cache.ttl = 600`` and clear it using
+    :meth:`PaymentMethods.invalidate`
+
+    :cvar TTLCache cache: cache holding the service configuration
+    """
+    cache = TTLCache(_load_service_config, ttl=3600.0, stale_ttl=86400.0, namespace='serviceconfig')
+
     @staticmethod
-    def get_list(payment_method_id: int=None) -> Dict[int, ServicePaymentProfile]:
+    def get_list(payment_method_id: int=None, use_cache: bool=True,
+                 deadline: Deadline=None) -> Dict[int, ServicePaymentProfile]:
         """
         Gets the list of payment methods.
 
         :param payment_method_id: payment method ID (defaults to 10, or iDeal)
         :type payment_method_id: int
+        :param use_cache: whether to use the cached service configuration (if available)
+        :type use_cache: bool
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: List of banks
         :rtype: List[ServicePaymentProfile]
         """
-        from paynlsdk.api.transaction.getservicepaymentoptions import Request
-        client = APIClient()
-        request = Request()
-        client.perform_request(request)
-        profiles = request.response.payment_profiles
+        config = PaymentMethods.get_service_config(use_cache, deadline=deadline)
         if payment_method_id is None:
-            return profiles
-        elif payment_method_id in profiles:
-            return {payment_method_id: profiles[payment_method_id]}
+            return config.payment_profiles
+        profile = config.get_payment_profile(payment_method_id)
+        if profile is not None:
+            return {payment_method_id: profile}
         raise KeyError('Payment methos ID "{}" is not found in the result dictionary'.format(payment_method_id))
 
+    @staticmethod
+    def get_service_config(use_cache: bool=True, deadline: Deadline=None) -> ServiceConfig:
+        """
+        Get the indexed service configuration
+
+        :param use_cache: whether to use the cached service configuration (if available)
+        :type use_cache: bool
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: service configuration
+        :rtype: paynlsdk.client.serviceconfig.ServiceConfig
+        """
+        key = PaymentMethods._get_cache_key()
+        if use_cache:
+            return PaymentMethods.cache.get(key, deadline=deadline)
+        return PaymentMethods.cache.refresh(key, deadline=deadline)
 
+    @staticmethod
+    def invalidate():
+        """
+        Clear the cached service configurations (of all services), so the next call fetches them from the API
+        """
+        PaymentMethods.cache.clear()
+
+    @staticmethod
+    def _get_cache_key() -> str:
+        return '{}:{}'.format(APIAuthentication.service_id, APIAuthentication.token_code)
@@ -0,0 +1,259 @@
+import ipaddress
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable
+
+
+class PrefixIndex(object):
+    """
+    Index of IP networks answering "is this address in any of the networks" in constant time
+
+    Networks are stored per IP version and prefix length as the set of their network prefixes (the address shifted
+    right by the number of host bits). A lookup checks one set per distinct prefix length, which is a handful at most.
+    """
+    def __init__(self, networks: Iterable=()):
+        self._prefixes = {4: {}, 6: {}}
+        self._networks = set()
+        for network in networks:
+            self.add(network)
+
+    def __len__(self):
+        return len(self._networks)
+
+    def __iter__(self):
+        return iter(sorted(self._networks, key=lambda network: (network.version, network)))
+
+    def add(self, network):
+        """
+        Add a network
+
+        :param network: network in CIDR notation (e.g. 192.0.2.0/24) or a single address
+        :type network: str|ipaddress.IPv4Network|ipaddress.IPv6Network
+        """
+        network = ipaddress.ip_network(network, strict=False)
+        host_bits = network.max_prefixlen - network.prefixlen
+        self._prefixes[network.version].setdefault(network.prefixlen, set()).add(
+            int(network.network_address) >> host_bits)
+        self._networks.add(network)
+
+    def remove(self, network):
+        """
+        Remove a network
+
+        :param network: network in CIDR notation (e.g. 192.0.2.0/24) or a single address
+        :type network: str|ipaddress.IPv4Network|ipaddress.IPv6Network
+        """
+        network = ipaddress.ip_network(network, strict=False)
+        if network not in self._networks:
+            return
+        prefixes = self._prefixes[network.version][network.prefixlen]
+        prefixes.discard(int(network.network_address) >> (network.max_prefixlen - network.prefixlen))
+        if not prefixes:
+            del self._prefixes[network.version][network.prefixlen]
+        self._networks.discard(network)
+
+    def contains(self, address) -> bool:
+        """
+        Check if an address is in any of the networks
+
+        :param address: IP address
+        :type address: ipaddress.IPv4Address|ipaddress.IPv6Address
+        :return: True if the address is in one of the networks
+        :rtype: bool
+        """
+        value = int(address)
+        max_prefixlen = address.max_prefixlen
+        for prefixlen, prefixes in self._prefixes[address.version].items():
+            if value >> (max_prefixlen - prefixlen) in prefixes:
+                return True
+        return False
+
+
+class PayServerIpValidator(object):
+    """
+    Local validator for Pay.nl server IP addresses
+
+    Addresses are validated, in order, using:
+
+    1. a cache of earlier verdicts per address (positive verdicts are kept ``verdict_ttl`` seconds, negative ones
+       ``negative_ttl`` seconds);
+    2. an index of known Pay.nl networks. The SDK does not ship with any networks, seed them using
+       :meth:`add_networks`;
+    3. the live ``Validate::isPayServerIp`` API call (through ``checker``), of which the verdict is cached.
+
+    Every ``verify_interval`` seconds the networks in the index are verified in a background thread by validating
+    their first host address through the API; networks the API no longer recognises are removed from the index.
+
+    :param checker: callable validating an address through the API: ``checker(ip_address, deadline) -> bool``
+    :type checker: callable
+    :param networks: known Pay.nl networks to seed the index with
+    :type networks: Iterable[str]
+    :param float verdict_ttl: number of seconds a positive verdict is cached
+    :param float negative_ttl: number of seconds a negative verdict is cached
+    :param int max_verdicts: maximum number of cached verdicts (the least recently used ones are dropped)
+    :param float verify_interval: number of seconds between verifications of the networks. Use None to never verify
+    """
+    def __init__(self,
+                 checker,
+                 networks: Iterable[str]=(),
+                 verdict_ttl: float=3600.0,
+                 negative_ttl: float=300.0,
+                 max_verdicts: int=10000,
+                 verify_interval: float=86400.0
+                 ):
+        self.checker = checker
+        self.verdict_ttl = verdict_ttl
+        self.negative_ttl = negative_ttl
+        self.max_verdicts = max_verdicts
+        self.verify_interval = verify_interval
+        self.index = PrefixIndex(networks)
+        self._verdicts = OrderedDict()
+        self._lock = threading.Lock()
+        self._verified_at = time.monotonic()
+        self._verifying = False
+
+    def add_networks(self, networks: Iterable[str], verify: bool=False, deadline=None):
+        """
+        Add known Pay.nl networks to the index
+
+        :param networks: networks in CIDR notation (e.g. 192.0.2.0/24)
+        :type networks: Iterable[str]
+        :param verify: whether to validate the first host address of every network through the API before adding it
+        :type verify: bool
+        :param deadline: deadline the verification must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: the networks that were added
+        :rtype: List[ipaddress.IPv4Network|ipaddress.IPv6Network]
+        """
+        added = []
+        for network in networks:
+            network = ipaddress.ip_network(network, strict=False)
+            if verify and not self.checker(self._get_host(network), deadline):
+                continue
+            with self._lock:
+                self.index.add(network)
+            added.append(network)
+        return added
+
+    def lookup(self, ip_address: str):
+        """
+        Validate an address without calling the API
+
+        :param ip_address: IP address
+        :type ip_address: str
+        :return: True or False if a verdict is known, None if the API needs to be called. False if the address is not
+                 an IP address at all
+        :rtype: bool
+        """
+        try:
+            address = ipaddress.ip_address(ip_address.strip())
+        except ValueError:
+            return False
+        self._maybe_verify()
+        now = time.monotonic()
+        with self._lock:
+            verdict = self._verdicts.get(address)
+            if verdict is not None:
+                if verdict[1] > now:
+                    self._verdicts.move_to_end(address)
+                    return verdict[0]
+                del self._verdicts[address]
+            if self.index.contains(address):
+                return True
+        return None
+
+    def record(self, ip_address: str, verdict: bool):
+        """
+        Cache the verdict of the API for an address
+
+        Verdicts for input that is not an IP address are not cached.
+
+        :param ip_address: IP address
+        :type ip_address: str
+        :param verdict: True if the address is a Pay.nl server address
+        :type verdict: bool
+        """
+        try:
+            address = ipaddress.ip_address(ip_address.strip())
+        except ValueError:
+            return
+        expires_at = time.monotonic() + (self.verdict_ttl if verdict else self.negative_ttl)
+        with self._lock:
+            self._verdicts[address] = (bool(verdict), expires_at)
+            self._verdicts.move_to_end(address)
+            while len(self._verdicts) > self.max_verdicts:
+                self._verdicts.popitem(last=False)
+
+    def is_pay_server_ip(self, ip_address: str, deadline=None) -> bool:
+        """
+        Validate an address, calling the API only if the verdict is not known locally
+
+        :param ip_address: IP address
+        :type ip_address: str
+        :param deadline: deadline the API call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: True if the address is a Pay.nl server address
+        :rtype: bool
+        """
+        verdict = self.lookup(ip_address)
+        if verdict is None:
+            verdict = bool(self.checker(ip_address.strip(), deadline))
+            self.record(ip_address, verdict)
+        return verdict
+
+    def invalidate(self, ip_address: str=None):
+        """
+        Forget the cached verdict for an address (or for all addresses)
+
+        :param ip_address: IP address. Use None to forget all verdicts
+        :type ip_address: str
+        """
+        with self._lock:
+            if ip_address is None:
+                self._verdicts.clear()
+            else:
+                self._verdicts.pop(ipaddress.ip_address(ip_address.strip()), None)
+
+    def verify(self, deadline=None):
+        """
+        Verify the networks in the index through the API, removing those the API no longer recognises
+
+        :param deadline: deadline the verification must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: the networks that were removed
+        :rtype: List[ipaddress.IPv4Network|ipaddress.IPv6Network]
+        """
+        with self._lock:
+            networks = list(self.index)
+        removed = []
+        for network in networks:
+            if not self.checker(self._get_host(network), deadline):
+                with self._lock:
+                    self.index.remove(network)
+                removed.append(network)
+        self._verified_at = time.monotonic()
+        return removed
+
+    @staticmethod
+    def _get_host(network) -> str:
+        # The network address itself (x.x.x.0) is not a server, so verify the first host of the network
+        return str(next(iter(network.hosts()), network.network_address))
+
+    def _maybe_verify(self):
+        if self.verify_interval is None or time.monotonic() - self._verified_at < self.verify_interval:
+            return
+        with self._lock:
+            if self._verifying or not len(self.index):
+                return
+            self._verifying = True
+        threading.Thread(target=self._background_verify, daemon=True).start()
+
+    def _background_verify(self):
+        try:
+            self.verify()
+        except Exception:
+            # Keep the current networks, try again after the next interval
+            self._verified_at = time.monotonic()
+        finally:
+            self._verifying = False
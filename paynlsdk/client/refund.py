@@ -13,7 +13,7 @@ class Refund(object):
         :rtype: paynlsdk.api.refund.info.Response
         """
         from paynlsdk.api.refund.info import Request
-        client = APIClient()
+        client = APIClient.get_default()
         request = Request(refund_id)
         client.perform_request(request)
         return request.response
@@ -48,7 +48,7 @@ class Refund(object):
         :rtype: paynlsdk.api.refund.transaction.Response
         """
         from paynlsdk.api.refund.transaction import Request
-        client = APIClient()
+        client = APIClient.get_default()
         request = Request(transaction_id, amount, description, process_date, products, vat_percentage, exchange_url)
         client.perform_request(request)
         return request.response
@@ -0,0 +1,108 @@
+from bisect import bisect_right
+from typing import Dict, List
+
+from paynlsdk.objects import PaymentOption, PaymentSubOption, ServicePaymentProfile
+
+
+class ServiceConfig(object):
+    """
+    Indexed service configuration, built once from a getservicepaymentoptions response
+
+    .. seealso::
+        :class:`paynlsdk.api.transaction.getservicepaymentoptions.Response` for the source of the configuration
+
+        :class:`paynlsdk.client.paymentmethods.PaymentMethods` for the cached instance
+
+    :param response: getservicepaymentoptions response
+    :type response: paynlsdk.api.transaction.getservicepaymentoptions.Response
+    """
+    def __init__(self, response):
+        self.response = response
+        self.merchant = response.merchant
+        self.service = response.service
+        self.settings = response.settings
+        self.payment_profiles: Dict[int, ServicePaymentProfile] = response.payment_profiles or {}
+        self.payment_options: Dict[int, PaymentOption] = response.payment_options or {}
+        self.country_options = response.country_options or {}
+
+        self._options_by_country: Dict[str, Dict[int, PaymentOption]] = {}
+        self._sub_options_by_option: Dict[int, Dict[int, PaymentSubOption]] = {}
+        for option in self.payment_options.values():
+            self._sub_options_by_option[option.id] = option.payment_sub_options or {}
+        for country_id, country_option in self.country_options.items():
+            options = country_option.payment_option_list or {}
+            self._options_by_country[country_id] = options
+            for option in options.values():
+                if option.payment_sub_options:
+                    self._sub_options_by_option.setdefault(option.id, option.payment_sub_options)
+        self._amount_index = {country_id: self._build_amount_index(options)
+                              for country_id, options in self._options_by_country.items()}
+
+    @staticmethod
+    def _build_amount_index(options: Dict[int, PaymentOption]) -> tuple:
+        # Split the amount axis in intervals in which the set of allowed options does not change.
+        # Interval i starts at points[i] (the first interval starts at minus infinity)
+        points = sorted({option.min_amount for option in options.values() if option.min_amount is not None} |
+                        {option.max_amount + 1 for option in options.values() if option.max_amount is not None})
+        starts = [None] + points
+        allowed = []
+        for start in starts:
+            allowed.append([option for option in options.values()
+                            if (option.min_amount is None or (start is not None and start >= option.min_amount))
+                            and (option.max_amount is None or start is None or start <= option.max_amount)])
+        return points, allowed
+
+    def get_payment_profile(self, payment_profile_id: int) -> ServicePaymentProfile:
+        """
+        Get a payment profile by ID
+
+        :param payment_profile_id: payment profile (payment method) ID
+        :type payment_profile_id: int
+        :return: payment profile, or None if the service has no such profile
+        :rtype: ServicePaymentProfile
+        """
+        return self.payment_profiles.get(payment_profile_id)
+
+    def get_payment_options(self, country_id: str) -> Dict[int, PaymentOption]:
+        """
+        Get the payment options for a country
+
+        :param country_id: country ID (ISO code) as used by the API (e.g. NL)
+        :type country_id: str
+        :return: payment options by ID (empty if there are none for the country)
+        :rtype: Dict[int, PaymentOption]
+        """
+        return self._options_by_country.get(country_id, {})
+
+    def get_payment_sub_options(self, payment_option_id: int) -> Dict[int, PaymentSubOption]:
+        """
+        Get the sub options (e.g. iDEAL banks) of a payment option
+
+        :param payment_option_id: payment option ID
+        :type payment_option_id: int
+        :return: payment sub options by ID (empty if the option has none)
+        :rtype: Dict[int, PaymentSubOption]
+        """
+        return self._sub_options_by_option.get(payment_option_id, {})
+
+    def get_allowed_payment_options(self, country_id: str, amount: int) -> List[PaymentOption]:
+        """
+        Get the payment options that can be used for a country and amount
+
+        Options for which the API did not supply a minimum and/or maximum amount are allowed for any amount.
+
+        :param country_id: country ID (ISO code) as used by the API (e.g. NL)
+        :type country_id: str
+        :param amount: transaction amount in cents
+        :type amount: int
+        :return: allowed payment options
+        :rtype: List[PaymentOption]
+        """
+        index = self._amount_index.get(country_id)
+        if index is None:
+            return []
+        points, allowed = index
+        return allowed[bisect_right(points, amount)]
+
+    def __repr__(self):
+        return str(self.__dict__)
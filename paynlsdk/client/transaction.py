@@ -1,14 +1,25 @@
 from datetime import datetime
 
 from paynlsdk.api.client import APIClient
-from paynlsdk.objects import TransactionData, TransactionStartStatsData, SalesData, TransactionEndUser, BankDetails
+from paynlsdk.api.deadline import Deadline
+from paynlsdk.client.transactioncache import TransactionCache
+from paynlsdk.objects import TransactionData, TransactionStartStatsData, SalesData, TransactionEndUser, BankDetails, \
+    OrderData
 
 from typing import List
 
 
 class Transaction(object):
+    """
+    Transaction utility class
+
+    :cvar TransactionCache response_cache: opt-in cache for info and status responses
+                                           (e.g. ``Transaction.response_cache = TransactionCache()``). None to disable
+    """
+    response_cache: TransactionCache = None
+
     @staticmethod
-    def approve(order_id: str, entrance_code: str=None):
+    def approve(order_id: str, entrance_code: str=None, deadline: Deadline=None):
         """
         Approve a transaction
 
@@ -16,14 +27,16 @@ class Transaction(object):
         :type order_id: str
         :param entrance_code: entrance code
         :type entrance_code: str
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: Result of the approval
         :rtype:  bool
         """
-        response = Transaction.approve_response(order_id, entrance_code)
+        response = Transaction.approve_response(order_id, entrance_code, deadline=deadline)
         return response.result
 
     @staticmethod
-    def decline(order_id: str, entrance_code: str=None):
+    def decline(order_id: str, entrance_code: str=None, deadline: Deadline=None):
         """
         Decline a transaction
 
@@ -31,14 +44,16 @@ class Transaction(object):
         :type order_id: str
         :param entrance_code: entrance code
         :type entrance_code: str
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: Result of the decline
         :rtype:  bool
         """
-        response = Transaction.decline_response(order_id, entrance_code)
+        response = Transaction.decline_response(order_id, entrance_code, deadline=deadline)
         return response.result
 
     @staticmethod
-    def capture(transaction_id: str, products: dict={}, tracktrace: str=None):
+    def capture(transaction_id: str, products: dict={}, tracktrace: str=None, deadline: Deadline=None):
         """
         Capture a transaction
 
@@ -49,53 +64,61 @@ class Transaction(object):
         :param tracktrace: track and trace code
                 Some payment methods require proof of shipment. Provide the Track&Trace code if available/applicable
         :type tracktrace: str
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: Result of the capture
         :rtype:  bool
         """
-        response = Transaction.capture_response(transaction_id, products, tracktrace)
+        response = Transaction.capture_response(transaction_id, products, tracktrace, deadline=deadline)
         return response.result
 
     @staticmethod
-    def void(transaction_id: str):
+    def void(transaction_id: str, deadline: Deadline=None):
         """
         Decline a transaction
 
         :param transaction_id: transaction ID
         :type transaction_id: str
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: Result of the decline
         :rtype:  bool
         """
-        response = Transaction.void_response(transaction_id)
+        response = Transaction.void_response(transaction_id, deadline=deadline)
         return response.result
 
     @staticmethod
-    def get_banks() -> List[BankDetails]:
+    def get_banks(deadline: Deadline=None) -> List[BankDetails]:
         """
         Gets the list of banks.
 
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: List of banks
         :rtype: List[BankDetails]
         """
         from paynlsdk.api.transaction.getbanks import Request
-        client = APIClient()
+        client = APIClient.get_default()
         request = Request()
-        client.perform_request(request)
+        client.perform_request(request, deadline=deadline)
         return request.response.banks
 
     @staticmethod
-    def get_service(payment_method_id: int):
+    def get_service(payment_method_id: int, deadline: Deadline=None):
         """
         Get a transaction getservice :class:`paynlsdk.api.transaction.getservice.Response` instance
 
         Please note this is a mapping to the :meth:`Transaction.get_service_response` method and is here for consistency
 
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: Transaction getservice response instance
         :rtype: paynlsdk.api.transaction.getservice.Response
         """
-        return Transaction.get_service_response(payment_method_id)
+        return Transaction.get_service_response(payment_method_id, deadline=deadline)
 
     @staticmethod
-    def get_service_payment_options(payment_method_id: int=None):
+    def get_service_payment_options(payment_method_id: int=None, deadline: Deadline=None):
         """
         Get a transaction getservicepaymentoptions :class:`paynlsdk.api.transaction.getservicepaymentoptions.Response` instance
 
@@ -103,13 +126,16 @@ class Transaction(object):
 
         :param payment_method_id: payment method ID
         :type payment_method_id: int
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: Transaction getservicepaymentoptions response instance
         :rtype: paynlsdk.api.transaction.getservicepaymentoptions.Response
         """
-        return Transaction.get_service_payment_options_response(payment_method_id)
+        return Transaction.get_service_payment_options_response(payment_method_id, deadline=deadline)
 
     @staticmethod
-    def info(transaction_id: str, entrance_code: str=None):
+    def info(transaction_id: str, entrance_code: str=None, use_cache: bool=True, deadline: Deadline=None,
+             lazy: bool=False):
         """
         Get a transaction info :class:`paynlsdk.api.transaction.info.Response` instance
 
@@ -119,13 +145,20 @@ class Transaction(object):
         :type transaction_id: str
         :param entrance_code: entrance code
         :type entrance_code: str
+        :param use_cache: whether to use the :attr:`Transaction.response_cache` (if configured)
+        :type use_cache: bool
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :param lazy: whether to decode the details of the response on first access
+                     (see :class:`paynlsdk.api.transaction.info.LazyResponse`)
+        :type lazy: bool
         :return: Transaction info response instance
         :rtype: paynlsdk.api.transaction.info.Response
         """
-        return Transaction.info_response(transaction_id, entrance_code)
+        return Transaction.info_response(transaction_id, entrance_code, use_cache, deadline=deadline, lazy=lazy)
 
     @staticmethod
-    def status(transaction_id: str):
+    def status(transaction_id: str, use_cache: bool=True, deadline: Deadline=None):
         """
         Get transaction status
 
@@ -133,13 +166,18 @@ class Transaction(object):
 
         :param transaction_id: transaction ID
         :type transaction_id: str
+        :param use_cache: whether to use the :attr:`Transaction.response_cache` (if configured)
+        :type use_cache: bool
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: transaction status
         :rtype: paynlsdk.api.transaction.status.Response
         """
-        return Transaction.status_response(transaction_id)
+        return Transaction.status_response(transaction_id, use_cache, deadline=deadline)
 
     @staticmethod
-    def refund(transaction_id: str, amount: int=None, description: str=None, process_date: datetime=None):
+    def refund(transaction_id: str, amount: int=None, description: str=None, process_date: datetime=None,
+               deadline: Deadline=None):
         """
         Refund (part of) a transaction
 
@@ -152,10 +190,12 @@ class Transaction(object):
         :param process_date: date at which refund needs to be processed
                 TODO: this *should* be a datetime
         :type process_date: str
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: refund result
         :rtype: paynlsdk.api.transaction.refund.Response
         """
-        return Transaction.refund_response(transaction_id, amount, description, process_date)
+        return Transaction.refund_response(transaction_id, amount, description, process_date, deadline=deadline)
 
     @staticmethod
     def start(amount: str,
@@ -169,7 +209,8 @@ class Transaction(object):
               sale_data: SalesData=None,
               test_mode: bool=False,
               transfer_type: str=None,
-              transfer_value: str=None
+              transfer_value: str=None,
+              deadline: Deadline=None
               ):
         """
         Get a transaction start :class:`paynlsdk.api.transaction.start.Response` instance
@@ -201,11 +242,14 @@ class Transaction(object):
         :type transfer_type: str
         :param transfer_value: Merchant ID (M-xxxx-xxxx) or order ID
         :type transfer_value: str
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: Transaction start response instance
         :rtype: paynlsdk.api.transaction.start.Response
         """
         return Transaction.start_response(amount, ip_address, finish_url, payment_option_id, payment_option_sub_id,
-                          transaction, stats_data, end_user, sale_data, test_mode, transfer_type, transfer_value)
+                          transaction, stats_data, end_user, sale_data, test_mode, transfer_type, transfer_value,
+                          deadline=deadline)
 
     @staticmethod
     def approve_request():
@@ -318,7 +362,7 @@ class Transaction(object):
         return Request()
 
     @staticmethod
-    def approve_response(order_id: str, entrance_code: str=None):
+    def approve_response(order_id: str, entrance_code: str=None, deadline: Deadline=None):
         """
         Get a transaction approve :class:`paynlsdk.api.transaction.approve.Response` instance
 
@@ -328,17 +372,19 @@ class Transaction(object):
         :type order_id: str
         :param entrance_code: entrance code
         :type entrance_code: str
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: Transaction approve response instance
         :rtype: paynlsdk.api.transaction.approve.Response
         """
         from paynlsdk.api.transaction.approve import Request
-        client = APIClient()
+        client = APIClient.get_default()
         request = Request(order_id, entrance_code)
-        client.perform_request(request)
+        client.perform_request(request, deadline=deadline)
         return request.response
 
     @staticmethod
-    def decline_response(order_id: str, entrance_code: str=None):
+    def decline_response(order_id: str, entrance_code: str=None, deadline: Deadline=None):
         """
         Get a transaction decline :class:`paynlsdk.api.transaction.decline.Response` instance
 
@@ -348,17 +394,19 @@ class Transaction(object):
         :type order_id: str
         :param entrance_code: entrance code
         :type entrance_code: str
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: Transaction decline response instance
         :rtype: paynlsdk.api.transaction.decline.Response
         """
         from paynlsdk.api.transaction.decline import Request
-        client = APIClient()
+        client = APIClient.get_default()
         request = Request(order_id, entrance_code)
-        client.perform_request(request)
+        client.perform_request(request, deadline=deadline)
         return request.response
 
     @staticmethod
-    def capture_response(transaction_id: str, products: dict={}, tracktrace: str=None):
+    def capture_response(transaction_id: str, products: dict={}, tracktrace: str=None, deadline: Deadline=None):
         """
         Get a transaction void :class:`paynlsdk.api.transaction.capture.Response` instance
 
@@ -371,17 +419,19 @@ class Transaction(object):
         :param tracktrace: track and trace code
                 Some payment methods require proof of shipment. Provide the Track&Trace code if available/applicable
         :type tracktrace: str
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: Transaction capture response instance
         :rtype: paynlsdk.api.transaction.capture.Response
         """
         from paynlsdk.api.transaction.capture import Request
-        client = APIClient()
+        client = APIClient.get_default()
         request = Request(transaction_id, products, tracktrace)
-        client.perform_request(request)
+        client.perform_request(request, deadline=deadline)
         return request.response
 
     @staticmethod
-    def void_response(transaction_id: str):
+    def void_response(transaction_id: str, deadline: Deadline=None):
         """
         Get a transaction void :class:`paynlsdk.api.transaction.voidauthorization.Response` instance
 
@@ -389,49 +439,55 @@ class Transaction(object):
 
         :param transaction_id: transaction ID
         :type transaction_id: str
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: Transaction void response instance
         :rtype: paynlsdk.api.transaction.voidauthorization.Response
         """
         from paynlsdk.api.transaction.voidauthorization import Request
-        client = APIClient()
+        client = APIClient.get_default()
         request = Request(transaction_id)
-        client.perform_request(request)
+        client.perform_request(request, deadline=deadline)
         return request.response
 
     @staticmethod
-    def get_banks_response():
+    def get_banks_response(deadline: Deadline=None):
         """
         Get a transaction getbanks :class:`paynlsdk.api.transaction.getbanks.Response` instance
 
         Please note this will immediately call the API, returning the response instance
 
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: Transaction getbanks response instance
         :rtype: paynlsdk.api.transaction.getbanks.Response
         """
         from paynlsdk.api.transaction.getbanks import Request
-        client = APIClient()
+        client = APIClient.get_default()
         request = Request()
-        client.perform_request(request)
+        client.perform_request(request, deadline=deadline)
         return request.response
 
     @staticmethod
-    def get_service_response(payment_method_id: int):
+    def get_service_response(payment_method_id: int, deadline: Deadline=None):
         """
         Get a transaction getservice :class:`paynlsdk.api.transaction.getservice.Response` instance
 
         Please note this will immediately call the API, returning the response instance
 
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: Transaction getservice response instance
         :rtype: paynlsdk.api.transaction.getservice.Response
         """
         from paynlsdk.api.transaction.getservice import Request
-        client = APIClient()
+        client = APIClient.get_default()
         request = Request(payment_method_id)
-        client.perform_request(request)
+        client.perform_request(request, deadline=deadline)
         return request.response
 
     @staticmethod
-    def get_service_payment_options_response(payment_method_id: int=None):
+    def get_service_payment_options_response(payment_method_id: int=None, deadline: Deadline=None):
         """
         Get a transaction getservicepaymentoptions :class:`paynlsdk.api.transaction.getservicepaymentoptions.Response` instance
 
@@ -439,17 +495,20 @@ class Transaction(object):
 
         :param payment_method_id: payment method ID
         :type payment_method_id: int
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: Transaction getservicepaymentoptions response instance
         :rtype: paynlsdk.api.transaction.getservicepaymentoptions.Response
         """
         from paynlsdk.api.transaction.getservicepaymentoptions import Request
-        client = APIClient()
+        client = APIClient.get_default()
         request = Request(payment_method_id)
-        client.perform_request(request)
+        client.perform_request(request, deadline=deadline)
         return request.response
 
     @staticmethod
-    def info_response(transaction_id: str, entrance_code: str=None):
+    def info_response(transaction_id: str, entrance_code: str=None, use_cache: bool=True,
+                      deadline: Deadline=None, lazy: bool=False):
         """
         Get a transaction info :class:`paynlsdk.api.transaction.info.Response` instance
 
@@ -459,17 +518,31 @@ class Transaction(object):
         :type transaction_id: str
         :param entrance_code: entrance code
         :type entrance_code: str
+        :param use_cache: whether to use the :attr:`Transaction.response_cache` (if configured)
+        :type use_cache: bool
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :param lazy: whether to decode the details of the response on first access
+                     (see :class:`paynlsdk.api.transaction.info.LazyResponse`)
+        :type lazy: bool
         :return: Transaction info response instance
         :rtype: paynlsdk.api.transaction.info.Response
         """
+        cache = Transaction.response_cache
+        if use_cache and cache is not None:
+            response = cache.get('info', transaction_id, entrance_code)
+            if response is not None:
+                return response
         from paynlsdk.api.transaction.info import Request
-        client = APIClient()
-        request = Request(transaction_id, entrance_code)
-        client.perform_request(request)
+        client = APIClient.get_default()
+        request = Request(transaction_id, entrance_code, lazy)
+        client.perform_request(request, deadline=deadline)
+        if cache is not None:
+            cache.set('info', transaction_id, request.response, entrance_code)
         return request.response
 
     @staticmethod
-    def status_response(transaction_id: str):
+    def status_response(transaction_id: str, use_cache: bool=True, deadline: Deadline=None):
         """
         Get a transaction status :class:`paynlsdk.api.transaction.status.Response` instance
 
@@ -477,17 +550,29 @@ class Transaction(object):
 
         :param transaction_id: transaction ID
         :type transaction_id: str
+        :param use_cache: whether to use the :attr:`Transaction.response_cache` (if configured)
+        :type use_cache: bool
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: Transaction status response instance
         :rtype: paynlsdk.api.transaction.status.Response
         """
+        cache = Transaction.response_cache
+        if use_cache and cache is not None:
+            response = cache.get('status', transaction_id)
+            if response is not None:
+                return response
         from paynlsdk.api.transaction.status import Request
-        client = APIClient()
+        client = APIClient.get_default()
         request = Request(transaction_id)
-        client.perform_request(request)
+        client.perform_request(request, deadline=deadline)
+        if cache is not None:
+            cache.set('status', transaction_id, request.response)
         return request.response
 
     @staticmethod
-    def refund_response(transaction_id: str, amount: int=None, description: str=None, process_date: datetime=None):
+    def refund_response(transaction_id: str, amount: int=None, description: str=None, process_date: datetime=None,
+                        deadline: Deadline=None):
         """
         Get a transaction refund :class:`paynlsdk.api.transaction.refund.Response` instance
 
@@ -502,13 +587,15 @@ class Transaction(object):
         :param process_date: date at which refund needs to be processed
                 TODO: this *should* be a datetime
         :type process_date: str
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: transaction status
         :rtype: paynlsdk.api.transaction.refund.Response
         """
         from paynlsdk.api.transaction.refund import Request
-        client = APIClient()
+        client = APIClient.get_default()
         request = Request(transaction_id, amount, description, process_date)
-        client.perform_request(request)
+        client.perform_request(request, deadline=deadline)
         return request.response
 
     @staticmethod
@@ -523,7 +610,8 @@ class Transaction(object):
               sale_data: SalesData=None,
               test_mode: bool=False,
               transfer_type: str=None,
-              transfer_value: str=None
+              transfer_value: str=None,
+              deadline: Deadline=None
               ):
         """
         Get a transaction start :class:`paynlsdk.api.transaction.start.Response` instance
@@ -555,12 +643,58 @@ class Transaction(object):
         :type transfer_type: str
         :param transfer_value: Merchant ID (M-xxxx-xxxx) or order ID
         :type transfer_value: str
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: Transaction start response instance
         :rtype: paynlsdk.api.transaction.start.Response
         """
         from paynlsdk.api.transaction.start import Request
-        client = APIClient()
+        client = APIClient.get_default()
         request = Request(amount, ip_address, finish_url, payment_option_id, payment_option_sub_id,
                           transaction, stats_data, end_user, sale_data, test_mode, transfer_type, transfer_value)
-        client.perform_request(request)
+        client.perform_request(request, deadline=deadline)
+        return request.response
+
+    @staticmethod
+    def start_from_template(template,
+                            amount: int,
+                            ip_address: str,
+                            order_number: str=None,
+                            order_data: List[OrderData]=None,
+                            transaction: TransactionData=None,
+                            end_user: TransactionEndUser=None,
+                            sale_data: SalesData=None,
+                            deadline: Deadline=None
+                            ):
+        """
+        Get a transaction start :class:`paynlsdk.api.transaction.start.Response` instance for a transaction created
+        from a :class:`paynlsdk.api.transaction.start.StartTemplate`
+
+        Please note this will immediately call the API, returning the response instance
+
+        :param template: template holding the parameters shared by the transactions
+        :type template: paynlsdk.api.transaction.start.StartTemplate
+        :param amount: total order amount(cents)
+        :type amount: int
+        :param ip_address: IP address
+        :type ip_address: str
+        :param order_number: order number
+        :type order_number: str
+        :param order_data: order lines
+        :type order_data: List[OrderData]
+        :param transaction: transaction data details, overriding those of the template
+        :type transaction: TransactionData
+        :param end_user: end user details, overriding those of the template
+        :type end_user: TransactionEndUser
+        :param sale_data: sales details (instead of order_data)
+        :type sale_data: SalesData
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: Transaction start response instance
+        :rtype: paynlsdk.api.transaction.start.Response
+        """
+        client = APIClient.get_default()
+        request = template.create_request(amount, ip_address, order_number, order_data, transaction, end_user,
+                                          sale_data)
+        client.perform_request(request, deadline=deadline)
         return request.response
@@ -0,0 +1,124 @@
+import time
+
+from paynlsdk.api.cachebackend import CacheBackend, MemoryCacheBackend
+from paynlsdk.enums.enums import PaymentStatus
+
+
+class TransactionCache(object):
+    """
+    State aware cache for Transaction::info and Transaction::status responses, keyed by transaction ID
+
+    Responses of transactions in a final state (see ``final_states``) are kept until they are dropped to make room
+    (least recently used first). Responses of transactions in any other state are kept for ``ttl`` seconds only.
+    Call :meth:`invalidate` when an exchange (webhook) call arrives for a transaction, so its next lookup fetches the
+    new state from the API (e.g. when a paid transaction gets refunded).
+
+    :param int max_size: maximum number of transactions to keep
+    :param float ttl: number of seconds to keep responses of transactions that are not in a final state.
+                      Use 0 to not cache these at all
+    :param tuple final_states: payment states (see :class:`paynlsdk.enums.enums.PaymentStatus`) considered final
+    :param CacheBackend backend: backend keeping the responses. Defaults to a (private)
+                                 :class:`paynlsdk.api.cachebackend.MemoryCacheBackend` holding ``max_size`` transactions
+    """
+    NAMESPACE = 'transaction:'
+
+    def __init__(self,
+                 max_size: int=10000,
+                 ttl: float=5.0,
+                 final_states: tuple=(PaymentStatus.PAID.value, PaymentStatus.CANCEL.value,
+                                      PaymentStatus.EXPIRED.value, PaymentStatus.REFUND.value),
+                 backend: CacheBackend=None
+                 ):
+        self.ttl = ttl
+        self.final_states = frozenset(final_states)
+        self.backend = backend if backend is not None else MemoryCacheBackend(max_size)
+
+    def _get_entries(self, transaction_id: str) -> dict:
+        stored = self.backend.get(self.NAMESPACE + transaction_id)
+        return stored[0] if stored is not None else None
+
+    def get(self, kind: str, transaction_id: str, entrance_code: str=None):
+        """
+        Get a cached response
+
+        :param kind: kind of response (info or status)
+        :type kind: str
+        :param transaction_id: transaction ID
+        :type transaction_id: str
+        :param entrance_code: entrance code (info only)
+        :type entrance_code: str
+        :return: the cached response, or None
+        :rtype: paynlsdk.api.transaction.info.Response|paynlsdk.api.transaction.status.Response
+        """
+        entries = self._get_entries(transaction_id)
+        if entries is None:
+            return None
+        entry = entries.get((kind, entrance_code))
+        if entry is None:
+            return None
+        response, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            return None
+        return response
+
+    def set(self, kind: str, transaction_id: str, response, entrance_code: str=None):
+        """
+        Cache a response, depending on the state of the transaction
+
+        :param kind: kind of response (info or status)
+        :type kind: str
+        :param transaction_id: transaction ID
+        :type transaction_id: str
+        :param response: the response
+        :type response: paynlsdk.api.transaction.info.Response|paynlsdk.api.transaction.status.Response
+        :param entrance_code: entrance code (info only)
+        :type entrance_code: str
+        """
+        now = time.time()
+        if self.is_final(response):
+            expires_at = None
+        elif self.ttl:
+            expires_at = now + self.ttl
+        else:
+            return
+        # All responses of a transaction are kept together, so they are invalidated together. Every response keeps
+        # its own expiry, so caching a non final response never shortens the retention of final ones.
+        # A response in a final state makes earlier, non final responses obsolete
+        entries = {key: (cached, cached_expires_at)
+                   for key, (cached, cached_expires_at) in (self._get_entries(transaction_id) or {}).items()
+                   if cached_expires_at is None or (expires_at is not None and cached_expires_at > now)}
+        entries[(kind, entrance_code)] = (response, expires_at)
+        ttl = None if any(entry[1] is None for entry in entries.values()) else self.ttl
+        self.backend.set(self.NAMESPACE + transaction_id, entries, ttl)
+
+    def is_final(self, response) -> bool:
+        """
+        Check if the transaction of a response is in a final state
+
+        :param response: the response, or its plain dict in lite mode
+        :type response: paynlsdk.api.transaction.info.Response|paynlsdk.api.transaction.status.Response|dict
+        :return: True if the transaction will not change state anymore
+        :rtype: bool
+        """
+        if isinstance(response, dict):
+            payment_details = response.get('payment_details')
+            state = payment_details.get('state') if payment_details is not None else None
+        else:
+            payment_details = getattr(response, 'payment_details', None)
+            state = payment_details.state if payment_details is not None else None
+        return state in self.final_states
+
+    def invalidate(self, transaction_id: str):
+        """
+        Remove all cached responses of a transaction
+
+        :param transaction_id: transaction ID
+        :type transaction_id: str
+        """
+        self.backend.delete(self.NAMESPACE + transaction_id)
+
+    def clear(self):
+        """
+        Remove all cached responses
+        """
+        self.backend.clear(self.NAMESPACE)
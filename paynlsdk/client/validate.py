@@ -1,18 +1,42 @@
 from paynlsdk.api.client import APIClient
+from paynlsdk.api.deadline import Deadline
+from paynlsdk.client.payserverip import PayServerIpValidator
+
+
+def _check_pay_server_ip(ip_address: str, deadline: Deadline) -> bool:
+    return Validate.pay_server_ip_response(ip_address, deadline=deadline).result
 
 
 class Validate(object):
+    """
+    Validation utility class
+
+    Pay server IP validations are answered locally whenever possible (see
+    :class:`paynlsdk.client.payserverip.PayServerIpValidator`). Seed the known Pay.nl networks using e.g.
+    ``Validate.ip_validator.add_networks(['192.0.2.0/24'])``
+
+    :cvar PayServerIpValidator ip_validator: local Pay server IP validator
+    """
+    ip_validator = PayServerIpValidator(_check_pay_server_ip)
+
     @staticmethod
-    def pay_server_ip(ip_address: str):
+    def pay_server_ip(ip_address: str, use_cache: bool=True, deadline: Deadline=None):
         """
         Validate a Pay server IP
 
         :param ip_address: IP address
         :type ip_address: str
-        :return: Request instance
-        :rtype: paynlsdk.api.validate.payserverip.Request
+        :param use_cache: whether to use the local validator (cached verdicts and known networks) before calling the API
+        :type use_cache: bool
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
+        :return: validation result
+        :rtype: bool
         """
-        response = Validate.pay_server_ip_response(ip_address)
+        if use_cache:
+            return Validate.ip_validator.is_pay_server_ip(ip_address, deadline=deadline)
+        response = Validate.pay_server_ip_response(ip_address, deadline=deadline)
+        Validate.ip_validator.record(ip_address, response.result)
         return response.result
 
     @staticmethod
@@ -28,18 +52,19 @@ class Validate(object):
         return request
 
     @staticmethod
-    def pay_server_ip_response(ip_address: str):
+    def pay_server_ip_response(ip_address: str, deadline: Deadline=None):
         """
         Get a Pay server IP validation :class:`paynlsdk.api.validate.payserverip.Response` instance
 
         :param ip_address: IP address
         :type ip_address: str
+        :param deadline: deadline the call must finish within
+        :type deadline: paynlsdk.api.deadline.Deadline
         :return: Response instance
         :rtype: paynlsdk.api.validate.payserverip.Response
         """
         from paynlsdk.api.validate.payserverip import Request
-        client = APIClient()
+        client = APIClient.get_default()
         request = Request(ip_address)
-        client.perform_request(request)
+        client.perform_request(request, deadline=deadline)
         return request.response
-
@@ -69,3 +69,14 @@ class TransactionStatusException(Exception):
     def __init__(self, message):
         super(TransactionStatusException, self).__init__(message)
 
+
+class DeadlineExceededException(Exception):
+    def __init__(self, message):
+        super(DeadlineExceededException, self).__init__(message)
+
+
+class CircuitOpenException(Exception):
+    def __init__(self, message, circuit: str=None, retry_after: float=None):
+        self.circuit = circuit
+        self.retry_after = retry_after
+        super(CircuitOpenException, self).__init__(message)
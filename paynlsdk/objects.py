@@ -1,3 +1,4 @@
+import inspect
 from datetime import datetime
 from typing import List, Dict
 
@@ -304,6 +305,8 @@ class OrderData(object):
 
 
 class OrderDataSchema(Schema):
+    object_class = OrderData
+
     product_id = fields.String(load_from='productId')
     description = fields.String(required=False)
     price = fields.Integer()
@@ -314,7 +317,7 @@ class OrderDataSchema(Schema):
 
     @post_load
     def create_order_data(self, data):
-        return OrderData(**data)
+        return self.object_class(**data)
 
 
 class SalesData(object):
@@ -623,6 +626,8 @@ class RefundInfo(object):
 
 
 class RefundInfoSchema(Schema):
+    object_class = RefundInfo
+
     payment_session_id = fields.Integer(required=True, load_from='paymentSessionId')
     amount = fields.Integer(required=True, )
     description = fields.String(required=True, )
@@ -635,7 +640,7 @@ class RefundInfoSchema(Schema):
 
     @post_load
     def create_refund_info(self, data):
-        return RefundInfo(**data)
+        return self.object_class(**data)
 
 
 class TransactionStartInfo(object):
@@ -1150,6 +1155,8 @@ class PaymentDetails(object):
 
 
 class PaymentDetailsSchema(Schema):
+    object_class = PaymentDetails
+
     amount = fields.Integer()
     currency_amount = fields.Integer(load_from='currencyAmount')
     paid_amount = fields.Integer(load_from='paidAmount')  # Incorrectly specified in API (should be int, not string)
@@ -1187,7 +1194,7 @@ class PaymentDetailsSchema(Schema):
 
     @post_load
     def create_payment_details(self, data):
-        return PaymentDetails(**data)
+        return self.object_class(**data)
 
 
 class EndUserBase(object):
@@ -1404,6 +1411,8 @@ class TransactionStatusDetails(object):
 
 
 class TransactionStatusDetailsSchema(Schema):
+    object_class = TransactionStatusDetails
+
     transaction_id = fields.String(load_from='transactionId', required=True)
     order_id = fields.String(load_from='orderId', required=True)
     payment_profile_id = fields.String(load_from='paymentProfileId', required=True)
@@ -1426,7 +1435,7 @@ class TransactionStatusDetailsSchema(Schema):
 
     @post_load
     def create_transaction_status_details(self, data):
-        return TransactionStatusDetails(**data)
+        return self.object_class(**data)
 
 
 class RefundSuccessInfo(object):
@@ -1656,7 +1665,8 @@ class PaymentOption(PaymentOptionBase):
     Payment option details structure
     """
     def __init__(self, payment_method_id: int=None, use_only_in_store: bool=False,
-                 payment_sub_options: Dict[int, PaymentSubOption]={}, *args, **kwargs):
+                 payment_sub_options: Dict[int, PaymentSubOption]={}, min_amount: int=None, max_amount: int=None,
+                 *args, **kwargs):
         """
         Create Payment option details instance
 
@@ -1671,6 +1681,10 @@ class PaymentOption(PaymentOptionBase):
         :type use_only_in_store: bool
         :param payment_sub_options: Payment sub options
         :type payment_sub_options: Dict[int, PaymentSubOption]
+        :param min_amount: minimum transaction amount in cents (None if the API did not supply it)
+        :type min_amount: int
+        :param max_amount: maximum transaction amount in cents (None if the API did not supply it)
+        :type max_amount: int
         :param args: unused
         :type args: list
         :param kwargs: Any keyword arguments the :class:`paynlsdk.objects.PaymentOptionBase` receives
@@ -1679,6 +1693,8 @@ class PaymentOption(PaymentOptionBase):
         self.payment_method_id = payment_method_id
         self.use_only_in_store = use_only_in_store
         self.payment_sub_options: Dict[int, PaymentSubOption] = payment_sub_options
+        self.min_amount = min_amount
+        self.max_amount = max_amount
         super().__init__(**kwargs)
 
     def __repr__(self):
@@ -1696,6 +1712,8 @@ class PaymentOptionSchema(Schema):
     payment_method_id = fields.Integer(allow_None=True, required=False, load_from='paymentMethodId')
     payment_sub_options = fields.List(fields.Nested(PaymentSubOptionSchema), required=False, allow_none=True,
                                       load_from='paymentOptionSubList')
+    min_amount = fields.Integer(required=False, allow_none=True, load_from='minAmount')
+    max_amount = fields.Integer(required=False, allow_none=True, load_from='maxAmount')
 
     @pre_load
     def postprocess(self, data):
@@ -1793,3 +1811,70 @@ class CountryOptionSchema(Schema):
         data['payment_option_list'] = rs
         return CountryOption(**data)
 
+
+class CompactObject(object):
+    """
+    Base class for the compact variants of the data structures
+
+    Compact variants have the exact same attributes (and constructor) as the data structure they mirror, but keep them
+    in ``__slots__`` instead of a per instance ``__dict__``, which takes considerably less memory per instance.
+    See :func:`use_compact_objects` to have the API responses use them.
+    """
+    __slots__ = ()
+
+    def __repr__(self):
+        return str({name: getattr(self, name) for name in self.__slots__})
+
+
+def _get_attribute_names(cls) -> tuple:
+    return tuple(name for name in inspect.signature(cls.__init__).parameters if name != 'self')
+
+
+class CompactOrderData(CompactObject):
+    """
+    Compact variant of :class:`OrderData`
+    """
+    __slots__ = _get_attribute_names(OrderData)
+    __init__ = OrderData.__init__
+
+
+class CompactRefundInfo(CompactObject):
+    """
+    Compact variant of :class:`RefundInfo`
+    """
+    __slots__ = _get_attribute_names(RefundInfo)
+    __init__ = RefundInfo.__init__
+
+
+class CompactPaymentDetails(CompactObject):
+    """
+    Compact variant of :class:`PaymentDetails`
+    """
+    __slots__ = _get_attribute_names(PaymentDetails)
+    __init__ = PaymentDetails.__init__
+
+
+class CompactTransactionStatusDetails(CompactObject):
+    """
+    Compact variant of :class:`TransactionStatusDetails`
+    """
+    __slots__ = _get_attribute_names(TransactionStatusDetails)
+    __init__ = TransactionStatusDetails.__init__
+
+
+def use_compact_objects(compact: bool=True):
+    """
+    Have the API responses use the compact variants of the order data, refund info, payment details and transaction
+    status details (or switch back to the regular ones)
+
+    Please note compact objects don't have a ``__dict__``, so ``vars()`` can't be used on them.
+
+    :param compact: whether to use the compact variants
+    :type compact: bool
+    """
+    for schema_class, object_class, compact_class in (
+            (OrderDataSchema, OrderData, CompactOrderData),
+            (RefundInfoSchema, RefundInfo, CompactRefundInfo),
+            (PaymentDetailsSchema, PaymentDetails, CompactPaymentDetails),
+            (TransactionStatusDetailsSchema, TransactionStatusDetails, CompactTransactionStatusDetails)):
+        schema_class.object_class = compact_class if compact else object_class
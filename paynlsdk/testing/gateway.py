@@ -0,0 +1,689 @@
+import io
+import json
+import random
+import re
+import socket
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from paynlsdk.api.hooks import CallTimings
+from paynlsdk.api.transport import Transport
+from paynlsdk.enums.enums import PaymentStatus
+
+
+class GatewayError(Exception):
+    """
+    Error returned by the :class:`FakeGateway` as a Pay.nl error document (result 0)
+
+    :param str error_id: Pay.nl error ID (e.g. PAY-404)
+    :param str message: error message
+    """
+    def __init__(self, error_id: str, message: str):
+        self.error_id = error_id
+        self.message = message
+        super().__init__('{}: {}'.format(error_id, message))
+
+
+class GatewayResponse(object):
+    """
+    Response of the :class:`FakeGateway` to a single call
+
+    :param int status_code: HTTP status code
+    :param bytes body: response body
+    :param dict headers: HTTP headers
+    :param float delay: number of seconds the response should be delayed
+    :param bool disconnect: whether the connection should be dropped instead of responding
+    """
+    def __init__(self, status_code: int, body: bytes=b'', headers: dict=None, delay: float=0.0,
+                 disconnect: bool=False):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+        self.delay = delay
+        self.disconnect = disconnect
+
+
+class FakeTransaction(object):
+    """
+    Transaction kept by the :class:`FakeGateway`
+
+    :param str transaction_id: transaction ID (also used as the order ID)
+    :param dict parameters: (nested) parameters of the Transaction::start call
+    :param datetime created: creation date
+    """
+    def __init__(self, transaction_id: str, parameters: dict, created: datetime):
+        self.transaction_id = transaction_id
+        self.parameters = parameters
+        self.created = created
+        self.modified = created
+        self.amount = int(parameters['amount'])
+        self.state = PaymentStatus.PENDING_1
+        self.paid_amount = 0
+        self.refund_amount = 0
+        self.polls = 0
+
+    @property
+    def state_name(self) -> str:
+        """
+        Get the Pay.nl name of the state (e.g. PENDING for all pending states)
+        """
+        return re.sub(r'_\d$', '', self.state.name)
+
+    def set_state(self, state: PaymentStatus):
+        self.state = state
+        self.modified = datetime.now()
+        if state == PaymentStatus.PAID and not self.paid_amount:
+            self.paid_amount = self.amount
+
+
+class FakeGateway(object):
+    """
+    In-process stand-in for the Pay.nl REST API, for offline (load) tests
+
+    The gateway implements the calls the SDK uses and keeps a transaction state machine driven by the
+    :class:`paynlsdk.enums.enums.PaymentStatus` codes:
+
+    * Transaction::start creates a pending transaction
+    * the end user finishing the payment moves a pending transaction to ``payment_outcome`` (PAID, AUTHORIZE, VERIFY,
+      CANCEL, EXPIRED or DENIED). This happens after ``polls_until_complete`` Transaction::status/info calls, or
+      explicitly by calling :meth:`complete`
+    * Transaction::approve and Transaction::decline move a VERIFY transaction to PAID and DENIED
+    * Transaction::capture and Transaction::voidAuthorization move an AUTHORIZE transaction to PAID and CANCEL
+    * refunds move a PAID transaction to PARTIAL_REFUND, and to REFUND once the paid amount has been refunded
+
+    Calls not allowed in the current state return a Pay.nl error document, just like the real API.
+    Use the gateway with a :class:`FakeGatewayTransport` (in-process) or a :class:`FakeGatewayServer` (localhost HTTP).
+
+    :param float latency: number of seconds every call takes
+    :param float latency_jitter: maximum number of seconds (uniformly distributed) added to the latency
+    :param float error_rate: fraction (0 to 1) of the calls failing with ``error_status``
+    :param int error_status: HTTP status code of failing calls, or None to drop the connection
+    :param PaymentStatus payment_outcome: state the end user's payment results in. None keeps transactions pending
+    :param int polls_until_complete: number of status/info calls after which a pending transaction completes
+    :param tuple pay_server_ips: IP addresses Validate::isPayServerIp accepts
+    :param dict responses: recorded responses served instead of the gateway's own, by call name (e.g.
+                           Transaction::getService): a JSON document or the raw JSON body (bytes). Calls answered by
+                           a recorded response do not affect the state machine
+    :param int seed: seed of the random generator used for the latency jitter and error injection
+    :ivar dict calls: number of handled calls, by call name (e.g. Transaction::status)
+    """
+    PENDING_STATES = (PaymentStatus.WAIT, PaymentStatus.PENDING_1, PaymentStatus.PENDING_2, PaymentStatus.PENDING_3,
+                      PaymentStatus.PENDING_4, PaymentStatus.OPEN)
+    OUTCOME_STATES = (PaymentStatus.PAID, PaymentStatus.AUTHORIZE, PaymentStatus.VERIFY, PaymentStatus.CANCEL,
+                      PaymentStatus.EXPIRED, PaymentStatus.DENIED)
+    ROUTES = {
+        ('v12', 'Transaction', 'start'): '_start',
+        ('v12', 'Transaction', 'status'): '_status',
+        ('v12', 'Transaction', 'info'): '_info',
+        ('v12', 'Transaction', 'approve'): '_approve',
+        ('v12', 'Transaction', 'decline'): '_decline',
+        ('v12', 'Transaction', 'capture'): '_capture',
+        ('v12', 'Transaction', 'voidAuthorization'): '_void_authorization',
+        ('v12', 'Transaction', 'getService'): '_get_service',
+        ('v12', 'Transaction', 'getServicePaymentOptions'): '_get_service_payment_options',
+        ('v12', 'Transaction', 'getBanks'): '_get_banks',
+        ('v13', 'Transaction', 'refund'): '_refund',
+        ('v3', 'Refund', 'transaction'): '_refund',
+        ('v3', 'Refund', 'info'): '_refund_info',
+        ('v1', 'Validate', 'isPayServerIp'): '_is_pay_server_ip',
+    }
+    SERVICE_ID = 'SL-1234-5678'
+    # Keys of the Transaction::info documents, which the real API always sends (empty when not known)
+    END_USER_KEYS = ('customer_reference', 'language', 'initials', 'gender', 'lastName', 'dob', 'phoneNumber',
+                     'emailAddress', 'bankAccount', 'iban', 'bic', 'sendConfirmMail')
+    ADDRESS_KEYS = ('initials', 'lastName', 'gender', 'streetName', 'streetNumber', 'streetNumberExtension', 'zipCode',
+                    'city', 'countryCode', 'countryName', 'regionCode')
+    COMPANY_KEYS = ('name', 'cocNumber', 'vatNumber', 'countryCode')
+    ORDER_DATA_KEYS = ('productId', 'description', 'price', 'quantity', 'vatCode', 'vatPercentage', 'productType')
+
+    def __init__(self,
+                 latency: float=0.0,
+                 latency_jitter: float=0.0,
+                 error_rate: float=0.0,
+                 error_status: int=503,
+                 payment_outcome: PaymentStatus=PaymentStatus.PAID,
+                 polls_until_complete: int=1,
+                 pay_server_ips: tuple=('127.0.0.1',),
+                 responses: dict=None,
+                 seed: int=None
+                 ):
+        if payment_outcome is not None and payment_outcome not in self.OUTCOME_STATES:
+            raise ValueError('Invalid payment outcome {}'.format(payment_outcome))
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.payment_outcome = payment_outcome
+        self.polls_until_complete = polls_until_complete
+        self.pay_server_ips = pay_server_ips
+        self.responses = responses or {}
+        self.calls = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._transactions = {}
+        self._refunds = {}
+        self._injected_errors = []
+        self._counter = 0
+
+    def reset(self):
+        """
+        Forget all transactions, refunds, injected errors and call counts
+        """
+        with self._lock:
+            self._transactions.clear()
+            self._refunds.clear()
+            del self._injected_errors[:]
+            self.calls.clear()
+
+    def inject_errors(self, count: int=1, status_code: int=503):
+        """
+        Let the next calls fail
+
+        :param count: number of calls to fail
+        :type count: int
+        :param status_code: HTTP status code of the failing calls, or None to drop the connection
+        :type status_code: int
+        """
+        with self._lock:
+            self._injected_errors.extend([status_code] * count)
+
+    def get_transaction(self, transaction_id: str) -> FakeTransaction:
+        """
+        Get a transaction
+
+        :param transaction_id: transaction ID
+        :type transaction_id: str
+        :return: the transaction, or None if it does not exist
+        :rtype: FakeTransaction
+        """
+        return self._transactions.get(transaction_id)
+
+    def complete(self, transaction_id: str, state: PaymentStatus=PaymentStatus.PAID):
+        """
+        Finish the payment of a pending transaction, as the end user would
+
+        :param transaction_id: transaction ID
+        :type transaction_id: str
+        :param state: resulting state (PAID, AUTHORIZE, VERIFY, CANCEL, EXPIRED or DENIED)
+        :type state: PaymentStatus
+        :raise GatewayError: the transaction does not exist or is not pending
+        """
+        if state not in self.OUTCOME_STATES:
+            raise ValueError('Invalid payment outcome {}'.format(state))
+        with self._lock:
+            transaction = self._find(transaction_id)
+            if transaction.state not in self.PENDING_STATES:
+                raise GatewayError('PAY-1401', 'Transaction {} is not pending'.format(transaction_id))
+            transaction.set_state(state)
+
+    def handle(self, method: str, path: str, parameters: dict, headers: dict=None) -> GatewayResponse:
+        """
+        Handle a single call
+
+        :param method: HTTP method
+        :type method: str
+        :param path: url path (e.g. /v12/Transaction/status/json)
+        :type path: str
+        :param parameters: flat (bracket notation) request parameters
+        :type parameters: dict
+        :param headers: HTTP headers
+        :type headers: dict
+        :return: the response
+        :rtype: GatewayResponse
+        """
+        delay = self.latency
+        with self._lock:
+            if self.latency_jitter:
+                delay += self._random.uniform(0, self.latency_jitter)
+            if self._injected_errors:
+                error_status = self._injected_errors.pop(0)
+            elif self.error_rate and self._random.random() < self.error_rate:
+                error_status = self.error_status
+            else:
+                error_status = False
+        if error_status is None:
+            return GatewayResponse(0, delay=delay, disconnect=True)
+        if error_status:
+            return GatewayResponse(error_status, b'Service Unavailable', {'Content-Type': 'text/plain'}, delay)
+
+        parts = tuple(urlsplit(path).path.strip('/').split('/'))
+        route = self.ROUTES.get(parts[:3]) if len(parts) == 4 and parts[3] == 'json' else None
+        if route is None:
+            return GatewayResponse(404, b'Not Found', {'Content-Type': 'text/plain'}, delay)
+        call = '{}::{}'.format(parts[1], parts[2])
+        recorded = self.responses.get(call)
+        if isinstance(recorded, bytes):
+            with self._lock:
+                self.calls[call] = self.calls.get(call, 0) + 1
+            return GatewayResponse(200, recorded, {'Content-Type': 'application/json'}, delay)
+        parameters = self.unflatten(parameters)
+        try:
+            if route != '_is_pay_server_ip':
+                self._authenticate(parameters, CaseInsensitiveDict(headers or {}))
+            with self._lock:
+                self.calls[call] = self.calls.get(call, 0) + 1
+                document = recorded if recorded is not None else getattr(self, route)(parameters)
+        except GatewayError as e:
+            document = {'request': {'result': '0', 'errorId': e.error_id, 'errorMessage': e.message}}
+        else:
+            if isinstance(document, dict):
+                document = dict({'request': {'result': '1', 'errorId': '', 'errorMessage': ''}}, **document)
+        return GatewayResponse(200, json.dumps(document).encode(), {'Content-Type': 'application/json'}, delay)
+
+    @staticmethod
+    def unflatten(parameters: dict) -> dict:
+        """
+        Turn flat (bracket notation) parameters into nested dicts and lists
+
+        :param parameters: flat parameters, e.g. ``{'saleData[orderData][0][price]': 1995}``
+        :type parameters: dict
+        :return: nested parameters (values as strings), e.g. ``{'saleData': {'orderData': [{'price': '1995'}]}}``
+        :rtype: dict
+        """
+        nested = {}
+        for key, value in parameters.items():
+            names = re.findall(r'[^\[\]]+', key) or [key]
+            node = nested
+            for name in names[:-1]:
+                node = node.setdefault(name, {})
+            node[names[-1]] = str(value)
+
+        def to_lists(node):
+            if not isinstance(node, dict):
+                return node
+            if node and all(key.isdigit() for key in node):
+                return [to_lists(node[key]) for key in sorted(node, key=int)]
+            return {key: to_lists(value) for key, value in node.items()}
+        return to_lists(nested)
+
+    @staticmethod
+    def _authenticate(parameters: dict, headers: CaseInsensitiveDict):
+        if not headers.get('Authorization', '').startswith('Basic ') and not parameters.get('token'):
+            raise GatewayError('PAY-403', 'Token required')
+
+    def _find(self, transaction_id: str) -> FakeTransaction:
+        transaction = self._transactions.get(transaction_id)
+        if transaction is None:
+            raise GatewayError('PAY-404', 'Transaction {} not found'.format(transaction_id))
+        return transaction
+
+    def _transition(self, parameters: dict, key: str, source: PaymentStatus, target: PaymentStatus,
+                    call: str) -> FakeTransaction:
+        transaction = self._find(parameters.get(key))
+        if transaction.state != source:
+            raise GatewayError('PAY-1401', 'Cannot {} transaction {} in state {}'.format(
+                call, transaction.transaction_id, transaction.state_name))
+        transaction.set_state(target)
+        return transaction
+
+    def _poll(self, transaction: FakeTransaction):
+        # The end user finishes the payment while the merchant polls
+        if transaction.state in self.PENDING_STATES and self.payment_outcome is not None:
+            transaction.polls += 1
+            if transaction.polls >= self.polls_until_complete:
+                transaction.set_state(self.payment_outcome)
+
+    def _start(self, parameters: dict) -> dict:
+        for name in ('amount', 'ipAddress', 'finishUrl'):
+            if not parameters.get(name):
+                raise GatewayError('PAY-400', 'Missing parameter {}'.format(name))
+        self._counter += 1
+        transaction_id = '{:010d}X{:05d}'.format(self._counter, self._random.randint(0, 99999))
+        self._transactions[transaction_id] = FakeTransaction(transaction_id, parameters, datetime.now())
+        return {
+            'endUser': {'blacklist': '0'},
+            'transaction': {
+                'transactionId': transaction_id,
+                'paymentURL': 'https://safe.pay.nl/payment/{}/fake'.format(transaction_id),
+                'popupAllowed': '0',
+                'paymentReference': '6000 {:04d} {:04d} {:04d}'.format(self._counter // 10 ** 8 % 10 ** 4,
+                                                                       self._counter // 10 ** 4 % 10 ** 4,
+                                                                       self._counter % 10 ** 4),
+            },
+        }
+
+    def _status(self, parameters: dict) -> dict:
+        transaction = self._find(parameters.get('transactionId'))
+        self._poll(transaction)
+        start = transaction.parameters
+        return {
+            'paymentDetails': {
+                'transactionId': transaction.transaction_id,
+                'orderId': transaction.transaction_id,
+                'paymentProfileId': start.get('paymentOptionId', '10'),
+                'state': str(transaction.state.value),
+                'stateName': transaction.state_name,
+                'currency': start.get('transaction', {}).get('currency', 'EUR'),
+                'amount': str(transaction.amount),
+                'currenyAmount': str(transaction.amount),
+                'paidAmount': str(transaction.paid_amount),
+                'paidCurrenyAmount': str(transaction.paid_amount),
+                'refundAmount': str(transaction.refund_amount),
+                'refundCurrenyAmount': str(transaction.refund_amount),
+                'created': transaction.created.strftime('%Y-%m-%d %H:%M:%S'),
+                'identifierName': '',
+                'identifierPublic': '',
+                'identifierHash': '',
+                'startIpAddress': start['ipAddress'],
+                'completedIpAddress': start['ipAddress'] if transaction.paid_amount else '',
+                'orderNumber': start.get('transaction', {}).get('orderNumber', ''),
+            },
+        }
+
+    def _info(self, parameters: dict) -> dict:
+        transaction = self._find(parameters.get('transactionId'))
+        self._poll(transaction)
+        start = transaction.parameters
+        return {
+            'connection': {
+                'trust': '10',
+                'country': 'NL',
+                'ipAddress': start['ipAddress'],
+                'blacklist': '0',
+                'orderIpAddress': start['ipAddress'],
+                'orderReturnUrl': start['finishUrl'],
+            },
+            'enduser': self._end_user(start.get('enduser', {})),
+            'paymentDetails': {
+                'amount': str(transaction.amount),
+                'currencyAmount': str(transaction.amount),
+                'paidAmount': str(transaction.paid_amount),
+                'paidCurrencyAmount': str(transaction.paid_amount),
+                'paidCurrency': start.get('transaction', {}).get('currency', 'EUR'),
+                'description': start.get('transaction', {}).get('description', ''),
+                'state': str(transaction.state.value),
+                'stateName': transaction.state_name,
+                'payment_option_id': start.get('paymentOptionId', '10'),
+                'serviceId': start.get('serviceId', self.SERVICE_ID),
+                'created': transaction.created.strftime('%Y-%m-%d %H:%M:%S'),
+                'modified': transaction.modified.strftime('%Y-%m-%d %H:%M:%S'),
+            },
+            'statsDetails': dict({'paymentSessionId': transaction.transaction_id[:10]}, **start.get('statsData', {})),
+            'saleData': self._sale_data(start.get('saleData', {})),
+        }
+
+    @staticmethod
+    def _fill(values: dict, keys: tuple) -> dict:
+        return {key: values.get(key, '') for key in keys}
+
+    def _end_user(self, end_user: dict) -> dict:
+        # The customer reference is sent as customerReference, but returned as customer_reference
+        document = self._fill(dict(end_user, customer_reference=end_user.get('customerReference', '')),
+                              self.END_USER_KEYS)
+        document['address'] = self._fill(end_user.get('address', {}), self.ADDRESS_KEYS)
+        document['invoiceAddress'] = self._fill(end_user.get('invoiceAddress', {}), self.ADDRESS_KEYS)
+        document['company'] = self._fill(end_user.get('company', {}), self.COMPANY_KEYS)
+        return document
+
+    def _sale_data(self, sale_data: dict) -> dict:
+        return {
+            'invoiceDate': sale_data.get('invoiceDate', ''),
+            'deliveryDate': sale_data.get('deliveryDate', ''),
+            'orderData': [self._fill(line, self.ORDER_DATA_KEYS) for line in sale_data.get('orderData', [])] or '',
+        }
+
+    def _approve(self, parameters: dict) -> dict:
+        self._transition(parameters, 'orderId', PaymentStatus.VERIFY, PaymentStatus.PAID, 'approve')
+        return {'message': 'approved'}
+
+    def _decline(self, parameters: dict) -> dict:
+        self._transition(parameters, 'orderId', PaymentStatus.VERIFY, PaymentStatus.DENIED, 'decline')
+        return {'message': 'declined'}
+
+    def _capture(self, parameters: dict) -> dict:
+        self._transition(parameters, 'transactionId', PaymentStatus.AUTHORIZE, PaymentStatus.PAID, 'capture')
+        return {}
+
+    def _void_authorization(self, parameters: dict) -> dict:
+        self._transition(parameters, 'transactionId', PaymentStatus.AUTHORIZE, PaymentStatus.CANCEL, 'void')
+        return {}
+
+    def _refund(self, parameters: dict) -> dict:
+        transaction = self._find(parameters.get('transactionId'))
+        if transaction.state not in (PaymentStatus.PAID, PaymentStatus.PARTIAL_REFUND):
+            raise GatewayError('PAY-1401', 'Cannot refund transaction {} in state {}'.format(
+                transaction.transaction_id, transaction.state_name))
+        remaining = transaction.paid_amount - transaction.refund_amount
+        amount = int(parameters.get('amount') or remaining)
+        if amount <= 0 or amount > remaining:
+            raise GatewayError('PAY-1402', 'Invalid refund amount {}, at most {} can be refunded'.format(
+                amount, remaining))
+        transaction.refund_amount += amount
+        if transaction.refund_amount == transaction.paid_amount:
+            transaction.set_state(PaymentStatus.REFUND)
+        else:
+            transaction.set_state(PaymentStatus.PARTIAL_REFUND)
+        refund_id = 'RF-{:04d}-{:04d}'.format(len(self._refunds) // 10 ** 4 % 10 ** 4, len(self._refunds) % 10 ** 4)
+        description = parameters.get('description', '')
+        self._refunds[refund_id] = {
+            'paymentSessionId': transaction.transaction_id[:10],
+            'amount': str(amount),
+            'description': description,
+            'bankAccountHolder': '',
+            'bankAccountNumber': '',
+            'bankAccountBic': '',
+            'statusCode': '0',
+            'statusName': 'Pending',
+            'processDate': parameters.get('processDate') or datetime.now().strftime('%Y-%m-%d'),
+        }
+        return {
+            'description': description,
+            'refundId': refund_id,
+            'amountRefunded': str(amount),
+            'failedTransactions': '',
+            'refundedTransactions': [{
+                'orderId': transaction.transaction_id,
+                'amount': str(transaction.amount),
+                'refundAmount': str(amount),
+                'voucherNumber': '',
+                'bankaccountNumber': '',
+                'refundId': refund_id,
+            }],
+        }
+
+    def _refund_info(self, parameters: dict) -> dict:
+        refund_id = parameters.get('refundId')
+        if refund_id not in self._refunds:
+            raise GatewayError('PAY-404', 'Refund {} not found'.format(refund_id))
+        return {'refundId': refund_id, 'refund': self._refunds[refund_id]}
+
+    def _payment_options(self, payment_method_id: str=None) -> dict:
+        options = {}
+        for option_id, name, method_id in (('10', 'iDEAL', '4'), ('436', 'Bancontact', '4'),
+                                           ('138', 'PayPal', '4'), ('706', 'Visa Mastercard', '4'),
+                                           ('1813', 'SOFORT', '4'), ('1927', 'Giropay', '4'),
+                                           ('136', 'Overboeking', '1')):
+            if payment_method_id and payment_method_id != method_id:
+                continue
+            sub_options = ''
+            if option_id == '10':
+                sub_options = {bank['id']: {'id': bank['id'], 'name': bank['name'], 'visibleName': bank['name'],
+                                            'img': bank['icon'], 'path': '/img/', 'state': '1'}
+                               for bank in self._banks()}
+            options[option_id] = {
+                'id': option_id, 'name': name, 'visibleName': name, 'img': '/img/{}.png'.format(option_id),
+                'path': '/img/', 'state': '1', 'useOnlyInStore': '0', 'paymentMethodId': method_id,
+                'paymentOptionSubList': sub_options, 'minAmount': '1', 'maxAmount': '5000000',
+            }
+        return options
+
+    def _service(self, parameters: dict) -> dict:
+        options = self._payment_options(parameters.get('paymentMethodId'))
+        return {
+            'merchant': {'id': 'M-1234-5678', 'name': 'Fake merchant', 'publicName': 'Fake merchant', 'state': '1'},
+            'service': {
+                'id': parameters.get('serviceId', self.SERVICE_ID), 'name': 'Fake service',
+                'description': 'Fake service', 'publication': '', 'basePath': '', 'module': '1', 'subModule': '1',
+                'state': '1', 'successUrl': 'https://example.com/success', 'errorUrl': 'https://example.com/error',
+                'secret': 'secret',
+            },
+            'settings': '',
+            'paymentOptions': options,
+            'countryOptionList': {
+                'NL': {'id': 'NL', 'name': 'Nederland', 'visibleName': 'Nederland', 'in_eu': '1', 'img': '',
+                       'path': '', 'paymentOptionList': options},
+            },
+            'paymentProfiles': {
+                option_id: {'id': option_id, 'name': option['name'], 'visibleName': option['visibleName'],
+                            'costsFixed': '0', 'costsPercentage': '0', 'countries': {'NL': {'id': 'NL'}}}
+                for option_id, option in options.items()
+            },
+        }
+
+    def _get_service(self, parameters: dict) -> dict:
+        return self._service(parameters)
+
+    def _get_service_payment_options(self, parameters: dict) -> dict:
+        return self._service(parameters)
+
+    def _banks(self) -> list:
+        return [{'id': str(number), 'name': name, 'issuerId': '{:04d}'.format(number), 'swift': swift,
+                 'icon': 'https://static.pay.nl/ideal/banks/{}.png'.format(number), 'available': True}
+                for number, (name, swift) in enumerate((('ABN Amro', 'ABNANL2A'), ('Rabobank', 'RABONL2U'),
+                                                        ('ING', 'INGBNL2A'), ('SNS Bank', 'SNSBNL2A'),
+                                                        ('ASN Bank', 'ASNBNL21'), ('Triodos Bank', 'TRIONL2U'),
+                                                        ('Knab', 'KNABNL2H'), ('bunq', 'BUNQNL2A')), 1)]
+
+    def _get_banks(self, parameters: dict) -> list:
+        # Transaction::getBanks returns a bare list (without request result)
+        return self._banks()
+
+    def _is_pay_server_ip(self, parameters: dict) -> dict:
+        return {'result': '1' if parameters.get('ipAddress') in self.pay_server_ips else '0'}
+
+
+class FakeGatewayTransport(Transport):
+    """
+    Transport calling a :class:`FakeGateway` in-process, without any network traffic
+
+    Latency is simulated by sleeping; calls taking longer than the read timeout raise
+    :class:`requests.exceptions.ReadTimeout` and dropped connections raise :class:`requests.exceptions.ConnectionError`,
+    just like the :class:`paynlsdk.api.transport.RequestsTransport` would.
+
+    :param FakeGateway gateway: the gateway to call
+    """
+    def __init__(self, gateway: FakeGateway):
+        self.gateway = gateway
+
+    def send(self, method: str, url: str, headers: dict, parameters: dict, timeout, timings: CallTimings=None):
+        started = time.monotonic()
+        result = self.gateway.handle(method, url, parameters, headers)
+        read_timeout = timeout[1] if isinstance(timeout, tuple) else timeout
+        if result.delay:
+            if read_timeout is not None and result.delay > read_timeout:
+                time.sleep(read_timeout)
+                raise requests.exceptions.ReadTimeout('Read timed out. (read timeout={})'.format(read_timeout))
+            time.sleep(result.delay)
+        if result.disconnect:
+            raise requests.exceptions.ConnectionError('Connection aborted by the fake gateway')
+        response = requests.Response()
+        response.status_code = result.status_code
+        response.headers = CaseInsensitiveDict(result.headers)
+        response._content = result.body
+        response.raw = io.BytesIO(result.body)
+        response.encoding = 'utf-8'
+        response.url = url
+        response.reason = 'OK' if result.status_code == 200 else 'Error'
+        if timings is not None:
+            # In-process: no connection to establish and the body arrives along with the headers
+            timings.connect = 0.0
+            timings.ttfb = time.monotonic() - started
+            timings.body_read = 0.0
+        return response
+
+
+class FakeGatewayServer(object):
+    """
+    Localhost HTTP server serving a :class:`FakeGateway`
+
+    Point a client at the server by setting its ``end_point`` (e.g. ``client.end_point = server.end_point``); this
+    works for the synchronous and the asynchronous client alike. The server can be used as a context manager.
+
+    :param FakeGateway gateway: the gateway to serve
+    :param str host: host to bind to
+    :param int port: port to bind to. Defaults to a free port
+    """
+    def __init__(self, gateway: FakeGateway, host: str='127.0.0.1', port: int=0):
+        self.gateway = gateway
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    @property
+    def end_point(self) -> str:
+        """
+        Get the end point (base url) of the running server
+        """
+        return 'http://{}:{}'.format(self.host, self.port)
+
+    def start(self):
+        """
+        Start serving (in a background thread)
+        """
+        gateway = self.gateway
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Send the headers and body in one segment, without waiting for delayed ACKs
+            wbufsize = -1
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                self._handle(dict(parse_qsl(urlsplit(self.path).query, keep_blank_values=True)))
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0)).decode()
+                self._handle(dict(parse_qsl(body, keep_blank_values=True)))
+
+            def _handle(self, parameters: dict):
+                result = gateway.handle(self.command, self.path, parameters, dict(self.headers))
+                if result.delay:
+                    time.sleep(result.delay)
+                if result.disconnect:
+                    self.close_connection = True
+                    self.connection.shutdown(socket.SHUT_RDWR)
+                    return
+                try:
+                    self.send_response(result.status_code)
+                    for name, value in result.headers.items():
+                        self.send_header(name, value)
+                    self.send_header('Content-Length', str(len(result.body)))
+                    self.end_headers()
+                    self.wfile.write(result.body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up (e.g. timed out) before the response was sent
+                    self.close_connection = True
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-paynl-gateway', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop serving
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
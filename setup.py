@@ -27,6 +27,11 @@ setuptools.setup(
         'marshmallow>=2,<3',
         'requests',
     ],
+    extras_require={
+        'async': ['aiohttp>=3'],
+        'orjson': ['orjson'],
+        'ujson': ['ujson'],
+    },
     project_urls={
         'Bug Reports': 'https://github.com/paynl/python-sdk/issues',
         'Source': 'https://github.com/paynl/python-sdk/',
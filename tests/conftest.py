@@ -0,0 +1,26 @@
+import pytest
+
+from paynlsdk.api.client import APIAuthentication, APIClient
+from paynlsdk.testing.gateway import FakeGateway, FakeGatewayTransport
+
+
+@pytest.fixture
+def credentials():
+    saved = (APIAuthentication.api_token, APIAuthentication.token_code, APIAuthentication.service_id)
+    APIAuthentication.api_token = 'token'
+    APIAuthentication.token_code = 'AT-1234-5678'
+    APIAuthentication.service_id = FakeGateway.SERVICE_ID
+    yield
+    APIAuthentication.api_token, APIAuthentication.token_code, APIAuthentication.service_id = saved
+
+
+@pytest.fixture
+def gateway(credentials):
+    """
+    Fake gateway serving the calls of the default (synchronous) client
+    """
+    gateway = FakeGateway()
+    saved = APIClient._default_client
+    APIClient.set_default(APIClient(transport=FakeGatewayTransport(gateway)))
+    yield gateway
+    APIClient._default_client = saved
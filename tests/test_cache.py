@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+
+from paynlsdk.api.asyncclient import AsyncAPIClient
+from paynlsdk.client.aio.banks import Banks
+from paynlsdk.testing.gateway import FakeGateway, FakeGatewayServer
+
+
+@pytest.fixture
+def async_gateway(credentials):
+    """
+    Fake gateway serving the calls of the default asynchronous client, over localhost HTTP
+    """
+    gateway = FakeGateway(latency=0.05)
+    saved = AsyncAPIClient._default_client
+    with FakeGatewayServer(gateway) as server:
+        client = AsyncAPIClient()
+        client.end_point = server.end_point
+        AsyncAPIClient.set_default(client)
+        yield gateway
+    AsyncAPIClient._default_client = saved
+
+
+def test_cached_facade_from_consecutive_event_loops(async_gateway):
+    async def get_banks_concurrently():
+        Banks.invalidate()
+        try:
+            # Concurrent loads of the same key contend for the load lock
+            return await asyncio.gather(Banks.get_list(), Banks.get_list(), Banks.get_list())
+        finally:
+            await AsyncAPIClient.get_default().close()
+
+    for _ in range(2):
+        lists = asyncio.run(get_banks_concurrently())
+        assert all(banks and banks == lists[0] for banks in lists)
+    assert async_gateway.calls['Transaction::getBanks'] == 2
+    Banks.invalidate()
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+import requests
+
+from paynlsdk.api.asyncclient import AsyncAPIClient
+from paynlsdk.api.circuitbreaker import CircuitBreaker, CircuitBreakerRegistry
+from paynlsdk.api.client import APIClient
+from paynlsdk.api.transaction import getbanks
+from paynlsdk.testing.gateway import FakeGateway, FakeGatewayServer, FakeGatewayTransport
+
+
+class FailingTransport(FakeGatewayTransport):
+    """
+    Transport raising the queued exceptions before serving calls from the gateway
+    """
+    def __init__(self, gateway):
+        super().__init__(gateway)
+        self.errors = []
+
+    def send(self, *args, **kwargs):
+        if self.errors:
+            raise self.errors.pop(0)
+        return super().send(*args, **kwargs)
+
+
+def test_release_trial_frees_half_open_slot():
+    breaker = CircuitBreaker('test', minimum_calls=1, cooldown=0.0)
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.release_trial()
+
+    breaker.before_call()
+    breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_local_error_does_not_open_breaker(credentials):
+    transport = FailingTransport(FakeGateway())
+    client = APIClient(transport=transport, circuit_breakers=CircuitBreakerRegistry(minimum_calls=1, cooldown=0.0))
+    transport.errors.append(requests.exceptions.TooManyRedirects('redirect loop'))
+
+    with pytest.raises(requests.exceptions.TooManyRedirects):
+        client.perform_request(getbanks.Request())
+
+    assert client.circuit_breakers.get('Transaction/getBanks').state == CircuitBreaker.CLOSED
+
+
+def test_local_error_releases_half_open_trial(credentials):
+    transport = FailingTransport(FakeGateway())
+    client = APIClient(transport=transport, circuit_breakers=CircuitBreakerRegistry(minimum_calls=1, cooldown=0.0))
+    transport.errors += [requests.exceptions.ConnectionError('refused'),
+                         requests.exceptions.TooManyRedirects('redirect loop')]
+    for error in (requests.exceptions.ConnectionError, requests.exceptions.TooManyRedirects):
+        with pytest.raises(error):
+            client.perform_request(getbanks.Request())
+
+    request = getbanks.Request()
+    client.perform_request(request)
+
+    assert request.response is not None
+    assert client.circuit_breakers.get('Transaction/getBanks').state == CircuitBreaker.CLOSED
+
+
+def test_cancelled_async_call_keeps_breaker_closed(credentials):
+    async def call_and_cancel(end_point):
+        client = AsyncAPIClient(circuit_breakers=CircuitBreakerRegistry(minimum_calls=1))
+        client.end_point = end_point
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(client.perform_request(getbanks.Request()), 0.05)
+        finally:
+            await client.close()
+        return client.circuit_breakers.get('Transaction/getBanks').state
+
+    with FakeGatewayServer(FakeGateway(latency=0.5)) as server:
+        assert asyncio.run(call_and_cancel(server.end_point)) == CircuitBreaker.CLOSED
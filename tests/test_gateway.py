@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from paynlsdk.client.transaction import Transaction
+from paynlsdk.objects import Address, OrderData, SalesData, TransactionEndUser
+
+
+def test_start_info_round_trip(gateway):
+    address = Address(street_name='Kalverstraat', street_number='1', zip_code='1012NX', city='Amsterdam',
+                      country_code='NL')
+    end_user = TransactionEndUser(initials='J', last_name='Jansen', email_address='j.jansen@example.com',
+                                  address=address)
+    sale_data = SalesData(delivery_date=datetime(2026, 1, 2),
+                          order_data=[OrderData(product_id='SKU-0', description='Product 0', price=1995, quantity=1,
+                                                vat_code='H')])
+    started = Transaction.start(1995, '10.0.0.1', 'https://example.com/finish', end_user=end_user,
+                                sale_data=sale_data)
+
+    info = Transaction.info(started.transaction.transaction_id)
+
+    assert info.enduser.last_name == 'Jansen'
+    assert info.enduser.send_confirm_email is False
+    assert info.enduser.dob is None
+    assert info.enduser.address.city == 'Amsterdam'
+    assert info.enduser.invoice_address.city == ''
+    assert info.sale_data.invoice_date is None
+    assert info.sale_data.delivery_date == datetime(2026, 1, 2)
+    assert [line.product_id for line in info.sale_data.order_data] == ['SKU-0']
+
+
+def test_info_without_end_user(gateway):
+    started = Transaction.start(1995, '10.0.0.1', 'https://example.com/finish')
+
+    info = Transaction.info(started.transaction.transaction_id)
+
+    assert info.enduser.last_name == ''
+    assert info.sale_data.order_data is None
@@ -0,0 +1,45 @@
+from paynlsdk.api.client import APIClient
+from paynlsdk.api.hedging import HedgePolicy
+from paynlsdk.api.ratelimit import RateLimiter
+from paynlsdk.api.retry import RetryBudget
+from paynlsdk.api.transaction import status
+
+
+def get_bucket_states(rate_limiter: RateLimiter) -> dict:
+    with rate_limiter.store.transaction() as states:
+        return {name: list(state) for name, state in states.items()}
+
+
+def test_refused_budget_keeps_rate_limiter_token():
+    rate_limiter = RateLimiter(rate=1.0, burst=5.0)
+    budget = RetryBudget(min_retries_per_second=0.0, max_tokens=1.0)
+    client = APIClient(hedge_policy=HedgePolicy(budget=budget), rate_limiter=rate_limiter)
+    request = status.Request('1234567890X12345')
+    rate_limiter.acquire(request)
+    assert budget.try_withdraw()
+    states = get_bucket_states(rate_limiter)
+
+    assert not client._may_hedge(request)
+    assert get_bucket_states(rate_limiter) == states
+
+
+def test_refused_rate_limiter_keeps_budget_token():
+    rate_limiter = RateLimiter(rate=0.001, burst=1.0)
+    budget = RetryBudget(min_retries_per_second=0.0, max_tokens=1.0)
+    client = APIClient(hedge_policy=HedgePolicy(budget=budget), rate_limiter=rate_limiter)
+    request = status.Request('1234567890X12345')
+    rate_limiter.acquire(request)
+
+    assert not client._may_hedge(request)
+    assert budget.try_withdraw()
+
+
+def test_hedge_takes_budget_and_rate_limiter_tokens():
+    rate_limiter = RateLimiter(rate=0.001, burst=1.0)
+    budget = RetryBudget(min_retries_per_second=0.0, max_tokens=1.0)
+    client = APIClient(hedge_policy=HedgePolicy(budget=budget), rate_limiter=rate_limiter)
+    request = status.Request('1234567890X12345')
+
+    assert client._may_hedge(request)
+    assert not budget.try_withdraw()
+    assert rate_limiter.try_acquire(request)
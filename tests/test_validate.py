@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from paynlsdk.api.asyncclient import AsyncAPIClient
+from paynlsdk.client.aio.validate import Validate as AsyncValidate
+from paynlsdk.client.validate import Validate
+from paynlsdk.testing.gateway import FakeGateway, FakeGatewayServer
+
+# The API answers for any input, not only for IP addresses
+PAY_SERVER_IPS = ('127.0.0.1', 'pay-server')
+
+
+@pytest.fixture(autouse=True)
+def clear_verdicts():
+    Validate.ip_validator.invalidate()
+    yield
+    Validate.ip_validator.invalidate()
+
+
+def test_pay_server_ip_non_ip_address(gateway):
+    gateway.pay_server_ips = PAY_SERVER_IPS
+
+    assert Validate.pay_server_ip('pay-server', use_cache=False) is True
+    assert Validate.pay_server_ip('127.0.0.1', use_cache=False) is True
+    assert Validate.ip_validator.lookup('127.0.0.1') is True
+
+
+def test_async_pay_server_ip_non_ip_address(credentials):
+    async def validate(end_point):
+        client = AsyncAPIClient()
+        client.end_point = end_point
+        saved = AsyncAPIClient._default_client
+        AsyncAPIClient.set_default(client)
+        try:
+            return (await AsyncValidate.pay_server_ip('pay-server', use_cache=False),
+                    await AsyncValidate.pay_server_ip('192.0.2.1', use_cache=False))
+        finally:
+            AsyncAPIClient._default_client = saved
+            await client.close()
+
+    with FakeGatewayServer(FakeGateway(pay_server_ips=PAY_SERVER_IPS)) as server:
+        assert asyncio.run(validate(server.end_point)) == (True, False)
+    assert Validate.ip_validator.lookup('192.0.2.1') is False